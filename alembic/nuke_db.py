@@ -1,8 +1,8 @@
 # nuke_db.py
 from sqlalchemy import text
-from app.database import engine
+from app.database import get_engine
 
-with engine.connect() as conn:
+with get_engine().connect() as conn:
     # Drop all tables (CASCADE handles foreign keys)
     conn.execute(text("DROP SCHEMA public CASCADE"))
     conn.execute(text("CREATE SCHEMA public"))
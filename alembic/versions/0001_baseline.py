@@ -0,0 +1,157 @@
+"""Baseline: the schema Base.metadata.create_all() used to build at startup
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+
+Databases created by the old create_all() call already have this schema;
+mark them with ``alembic stamp 0001`` and then ``alembic upgrade head``.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "exercises",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("body_part", sa.String(), nullable=False),
+        sa.Column("equipment", sa.String(), nullable=True),
+        sa.Column("target", sa.String(), nullable=False),
+    )
+    op.create_index("ix_exercises_id", "exercises", ["id"])
+    op.create_index("ix_exercises_name", "exercises", ["name"])
+    op.create_index("ix_exercises_body_part", "exercises", ["body_part"])
+    op.create_index("ix_exercises_target", "exercises", ["target"])
+
+    # ── Static layer ─────────────────────────────────
+    op.create_table(
+        "plans",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    )
+    op.create_index("ix_plans_id", "plans", ["id"])
+
+    op.create_table(
+        "plan_days",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("plan_id", sa.Integer(), sa.ForeignKey("plans.id"), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("order", sa.Integer(), nullable=False),
+    )
+    op.create_index("ix_plan_days_id", "plan_days", ["id"])
+
+    op.create_table(
+        "plan_day_exercises",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("plan_day_id", sa.Integer(), sa.ForeignKey("plan_days.id"), nullable=False),
+        sa.Column("exercise_id", sa.Integer(), sa.ForeignKey("exercises.id"), nullable=False),
+        sa.Column("order", sa.Integer(), nullable=False),
+    )
+    op.create_index("ix_plan_day_exercises_id", "plan_day_exercises", ["id"])
+
+    # ── Execution layer ──────────────────────────────
+    op.create_table(
+        "mesocycles",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("plan_id", sa.Integer(), sa.ForeignKey("plans.id"), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("current_week", sa.Integer(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    )
+    op.create_index("ix_mesocycles_id", "mesocycles", ["id"])
+
+    op.create_table(
+        "mesocycle_weeks",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("mesocycle_id", sa.Integer(), sa.ForeignKey("mesocycles.id"), nullable=False),
+        sa.Column("week_number", sa.Integer(), nullable=False),
+    )
+    op.create_index("ix_mesocycle_weeks_id", "mesocycle_weeks", ["id"])
+
+    op.create_table(
+        "mesocycle_days",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("week_id", sa.Integer(), sa.ForeignKey("mesocycle_weeks.id"), nullable=False),
+        sa.Column("plan_day_id", sa.Integer(), sa.ForeignKey("plan_days.id"), nullable=False),
+        sa.Column("day_order", sa.Integer(), nullable=False),
+        sa.Column("is_completed", sa.Boolean(), nullable=True),
+    )
+    op.create_index("ix_mesocycle_days_id", "mesocycle_days", ["id"])
+
+    op.create_table(
+        "mesocycle_day_exercises",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("meso_day_id", sa.Integer(), sa.ForeignKey("mesocycle_days.id"), nullable=False),
+        sa.Column("exercise_id", sa.Integer(), sa.ForeignKey("exercises.id"), nullable=False),
+        sa.Column("exercise_order", sa.Integer(), nullable=False),
+        sa.Column("prescribed_sets", sa.Integer(), nullable=False),
+        sa.Column("prescribed_reps", sa.Integer(), nullable=True),
+        sa.Column("note", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_mesocycle_day_exercises_id", "mesocycle_day_exercises", ["id"])
+
+    # ── Measurement layer ────────────────────────────
+    op.create_table(
+        "set_logs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("meso_day_exercise_id", sa.Integer(),
+                  sa.ForeignKey("mesocycle_day_exercises.id"), nullable=False),
+        sa.Column("set_number", sa.Integer(), nullable=False),
+        sa.Column("weight", sa.Float(), nullable=False),
+        sa.Column("reps", sa.Integer(), nullable=False),
+        sa.Column("logged_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    )
+    op.create_index("ix_set_logs_id", "set_logs", ["id"])
+
+    op.create_table(
+        "feedbacks",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("meso_day_id", sa.Integer(), sa.ForeignKey("mesocycle_days.id"), nullable=False),
+        sa.Column("muscle_group", sa.String(), nullable=False),
+        sa.Column("soreness", sa.Enum("none", "light", "moderate", "severe",
+                                      name="sorenesslevel"), nullable=False),
+        sa.Column("pump", sa.Enum("none", "light", "moderate", "great",
+                                  name="pumplevel"), nullable=False),
+        sa.Column("volume_feeling", sa.Enum("too_little", "just_right", "too_much",
+                                            name="volumefeeling"), nullable=False),
+        sa.Column("notes", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_feedbacks_id", "feedbacks", ["id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ("feedbacks", "set_logs", "mesocycle_day_exercises", "mesocycle_days",
+                  "mesocycle_weeks", "mesocycles", "plan_day_exercises", "plan_days",
+                  "plans", "exercises", "users"):
+        op.drop_table(table)
+    for enum_name in ("volumefeeling", "pumplevel", "sorenesslevel"):
+        sa.Enum(name=enum_name).drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,45 @@
+"""One set log per (exercise, set number); stable exercise source ids
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+
+- uq_set_logs_mde_set backs the ON CONFLICT upsert used by set logging.
+  Duplicate rows left by older versions are collapsed to the newest first.
+- exercises.source_id is the CSV id import_exercises.py syncs on; it stays
+  NULL until the next sync adopts existing rows by name.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        DELETE FROM set_logs older
+        USING set_logs newer
+        WHERE older.meso_day_exercise_id = newer.meso_day_exercise_id
+          AND older.set_number = newer.set_number
+          AND older.id < newer.id
+    """)
+    op.create_unique_constraint("uq_set_logs_mde_set", "set_logs",
+                                ["meso_day_exercise_id", "set_number"])
+
+    op.add_column("exercises", sa.Column("source_id", sa.String(), nullable=True))
+    op.create_unique_constraint("exercises_source_id_key", "exercises", ["source_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("exercises_source_id_key", "exercises", type_="unique")
+    op.drop_column("exercises", "source_id")
+    op.drop_constraint("uq_set_logs_mde_set", "set_logs", type_="unique")
@@ -0,0 +1,80 @@
+"""Indexes for foreign keys and hot lookup predicates
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+
+Every crud lookup walks mesocycle → week → day → exercise → set log by
+foreign key, and none of those columns were indexed, so each step was a
+sequential scan. Also enforces two uniqueness rules the code already
+relies on: one week per (mesocycle, week number), and one feedback per
+(day, muscle group). benchmarks/explain_hot_queries.py checks the plans.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    # (name, table, columns, extra kwargs)
+    ("ix_plans_user_id", "plans", ["user_id"], {}),
+    ("ix_plan_days_plan_id_order", "plan_days", ["plan_id", "order"], {}),
+    ("ix_plan_day_exercises_plan_day_id_order", "plan_day_exercises", ["plan_day_id", "order"], {}),
+    ("ix_plan_day_exercises_exercise_id", "plan_day_exercises", ["exercise_id"], {}),
+    ("ix_mesocycles_user_id_started_at", "mesocycles", ["user_id", "started_at"], {}),
+    ("ix_mesocycles_plan_id", "mesocycles", ["plan_id"], {}),
+    ("ix_mesocycle_days_week_id_day_order", "mesocycle_days", ["week_id", "day_order"], {}),
+    ("ix_mesocycle_days_open", "mesocycle_days", ["week_id", "day_order"],
+     {"postgresql_where": sa.text("is_completed = false")}),
+    ("ix_mesocycle_days_plan_day_id", "mesocycle_days", ["plan_day_id"], {}),
+    ("ix_mesocycle_day_exercises_meso_day_id_order", "mesocycle_day_exercises",
+     ["meso_day_id", "exercise_order"], {}),
+    ("ix_mesocycle_day_exercises_exercise_id", "mesocycle_day_exercises", ["exercise_id"], {}),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Duplicate weeks own days and set logs, so they can't be merged blindly
+    duplicates = op.get_bind().execute(sa.text("""
+        SELECT mesocycle_id, week_number FROM mesocycle_weeks
+        GROUP BY mesocycle_id, week_number HAVING count(*) > 1
+    """)).all()
+    if duplicates:
+        raise RuntimeError(
+            "mesocycle_weeks has duplicate (mesocycle_id, week_number) rows; "
+            f"resolve them before upgrading: {[tuple(d) for d in duplicates]}"
+        )
+    op.create_unique_constraint("uq_mesocycle_weeks_mesocycle_week", "mesocycle_weeks",
+                                ["mesocycle_id", "week_number"])
+
+    # Feedback is a leaf row: keep the newest per (day, muscle group), as
+    # create_feedback() would have updated it
+    op.execute("""
+        DELETE FROM feedbacks older
+        USING feedbacks newer
+        WHERE older.meso_day_id = newer.meso_day_id
+          AND older.muscle_group = newer.muscle_group
+          AND older.id < newer.id
+    """)
+    op.create_unique_constraint("uq_feedbacks_day_muscle_group", "feedbacks",
+                                ["meso_day_id", "muscle_group"])
+
+    for name, table, columns, kw in INDEXES:
+        op.create_index(name, table, columns, **kw)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    op.drop_constraint("uq_feedbacks_day_muscle_group", "feedbacks", type_="unique")
+    op.drop_constraint("uq_mesocycle_weeks_mesocycle_week", "mesocycle_weeks", type_="unique")
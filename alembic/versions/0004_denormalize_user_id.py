@@ -0,0 +1,67 @@
+"""Carry user_id down to mesocycle_day_exercises and set_logs
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+
+Per-user history (exercise history, previous session, last weight) used
+to join set log → exercise slot → day → week → mesocycle just to filter
+by owner. mesocycle_day_exercises gets the owner's user_id. set_logs
+gets user_id and exercise_id, so the last-weight lookup is a range scan
+on one index.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("mesocycle_day_exercises", sa.Column("user_id", sa.Integer(), nullable=True))
+    op.add_column("set_logs", sa.Column("user_id", sa.Integer(), nullable=True))
+    op.add_column("set_logs", sa.Column("exercise_id", sa.Integer(), nullable=True))
+
+    op.execute("""
+        UPDATE mesocycle_day_exercises mde
+        SET user_id = m.user_id
+        FROM mesocycle_days md
+        JOIN mesocycle_weeks mw ON mw.id = md.week_id
+        JOIN mesocycles m ON m.id = mw.mesocycle_id
+        WHERE md.id = mde.meso_day_id
+    """)
+    op.execute("""
+        UPDATE set_logs sl
+        SET user_id = mde.user_id, exercise_id = mde.exercise_id
+        FROM mesocycle_day_exercises mde
+        WHERE mde.id = sl.meso_day_exercise_id
+    """)
+
+    for table, column, target in (
+        ("mesocycle_day_exercises", "user_id", "users"),
+        ("set_logs", "user_id", "users"),
+        ("set_logs", "exercise_id", "exercises"),
+    ):
+        op.alter_column(table, column, nullable=False)
+        op.create_foreign_key(f"{table}_{column}_fkey", table, target, [column], ["id"])
+
+    op.create_index("ix_mesocycle_day_exercises_user_exercise", "mesocycle_day_exercises",
+                    ["user_id", "exercise_id", "id"])
+    op.create_index("ix_set_logs_user_exercise_logged_at", "set_logs",
+                    ["user_id", "exercise_id", "logged_at", "id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_set_logs_user_exercise_logged_at", table_name="set_logs")
+    op.drop_index("ix_mesocycle_day_exercises_user_exercise", table_name="mesocycle_day_exercises")
+    op.drop_column("set_logs", "exercise_id")
+    op.drop_column("set_logs", "user_id")
+    op.drop_column("mesocycle_day_exercises", "user_id")
@@ -0,0 +1,80 @@
+"""Per-user exercise performance table for autofill and smart targets
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+
+Autofill looked up the newest non-zero set log per exercise, and smart
+targets ranked every completed occurrence of each exercise. Both now read
+one exercise_performance row per (user, exercise), which app.crud keeps
+current as sets are logged, days completed and mesocycles deleted. This
+backfills it from the existing history.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "exercise_performance",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("exercise_id", sa.Integer(), nullable=False),
+        sa.Column("last_weight", sa.Float(), nullable=True),
+        sa.Column("last_reps", sa.Integer(), nullable=True),
+        sa.Column("last_logged_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_set_log_id", sa.Integer(), nullable=True),
+        sa.Column("best_e1rm", sa.Float(), nullable=True),
+        sa.Column("last_completed_mde_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["exercise_id"], ["exercises.id"]),
+        sa.ForeignKeyConstraint(["last_completed_mde_id"], ["mesocycle_day_exercises.id"],
+                                ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("user_id", "exercise_id"),
+    )
+
+    # Same definitions as crud.refresh_exercise_performance_stmt(): newest
+    # non-zero set by (logged_at, id), best Epley 1RM, newest completed slot
+    op.execute("""
+        INSERT INTO exercise_performance (
+            user_id, exercise_id, last_weight, last_reps, last_logged_at,
+            last_set_log_id, best_e1rm, last_completed_mde_id
+        )
+        SELECT p.user_id, p.exercise_id, last.weight, last.reps, last.logged_at,
+               last.id, best.e1rm, done.mde_id
+        FROM (SELECT DISTINCT user_id, exercise_id FROM mesocycle_day_exercises) p
+        LEFT JOIN (
+            SELECT DISTINCT ON (user_id, exercise_id)
+                   user_id, exercise_id, weight, reps, logged_at, id
+            FROM set_logs
+            WHERE weight > 0
+            ORDER BY user_id, exercise_id, logged_at DESC, id DESC
+        ) last USING (user_id, exercise_id)
+        LEFT JOIN (
+            SELECT user_id, exercise_id, max(weight * (1 + reps::float8 / 30)) AS e1rm
+            FROM set_logs
+            WHERE weight > 0
+            GROUP BY user_id, exercise_id
+        ) best USING (user_id, exercise_id)
+        LEFT JOIN (
+            SELECT mde.user_id, mde.exercise_id, max(mde.id) AS mde_id
+            FROM mesocycle_day_exercises mde
+            JOIN mesocycle_days md ON md.id = mde.meso_day_id
+            WHERE md.is_completed
+            GROUP BY mde.user_id, mde.exercise_id
+        ) done USING (user_id, exercise_id)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("exercise_performance")
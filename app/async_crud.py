@@ -0,0 +1,178 @@
+# app/async_crud.py
+"""
+Async versions of the hot-path crud functions, for AsyncSession routes.
+
+Statements and pure computation are shared with app.crud — only the I/O
+differs — so both stacks return identical results.
+"""
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.cache import smart_target_cache
+from app.catalog import exercise_catalog
+from app.crud import (
+    build_smart_progression,
+    current_workout_stmt,
+    day_exercise_ids,
+    last_weights_stmt,
+    mesocycle_detail_stmt,
+    previous_session_sets_from_rows,
+    session_history_stmt,
+    set_log_performance_stmts,
+    set_log_results,
+    sibling_feedbacks_stmt,
+    smart_progression_day_stmt,
+    upsert_set_logs_stmt,
+)
+from app.serializers import serialize_day
+from app.utils import hash_password_async
+
+
+# ═══════════════════════════════════════════════════════
+# USERS
+# ═══════════════════════════════════════════════════════
+
+async def get_user_by_email(db: AsyncSession, email: str):
+    return (await db.scalars(select(models.User).where(models.User.email == email))).first()
+
+
+async def create_user(db: AsyncSession, name: str, email: str, password: str):
+    """See crud.create_user(); the hash is computed in the hashing process pool."""
+    hashed = await hash_password_async(password)
+    db_user = models.User(name=name, email=email, hashed_password=hashed)
+    db.add(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+
+async def update_password_hash(db: AsyncSession, user: models.User, hashed: str) -> None:
+    """Store a rehashed password (new scheme or cost) for an existing user."""
+    user.hashed_password = hashed
+    await db.commit()
+
+
+# ═══════════════════════════════════════════════════════
+# MESOCYCLES
+# ═══════════════════════════════════════════════════════
+
+async def get_mesocycle_detail(db: AsyncSession, mesocycle_id: int, user_id: int):
+    """See crud.get_mesocycle_detail()."""
+    return (await db.scalars(mesocycle_detail_stmt(mesocycle_id, user_id))).first()
+
+
+async def get_current_workout(db: AsyncSession, mesocycle_id: int, user_id: int):
+    """See crud.get_current_workout()."""
+    result = await db.execute(current_workout_stmt(mesocycle_id, user_id))
+    return result.unique().scalars().first()
+
+
+async def get_workout_bundle(db: AsyncSession, mesocycle_id: int,
+                             user_id: int) -> Optional[dict]:
+    """See crud.get_workout_bundle()."""
+    day = await get_current_workout(db, mesocycle_id, user_id)
+    if not day:
+        return None
+    catalog = await exercise_catalog.resolve_async(db, day_exercise_ids(day))
+    return {
+        "mesocycle_id": mesocycle_id,
+        "week_number": day.week.week_number,
+        "day_name": day.plan_day.name if day.plan_day else f"Day {day.day_order}",
+        "day": serialize_day(day, catalog),
+        "targets": (await get_cached_smart_targets(db, day.id, user_id, day=day))[1],
+    }
+
+
+# ═══════════════════════════════════════════════════════
+# SET LOGGING
+# ═══════════════════════════════════════════════════════
+
+async def upsert_set_logs(db: AsyncSession, sets: List[dict], user_id: int) -> List[dict]:
+    """See crud.upsert_set_logs()."""
+    stmt = upsert_set_logs_stmt(sets, user_id)
+    if stmt is None:
+        return []
+    written = (await db.execute(stmt)).mappings().all()
+    for perf_stmt in set_log_performance_stmts(written):
+        await db.execute(perf_stmt)
+    await db.commit()
+    return set_log_results(written)
+
+
+async def log_set(db: AsyncSession, meso_day_exercise_id: int, set_number: int,
+                  weight: float, reps: int, user_id: int) -> Optional[dict]:
+    """See crud.log_set()."""
+    written = await upsert_set_logs(db, [{
+        "meso_day_exercise_id": meso_day_exercise_id,
+        "set_number": set_number,
+        "weight": weight,
+        "reps": reps,
+    }], user_id)
+    return written[0] if written else None
+
+
+# ═══════════════════════════════════════════════════════
+# SMART PROGRESSION
+# ═══════════════════════════════════════════════════════
+
+async def calculate_smart_progression(
+    db: AsyncSession,
+    meso_day_id: int,
+    soreness_overrides: dict | None = None,
+    day: Optional[models.MesocycleDay] = None,
+    user_id: Optional[int] = None,
+) -> list:
+    """Async loader for crud.build_smart_progression(); see crud.calculate_smart_progression()."""
+    if day is None:
+        day = await get_smart_progression_day(db, meso_day_id, user_id)
+    if not day:
+        return []
+
+    user_id = day.week.mesocycle.user_id if day.week and day.week.mesocycle else None
+
+    sibling_feedbacks = []
+    if day.week:
+        sibling_feedbacks = (await db.scalars(sibling_feedbacks_stmt(day))).all()
+
+    exercise_ids = [mde.exercise_id for mde in day.exercises]
+    catalog = await exercise_catalog.resolve_async(db, exercise_ids)
+    history_map: Dict[int, list] = {}
+    autofill_map: Dict[int, dict] = {}
+    if user_id and exercise_ids:
+        rows = (await db.execute(session_history_stmt(day, exercise_ids, user_id))).all()
+        history_map = previous_session_sets_from_rows(rows)
+        missing = [eid for eid in exercise_ids if eid not in history_map]
+        if missing:
+            rows = (await db.execute(last_weights_stmt(missing, user_id))).all()
+            autofill_map = {r.exercise_id: {"weight": r.weight, "reps": r.reps} for r in rows}
+
+    return build_smart_progression(day, catalog, user_id, sibling_feedbacks,
+                                   history_map, autofill_map, soreness_overrides)
+
+
+async def get_cached_smart_targets(db: AsyncSession, meso_day_id: int, user_id: int,
+                                   day: Optional[models.MesocycleDay] = None) -> Optional[tuple]:
+    """See crud.get_cached_smart_targets()."""
+    cached = smart_target_cache.get_day(meso_day_id, user_id)
+    if cached is not None:
+        return cached
+    if day is None:
+        day = await get_smart_progression_day(db, meso_day_id, user_id)
+        if day is None:
+            return None
+    targets = await calculate_smart_progression(db, meso_day_id, day=day, user_id=user_id)
+    smart_target_cache.put(meso_day_id, user_id, day.week.week_number, targets)
+    return day.week.week_number, targets
+
+
+async def get_smart_progression_day(db: AsyncSession, meso_day_id: int,
+                                    user_id: Optional[int] = None):
+    """
+    The day as calculate_smart_progression() needs it, or None; with a
+    user_id, only if it's theirs (see crud.smart_progression_day_stmt()).
+    """
+    result = await db.execute(smart_progression_day_stmt(meso_day_id, user_id))
+    return result.unique().scalars().first()
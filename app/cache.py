@@ -0,0 +1,272 @@
+# app/cache.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Set, Tuple
+
+from app.config import (
+    AUTH_TOKEN_CACHE_SIZE,
+    AUTH_USER_CACHE_SIZE,
+    AUTH_USER_CACHE_TTL_SECONDS,
+    SMART_TARGET_CACHE_SIZE,
+    SMART_TARGET_CACHE_TTL_SECONDS,
+)
+
+
+# ═══════════════════════════════════════════════════════
+# GENERIC TTL / LRU CACHE
+# ═══════════════════════════════════════════════════════
+
+class TTLCache:
+    """
+    Bounded, thread-safe LRU mapping whose entries expire after a TTL.
+
+    Entries can also carry their own absolute expiry (``expires_at``,
+    a ``time.monotonic()`` timestamp) when it is shorter than the TTL.
+    ``on_evict(key, value)`` is called for every entry that leaves the
+    cache — LRU eviction, expiry or explicit pop.
+    """
+
+    def __init__(self, maxsize: int, ttl: float,
+                 on_evict: Optional[Callable[[Hashable, object], None]] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._on_evict = on_evict
+        self._data: "OrderedDict[Hashable, Tuple[float, object]]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                self._evict(key)
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value, expires_at: Optional[float] = None) -> None:
+        deadline = time.monotonic() + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        with self._lock:
+            if key in self._data:
+                self._evict(key)
+            self._data[key] = (deadline, value)
+            while len(self._data) > self.maxsize:
+                self._evict(next(iter(self._data)))
+
+    def pop(self, key: Hashable, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            self._evict(key)
+            return item[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._data):
+                self._evict(key)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _evict(self, key: Hashable) -> None:
+        _, value = self._data.pop(key)
+        if self._on_evict is not None:
+            self._on_evict(key, value)
+
+
+_MISSING = object()
+
+
+# ═══════════════════════════════════════════════════════
+# SMART TARGET CACHE
+# ═══════════════════════════════════════════════════════
+
+class _DayTargets:
+    __slots__ = ("user_id", "week_number", "targets", "set_index")
+
+    def __init__(self, user_id: int, week_number: int, targets: list):
+        self.user_id = user_id
+        self.week_number = week_number
+        self.targets = targets
+        self.set_index: Dict[Tuple[int, int], Tuple[float, int]] = {
+            (t["mde_id"], st["set_number"]): (st["target_weight"], st["target_reps"])
+            for t in targets
+            for st in t["set_targets"]
+        }
+
+
+class SmartTargetCache:
+    """
+    Smart progression targets per MesocycleDay, with an O(1) per-set index.
+
+    Targets for a day only depend on completed history, feedback and the
+    day's prescribed sets, so entries stay valid while sets are being logged
+    on that same day. Callers invalidate explicitly:
+
+        - feedback submitted / day completed / next week generated
+          → invalidate_user()
+        - set logged or skipped → invalidate_user(keep_mde_id=...), which
+          keeps the day the set belongs to and drops every other day
+        - prescribed_sets changed on a day → invalidate_day()
+
+    The cache is per-process; the TTL bounds staleness across workers.
+    """
+
+    def __init__(self, maxsize: int = SMART_TARGET_CACHE_SIZE,
+                 ttl: float = SMART_TARGET_CACHE_TTL_SECONDS):
+        self._days = TTLCache(maxsize, ttl, on_evict=self._forget)
+        # Share the LRU's lock so eviction callbacks can't deadlock against us
+        self._lock = self._days._lock
+        self._day_by_mde: Dict[int, int] = {}
+        self._days_by_user: Dict[int, Set[int]] = {}
+
+    def get_day(self, meso_day_id: int, user_id: int) -> Optional[Tuple[int, list]]:
+        """
+        (week_number, targets) for the day, or None on a miss. Only the
+        owner hits, so a hit doubles as the ownership check.
+        """
+        entry = self._days.get(meso_day_id)
+        if entry is None or entry.user_id != user_id:
+            return None
+        return entry.week_number, entry.targets
+
+    def get_set_target(self, mde_id: int, set_number: int) -> Optional[Tuple[float, int]]:
+        """
+        (target_weight, target_reps) for one set, or None on a cache miss.
+        Sets beyond the prescription of a cached day return (0, 0).
+        """
+        with self._lock:
+            meso_day_id = self._day_by_mde.get(mde_id)
+            entry = self._days.get(meso_day_id) if meso_day_id is not None else None
+            if entry is None:
+                return None
+            return entry.set_index.get((mde_id, set_number), (0, 0))
+
+    def put(self, meso_day_id: int, user_id: int, week_number: int, targets: list) -> None:
+        entry = _DayTargets(user_id, week_number, targets)
+        with self._lock:
+            self._days.set(meso_day_id, entry)
+            for t in targets:
+                self._day_by_mde[t["mde_id"]] = meso_day_id
+            self._days_by_user.setdefault(user_id, set()).add(meso_day_id)
+
+    def invalidate_day(self, meso_day_id: int) -> None:
+        self._days.pop(meso_day_id)
+
+    def invalidate_user(self, user_id: int, keep_mde_id: Optional[int] = None) -> None:
+        with self._lock:
+            keep_day_id = self._day_by_mde.get(keep_mde_id) if keep_mde_id else None
+            for meso_day_id in list(self._days_by_user.get(user_id, ())):
+                if meso_day_id != keep_day_id:
+                    self._days.pop(meso_day_id)
+
+    def clear(self) -> None:
+        self._days.clear()
+
+    def _forget(self, meso_day_id: int, entry: _DayTargets) -> None:
+        with self._lock:
+            for t in entry.targets:
+                if self._day_by_mde.get(t["mde_id"]) == meso_day_id:
+                    del self._day_by_mde[t["mde_id"]]
+            user_days = self._days_by_user.get(entry.user_id)
+            if user_days is not None:
+                user_days.discard(meso_day_id)
+                if not user_days:
+                    del self._days_by_user[entry.user_id]
+
+
+smart_target_cache = SmartTargetCache()
+
+
+# ═══════════════════════════════════════════════════════
+# AUTHENTICATED USER CACHE
+# ═══════════════════════════════════════════════════════
+
+class AuthUser:
+    """
+    Immutable snapshot of the User columns protected routes need.
+
+    Cached and shared across requests instead of a detached ORM instance,
+    so no route can accidentally lazy-load or re-attach it to a session.
+    """
+    __slots__ = ("id", "name", "email", "is_active")
+
+    def __init__(self, id: int, name: str, email: str, is_active: bool):
+        object.__setattr__(self, "id", id)
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "email", email)
+        object.__setattr__(self, "is_active", is_active)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("AuthUser is immutable")
+
+    @classmethod
+    def from_user(cls, user) -> "AuthUser":
+        return cls(user.id, user.name, user.email, bool(user.is_active))
+
+    def __repr__(self) -> str:
+        return f"AuthUser(id={self.id!r}, email={self.email!r})"
+
+
+class AuthCache:
+    """
+    Two caches in front of get_current_user():
+
+        - tokens: sha256(token) → user id, expiring at the token's own
+          ``exp``, so a repeat token skips JWT verification entirely
+        - users: user id → AuthUser for active users only, bounded by a
+          TTL because other workers can't reach this process to invalidate
+
+    Callers invalidate explicitly with invalidate_user() whenever a user is
+    changed or deactivated; crud wires that to User update/delete events.
+    A cached token only names the user, so dropping the user is enough to
+    force the next request through the database again.
+    """
+
+    def __init__(self, user_maxsize: int = AUTH_USER_CACHE_SIZE,
+                 user_ttl: float = AUTH_USER_CACHE_TTL_SECONDS,
+                 token_maxsize: int = AUTH_TOKEN_CACHE_SIZE):
+        self._users = TTLCache(user_maxsize, user_ttl)
+        # Token entries never outlive the token; the TTL is only a ceiling
+        self._tokens = TTLCache(token_maxsize, float("inf"))
+
+    @staticmethod
+    def _token_key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get_token_user_id(self, token: str) -> Optional[int]:
+        return self._tokens.get(self._token_key(token))
+
+    def put_token(self, token: str, user_id: int, exp: float) -> None:
+        """Remember a validated token until ``exp`` (a Unix timestamp)."""
+        remaining = exp - time.time()
+        if remaining > 0:
+            self._tokens.set(self._token_key(token), user_id,
+                             expires_at=time.monotonic() + remaining)
+
+    def get_user(self, user_id: int) -> Optional[AuthUser]:
+        return self._users.get(user_id)
+
+    def put_user(self, user: AuthUser) -> None:
+        if user.is_active:
+            self._users.set(user.id, user)
+
+    def invalidate_user(self, user_id: int) -> None:
+        self._users.pop(user_id)
+
+    def clear(self) -> None:
+        self._users.clear()
+        self._tokens.clear()
+
+
+auth_cache = AuthCache()
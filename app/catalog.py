@@ -0,0 +1,227 @@
+# app/catalog.py
+"""
+Immutable in-process snapshot of the exercise catalog.
+
+Exercise rows never change between catalog imports, yet every workout,
+progression and mesocycle load used to join them just to read name,
+body_part, target and equipment. Hot paths now load exercise ids only and
+resolve them here, from compact records that also carry the derived
+fields the progression code needs (equipment class, dumbbell flag,
+normalized muscle group).
+
+Snapshots are never mutated; a catalog change builds a new one and swaps
+it in, so readers need no locks.
+"""
+import time
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, Optional
+
+from sqlalchemy import event, func, literal, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import EXERCISE_CATALOG_CHECK_SECONDS
+from app.equipment import classify_equipment, is_dumbbell_exercise
+from app.search import ExerciseSearchIndex
+
+if TYPE_CHECKING:
+    # Only the async stack needs sqlalchemy.ext.asyncio loaded
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+# ═══════════════════════════════════════════════════════
+# RECORDS
+# ═══════════════════════════════════════════════════════
+
+class CatalogExercise:
+    """One exercise row plus derived fields. Reads like the ORM object."""
+    __slots__ = ("id", "name", "body_part", "equipment", "target",
+                 "equipment_class", "is_dumbbell", "muscle_group")
+
+    def __init__(self, id: int, name: str, body_part: str,
+                 equipment: Optional[str], target: str):
+        for field, value in (
+            ("id", id), ("name", name), ("body_part", body_part),
+            ("equipment", equipment), ("target", target),
+            ("equipment_class", classify_equipment(name, equipment)),
+            ("is_dumbbell", is_dumbbell_exercise(name, equipment)),
+            # Key that smart progression matches feedback against
+            ("muscle_group", (target or body_part or "unknown").lower()),
+        ):
+            object.__setattr__(self, field, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CatalogExercise is immutable")
+
+    def __repr__(self) -> str:
+        return f"CatalogExercise(id={self.id!r}, name={self.name!r})"
+
+
+class CatalogSnapshot(Mapping):
+    """Read-only ``exercise id → CatalogExercise`` mapping."""
+
+    def __init__(self, exercises: Iterable[CatalogExercise], fingerprint=None):
+        self._by_id: Dict[int, CatalogExercise] = {ex.id: ex for ex in exercises}
+        self.fingerprint = fingerprint
+        self._search_index = None
+
+    def __getitem__(self, exercise_id: int) -> CatalogExercise:
+        return self._by_id[exercise_id]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._by_id)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    @property
+    def search_index(self):
+        """ExerciseSearchIndex over this snapshot, built on first use."""
+        if self._search_index is None:
+            self._search_index = ExerciseSearchIndex(self._by_id.values())
+        return self._search_index
+
+
+# ═══════════════════════════════════════════════════════
+# LIFECYCLE
+# ═══════════════════════════════════════════════════════
+
+def catalog_fingerprint_stmt():
+    """Cheap catalog version: changes whenever a row is added, removed or edited."""
+    row_hash = func.md5(func.concat_ws(
+        "|", models.Exercise.id, models.Exercise.name, models.Exercise.body_part,
+        models.Exercise.equipment, models.Exercise.target,
+    ))
+    return select(
+        func.count(),
+        func.md5(func.string_agg(row_hash, aggregate_order_by(literal(""), models.Exercise.id))),
+    )
+
+
+def catalog_rows_stmt():
+    return select(
+        models.Exercise.id, models.Exercise.name, models.Exercise.body_part,
+        models.Exercise.equipment, models.Exercise.target,
+    )
+
+
+class ExerciseCatalog:
+    """
+    Owns the current CatalogSnapshot and keeps it in step with the table.
+
+    The snapshot is loaded at startup. Changes made through the ORM in this
+    process mark it stale right away; changes from elsewhere
+    (import_exercises.py, another worker) are caught by comparing a catalog
+    fingerprint at most once every ``check_interval`` seconds.
+
+    resolve() takes ids read from rows that reference exercises (the
+    foreign key guarantees they exist), so a miss always compares the
+    fingerprint and reloads if the catalog changed. lookup() takes an id a
+    client asked for, which may not exist: its misses compare the
+    fingerprint at most once per interval, so bogus ids can't force a scan
+    per request.
+
+    Every entry point has a sync and an async form; only the I/O differs.
+    """
+
+    def __init__(self, check_interval: float = EXERCISE_CATALOG_CHECK_SECONDS):
+        self.check_interval = check_interval
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._next_check = 0.0
+        self._next_lookup_check = 0.0
+        self._stale = True
+
+    def mark_stale(self) -> None:
+        self._stale = True
+
+    def _needs_check(self) -> bool:
+        return self._snapshot is None or self._stale or time.monotonic() >= self._next_check
+
+    def _lookup_check_due(self, snapshot: CatalogSnapshot, exercise_id: int) -> bool:
+        """The id is missing and no lookup miss has compared the fingerprint this interval."""
+        if exercise_id in snapshot:
+            return False
+        now = time.monotonic()
+        if now < self._next_lookup_check:
+            return False
+        self._next_lookup_check = now + self.check_interval
+        return True
+
+    def _install(self, fingerprint: tuple, rows=None) -> CatalogSnapshot:
+        self._next_check = time.monotonic() + self.check_interval
+        if rows is not None:
+            self._snapshot = CatalogSnapshot((CatalogExercise(*row) for row in rows), fingerprint)
+        return self._snapshot
+
+    def _unchanged(self, fingerprint: tuple) -> bool:
+        return (self._snapshot is not None and not self._stale
+                and fingerprint == self._snapshot.fingerprint)
+
+    # ── Sync ─────────────────────────────────────────
+    def refresh(self, db: Session) -> CatalogSnapshot:
+        """Reload now if the catalog changed (or was never loaded)."""
+        fingerprint = tuple(db.execute(catalog_fingerprint_stmt()).one())
+        if self._unchanged(fingerprint):
+            return self._install(fingerprint)
+        self._stale = False
+        return self._install(fingerprint, db.execute(catalog_rows_stmt()).all())
+
+    def current(self, db: Session) -> CatalogSnapshot:
+        if self._needs_check():
+            return self.refresh(db)
+        return self._snapshot
+
+    def resolve(self, db: Session, exercise_ids: Iterable[int]) -> CatalogSnapshot:
+        """A current snapshot containing every id in ``exercise_ids`` (existing ids only)."""
+        snapshot = self.current(db)
+        if any(eid not in snapshot for eid in exercise_ids):
+            snapshot = self.refresh(db)
+        return snapshot
+
+    def lookup(self, db: Session, exercise_id: int) -> Optional[CatalogExercise]:
+        """One client-supplied id, or None if it doesn't exist."""
+        snapshot = self.current(db)
+        if self._lookup_check_due(snapshot, exercise_id):
+            snapshot = self.refresh(db)
+        return snapshot.get(exercise_id)
+
+    # ── Async ────────────────────────────────────────
+    async def refresh_async(self, db: "AsyncSession") -> CatalogSnapshot:
+        """See refresh()."""
+        fingerprint = tuple((await db.execute(catalog_fingerprint_stmt())).one())
+        if self._unchanged(fingerprint):
+            return self._install(fingerprint)
+        self._stale = False
+        return self._install(fingerprint, (await db.execute(catalog_rows_stmt())).all())
+
+    async def current_async(self, db: "AsyncSession") -> CatalogSnapshot:
+        if self._needs_check():
+            return await self.refresh_async(db)
+        return self._snapshot
+
+    async def resolve_async(self, db: "AsyncSession",
+                            exercise_ids: Iterable[int]) -> CatalogSnapshot:
+        """See resolve()."""
+        snapshot = await self.current_async(db)
+        if any(eid not in snapshot for eid in exercise_ids):
+            snapshot = await self.refresh_async(db)
+        return snapshot
+
+    async def lookup_async(self, db: "AsyncSession",
+                           exercise_id: int) -> Optional[CatalogExercise]:
+        """See lookup()."""
+        snapshot = await self.current_async(db)
+        if self._lookup_check_due(snapshot, exercise_id):
+            snapshot = await self.refresh_async(db)
+        return snapshot.get(exercise_id)
+
+
+exercise_catalog = ExerciseCatalog()
+
+
+@event.listens_for(models.Exercise, "after_insert")
+@event.listens_for(models.Exercise, "after_update")
+@event.listens_for(models.Exercise, "after_delete")
+def _exercise_changed(mapper, connection, target):
+    exercise_catalog.mark_stale()
@@ -16,9 +16,61 @@ DB_PASSWORD_ENCODED = quote(DB_PASSWORD)
 SQLALCHEMY_DATABASE_URL = (
     f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD_ENCODED}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 )
+SQLALCHEMY_ASYNC_DATABASE_URL = (
+    f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD_ENCODED}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+)
+
+# ── Database pool (per process, per engine) ───────────
+# Worst case per worker: DB_POOL_SIZE + DB_MAX_OVERFLOW connections for each
+# of the sync and async engines.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "10"))
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+# "recycle": trust pool_recycle to retire connections before the server or a
+#            proxy drops them (no extra round-trip per checkout)
+# "always":  ping on every checkout (safer behind aggressive proxies)
+DB_PRE_PING = os.getenv("DB_PRE_PING", "recycle")
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "15000"))
 
 # ── JWT ───────────────────────────────────────────────
 SECRET_KEY = os.getenv("SECRET_KEY", "super-secret-change-me-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 7
+
+# ── Password hashing ──────────────────────────────────
+# Any passlib scheme ("bcrypt", "pbkdf2_sha256", "argon2", ...). Hashes made
+# with another scheme or cost still verify and are rehashed on next login.
+PASSWORD_HASH_SCHEME = os.getenv("PASSWORD_HASH_SCHEME", "bcrypt")
+# Scheme-specific cost: log2 rounds for bcrypt, iterations for pbkdf2,
+# time cost for argon2. Unset = passlib's default for the scheme.
+PASSWORD_HASH_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS", "0")) or None
+# Processes dedicated to hashing; 0 hashes on a thread instead
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+
+# ── Gym equipment (weight ladders) ────────────────────
+# Comma-separated kg lists; leave GYM_DUMBBELL_WEIGHTS_KG unset for the
+# standard dumbbell rack.
+def _kg_list(value: str | None) -> list[float] | None:
+    if not value:
+        return None
+    return [float(v) for v in value.split(",") if v.strip()]
+
+GYM_DUMBBELL_WEIGHTS_KG = _kg_list(os.getenv("GYM_DUMBBELL_WEIGHTS_KG"))
+GYM_BARBELL_BAR_KG = float(os.getenv("GYM_BARBELL_BAR_KG", "20"))
+GYM_BARBELL_PLATES_KG = _kg_list(os.getenv("GYM_BARBELL_PLATES_KG", "25,20,15,10,5,2.5,1.25"))
+GYM_BARBELL_MAX_KG = float(os.getenv("GYM_BARBELL_MAX_KG", "400"))
+GYM_MACHINE_STACK_STEP_KG = float(os.getenv("GYM_MACHINE_STACK_STEP_KG", "5"))
+GYM_MACHINE_STACK_MAX_KG = float(os.getenv("GYM_MACHINE_STACK_MAX_KG", "200"))
+GYM_CABLE_STACK_STEP_KG = float(os.getenv("GYM_CABLE_STACK_STEP_KG", "2.5"))
+GYM_CABLE_STACK_MAX_KG = float(os.getenv("GYM_CABLE_STACK_MAX_KG", "120"))
+
+# ── Caching ───────────────────────────────────────────
+SMART_TARGET_CACHE_SIZE = int(os.getenv("SMART_TARGET_CACHE_SIZE", "2048"))
+SMART_TARGET_CACHE_TTL_SECONDS = int(os.getenv("SMART_TARGET_CACHE_TTL_SECONDS", "600"))
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "10000"))
+AUTH_USER_CACHE_TTL_SECONDS = int(os.getenv("AUTH_USER_CACHE_TTL_SECONDS", "300"))
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "20000"))
+# How often a worker checks whether the exercise catalog changed elsewhere
+EXERCISE_CATALOG_CHECK_SECONDS = int(os.getenv("EXERCISE_CATALOG_CHECK_SECONDS", "60"))
@@ -1,44 +1,34 @@
 # app/crud.py
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
+from sqlalchemy.orm import Session, contains_eager, joinedload, object_session, selectinload
+from sqlalchemy import (
+    Float, Integer, String, case, cast, column, event, false, func, literal, literal_column,
+    or_, select, true, tuple_, update, values,
+)
+from sqlalchemy.dialects.postgresql import array as pg_array, insert as pg_insert
 from typing import Optional, List, Dict
-from app import models
+from app import models, progression_engine as engine
+from app.cache import auth_cache, smart_target_cache
+from app.catalog import CatalogSnapshot, exercise_catalog
+from app.equipment import EQUIPMENT_CLASSES, is_dumbbell_exercise
+from app.progression_engine import (
+    WEEKLY_WEIGHT_INCREMENT_PCT,
+    MIN_BARBELL_INCREMENT_KG,
+    MIN_DUMBBELL_INCREMENT_KG,
+    DUMBBELL_WEIGHTS_KG,
+    DEFAULT_REP_FLOOR,
+    DEFAULT_REP_CEILING,
+    ABSOLUTE_REP_CAP,
+    MIN_SETS_PER_EXERCISE,
+    MAX_SETS_PER_EXERCISE,
+    SORENESS_OVERTRAINED_THRESHOLD,
+    SORENESS_UNDER_RECOVERED_THRESHOLD,
+    SORENESS_FULLY_RECOVERED_THRESHOLD,
+    DELOAD_WEIGHT_REDUCTION,
+)
+from app.serializers import serialize_day
 from app.utils import hash_password
 
 
-# ═══════════════════════════════════════════════════════════════════════════
-# PROGRESSION ENGINE CONFIGURATION
-# ═══════════════════════════════════════════════════════════════════════════
-
-# Weight progression
-WEEKLY_WEIGHT_INCREMENT_PCT = 0.025   # 2.5% target weekly increase
-MIN_BARBELL_INCREMENT_KG = 2.5        # Smallest barbell plate jump
-MIN_DUMBBELL_INCREMENT_KG = 2.0       # Smallest dumbbell jump
-
-# Standard dumbbell weights available in most gyms (in kg)
-DUMBBELL_WEIGHTS_KG = [
-    2, 4, 5, 6, 7.5, 8, 10, 12, 12.5, 14, 15, 16, 17.5, 20,
-    22.5, 25, 27.5, 30, 32.5, 35, 37.5, 40, 42.5, 45, 47.5, 50,
-    52.5, 55, 57.5, 60
-]
-
-# Rep ranges for hypertrophy
-DEFAULT_REP_FLOOR = 8
-DEFAULT_REP_CEILING = 12
-ABSOLUTE_REP_CAP = 20  # Never prescribe more than this
-
-# Volume limits
-MIN_SETS_PER_EXERCISE = 2
-MAX_SETS_PER_EXERCISE = 6
-
-# Feedback thresholds
-SORENESS_OVERTRAINED_THRESHOLD = 2.5
-SORENESS_UNDER_RECOVERED_THRESHOLD = 1.5
-SORENESS_FULLY_RECOVERED_THRESHOLD = 0.5
-
-DELOAD_WEIGHT_REDUCTION = 0.10  # 10% weight reduction on deload
-
-
 # ═══════════════════════════════════════════════════════
 # USERS
 # ═══════════════════════════════════════════════════════
@@ -60,25 +50,40 @@ def create_user(db: Session, name: str, email: str, password: str):
     return db_user
 
 
+@event.listens_for(models.User, "after_update")
+@event.listens_for(models.User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target):
+    # Any change to a user (deactivation, new email, …) drops its cached auth
+    # record now, and again after commit in case a concurrent request
+    # re-cached the old row in between.
+    auth_cache.invalidate_user(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_user_ids", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session):
+    for user_id in session.info.pop("changed_user_ids", ()):
+        auth_cache.invalidate_user(user_id)
+
+
 # ═══════════════════════════════════════════════════════
 # EXERCISES (read-only after CSV import)
 # ═══════════════════════════════════════════════════════
 
 def get_exercises(db: Session, skip: int = 0, limit: int = 50,
                   body_part: str | None = None, target: str | None = None,
-                  search: str | None = None):
-    q = db.query(models.Exercise)
-    if body_part:
-        q = q.filter(models.Exercise.body_part.ilike(body_part))
-    if target:
-        q = q.filter(models.Exercise.target.ilike(target))
-    if search:
-        q = q.filter(models.Exercise.name.ilike(f"%{search}%"))
-    return q.order_by(models.Exercise.name).offset(skip).limit(limit).all()
+                  search: str | None = None, equipment: str | None = None):
+    """Catalog search, served from the in-process index (see app/search.py)."""
+    return exercise_catalog.current(db).search_index.search(
+        query=search, body_part=body_part, target=target,
+        equipment=equipment, skip=skip, limit=limit,
+    )
 
 
 def get_exercise_by_id(db: Session, exercise_id: int):
-    return db.query(models.Exercise).filter(models.Exercise.id == exercise_id).first()
+    return exercise_catalog.lookup(db, exercise_id)
 
 
 # ═══════════════════════════════════════════════════════
@@ -86,27 +91,36 @@ def get_exercise_by_id(db: Session, exercise_id: int):
 # ═══════════════════════════════════════════════════════
 
 def create_plan(db: Session, user_id: int, name: str, days_data: list):
-    plan = models.Plan(user_id=user_id, name=name)
-    db.add(plan)
-    db.flush()
-
-    for d in days_data:
-        day = models.PlanDay(plan_id=plan.id, name=d["name"], order=d["order"])
-        db.add(day)
-        db.flush()
-        for ex in d.get("exercises", []):
-            pde = models.PlanDayExercise(
-                plan_day_id=day.id,
-                exercise_id=ex["exercise_id"],
-                order=ex["order"],
-            )
-            db.add(pde)
+    """
+    Create a plan with its days and exercises.
 
+    The whole tree is added before a single flush, so the unit of work
+    writes each table with one batched INSERT ... RETURNING instead of
+    flushing once per day. Exercise ids are trusted; check them first with
+    unknown_exercise_ids().
+    """
+    plan = models.Plan(user_id=user_id, name=name, days=[
+        models.PlanDay(name=d["name"], order=d["order"], exercises=[
+            models.PlanDayExercise(exercise_id=ex["exercise_id"], order=ex["order"])
+            for ex in d.get("exercises", [])
+        ])
+        for d in days_data
+    ])
+    db.add(plan)
     db.commit()
     db.refresh(plan)
     return plan
 
 
+def unknown_exercise_ids(db: Session, exercise_ids) -> List[int]:
+    """The given exercise ids that don't exist, sorted, from one IN query."""
+    wanted = set(exercise_ids)
+    if not wanted:
+        return []
+    found = db.scalars(select(models.Exercise.id).where(models.Exercise.id.in_(wanted)))
+    return sorted(wanted - set(found))
+
+
 def get_plans(db: Session, user_id: int):
     return (
         db.query(models.Plan)
@@ -155,41 +169,65 @@ def delete_plan(db: Session, plan_id: int, user_id: int):
 # ═══════════════════════════════════════════════════════
 
 def start_mesocycle(db: Session, user_id: int, plan_id: int, name: str):
-    plan = get_plan_by_id(db, plan_id, user_id)
-    if not plan:
+    """
+    Start a mesocycle from a plan: week 1 gets one day per plan day, and
+    each day the plan day's exercises at two sets.
+
+    The days and exercises are copied from the plan tables by a single
+    INSERT ... SELECT (see instantiate_plan_week_stmt()), so the statement
+    count doesn't grow with the size of the plan.
+    """
+    owned = db.scalar(select(models.Plan.id).where(
+        models.Plan.id == plan_id, models.Plan.user_id == user_id,
+    ))
+    if owned is None:
         return None
 
-    meso = models.Mesocycle(user_id=user_id, plan_id=plan_id, name=name)
+    week = models.MesocycleWeek(week_number=1)
+    meso = models.Mesocycle(user_id=user_id, plan_id=plan_id, name=name, weeks=[week])
     db.add(meso)
     db.flush()
-
-    week = models.MesocycleWeek(mesocycle_id=meso.id, week_number=1)
-    db.add(week)
-    db.flush()
-
-    for plan_day in plan.days:
-        md = models.MesocycleDay(
-            week_id=week.id,
-            plan_day_id=plan_day.id,
-            day_order=plan_day.order,
-        )
-        db.add(md)
-        db.flush()
-
-        for pde in plan_day.exercises:
-            mde = models.MesocycleDayExercise(
-                meso_day_id=md.id,
-                exercise_id=pde.exercise_id,
-                exercise_order=pde.order,
-                prescribed_sets=2,
-            )
-            db.add(mde)
+    db.execute(instantiate_plan_week_stmt(plan_id, week.id, user_id))
 
     db.commit()
     db.refresh(meso)
     return meso
 
 
+def instantiate_plan_week_stmt(plan_id: int, week_id: int, user_id: int,
+                               prescribed_sets: int = 2):
+    """
+    Copy a plan's days and exercises into a mesocycle week in one statement:
+    the day insert is a CTE whose RETURNING ids are matched back to the
+    plan days they came from.
+    """
+    pd, pde, md = models.PlanDay, models.PlanDayExercise, models.MesocycleDay
+    new_days = (
+        pg_insert(md)
+        .from_select(
+            ["week_id", "plan_day_id", "day_order", "is_completed"],
+            select(literal(week_id), pd.id, pd.order, false())
+            .where(pd.plan_id == plan_id)
+            .order_by(pd.order, pd.id),
+        )
+        .returning(md.id, md.plan_day_id)
+        .cte("new_days")
+    )
+    return (
+        pg_insert(models.MesocycleDayExercise)
+        .from_select(
+            ["meso_day_id", "exercise_id", "user_id", "exercise_order", "prescribed_sets"],
+            select(new_days.c.id, pde.exercise_id, literal(user_id), pde.order,
+                   literal(prescribed_sets))
+            .select_from(new_days)
+            .join(pde, pde.plan_day_id == new_days.c.plan_day_id)
+            .join(pd, pd.id == pde.plan_day_id)
+            .order_by(pd.order, pde.order, pde.id),
+        )
+        .add_cte(new_days)
+    )
+
+
 def get_mesocycles(db: Session, user_id: int):
     return (
         db.query(models.Mesocycle)
@@ -200,26 +238,30 @@ def get_mesocycles(db: Session, user_id: int):
 
 
 def get_mesocycle_detail(db: Session, mesocycle_id: int, user_id: int):
+    """
+    Mesocycle with its whole week → day → exercise tree loaded.
+
+    Every collection level is fetched with one IN-query (selectinload), in
+    the relationship's order_by, so rows grow with the number of logged
+    sets rather than with the product of weeks × days × exercises × sets.
+    plan_day rides along on the day query; exercises are resolved from the
+    catalog snapshot (see serialize_mesocycle_detail()), not joined.
+    """
+    return db.scalars(mesocycle_detail_stmt(mesocycle_id, user_id)).first()
+
+
+def mesocycle_detail_stmt(mesocycle_id: int, user_id: int):
+    """SELECT behind get_mesocycle_detail(), shared with app.async_crud."""
+    days = selectinload(models.Mesocycle.weeks).selectinload(models.MesocycleWeek.days)
+    exercises = days.selectinload(models.MesocycleDay.exercises)
     return (
-        db.query(models.Mesocycle)
-        .filter(models.Mesocycle.id == mesocycle_id, models.Mesocycle.user_id == user_id)
+        select(models.Mesocycle)
+        .where(models.Mesocycle.id == mesocycle_id, models.Mesocycle.user_id == user_id)
         .options(
-            joinedload(models.Mesocycle.weeks)
-            .joinedload(models.MesocycleWeek.days)
-            .joinedload(models.MesocycleDay.exercises)
-            .joinedload(models.MesocycleDayExercise.exercise),
-            joinedload(models.Mesocycle.weeks)
-            .joinedload(models.MesocycleWeek.days)
-            .joinedload(models.MesocycleDay.exercises)
-            .joinedload(models.MesocycleDayExercise.set_logs),
-            joinedload(models.Mesocycle.weeks)
-            .joinedload(models.MesocycleWeek.days)
-            .joinedload(models.MesocycleDay.feedbacks),
-            joinedload(models.Mesocycle.weeks)
-            .joinedload(models.MesocycleWeek.days)
-            .joinedload(models.MesocycleDay.plan_day),
+            days.joinedload(models.MesocycleDay.plan_day),
+            days.selectinload(models.MesocycleDay.feedbacks),
+            exercises.selectinload(models.MesocycleDayExercise.set_logs),
         )
-        .first()
     )
 
 
@@ -231,107 +273,263 @@ def delete_mesocycle(db: Session, mesocycle_id: int, user_id: int):
     if not meso:
         return False
     db.delete(meso)
+    db.flush()
+    # Its set logs and completed days may have been the latest or the best
+    ep = models.ExercisePerformance
+    db.execute(refresh_exercise_performance_stmt(
+        select(ep.user_id, ep.exercise_id).where(ep.user_id == user_id).subquery("p")
+    ))
     db.commit()
     return True
 
 
 def get_current_workout(db: Session, mesocycle_id: int, user_id: int):
-    meso = (
-        db.query(models.Mesocycle)
-        .filter(models.Mesocycle.id == mesocycle_id, models.Mesocycle.user_id == user_id)
-        .first()
-    )
-    if not meso:
-        return None
+    """
+    First incomplete day of the mesocycle's current week.
 
-    week = (
-        db.query(models.MesocycleWeek)
-        .filter(
-            models.MesocycleWeek.mesocycle_id == meso.id,
-            models.MesocycleWeek.week_number == meso.current_week,
-        )
-        .first()
-    )
-    if not week:
-        return None
+    Mesocycle → current week → day is resolved by joins in the same
+    statement that eager-loads the day, instead of three sequential lookups.
+    The day's week and mesocycle come back populated too.
+    """
+    return db.execute(current_workout_stmt(mesocycle_id, user_id)).unique().scalars().first()
 
-    day = (
-        db.query(models.MesocycleDay)
-        .filter(
-            models.MesocycleDay.week_id == week.id,
+
+def current_workout_stmt(mesocycle_id: int, user_id: int):
+    """SELECT behind get_current_workout(), shared with app.async_crud."""
+    return (
+        select(models.MesocycleDay)
+        .join(models.MesocycleDay.week)
+        .join(models.MesocycleWeek.mesocycle)
+        .where(
+            models.Mesocycle.id == mesocycle_id,
+            models.Mesocycle.user_id == user_id,
+            models.MesocycleWeek.week_number == models.Mesocycle.current_week,
             models.MesocycleDay.is_completed == False,
         )
         .options(
-            joinedload(models.MesocycleDay.exercises)
-            .joinedload(models.MesocycleDayExercise.exercise),
+            contains_eager(models.MesocycleDay.week)
+            .contains_eager(models.MesocycleWeek.mesocycle),
             joinedload(models.MesocycleDay.exercises)
             .joinedload(models.MesocycleDayExercise.set_logs),
             joinedload(models.MesocycleDay.feedbacks),
             joinedload(models.MesocycleDay.plan_day),
         )
         .order_by(models.MesocycleDay.day_order)
-        .first()
+        .limit(1)
     )
-    return day
+
+
+def get_workout_bundle(db: Session, mesocycle_id: int, user_id: int) -> Optional[dict]:
+    """
+    Everything the workout page needs in one response: the current day
+    (with its logs and feedback) and its smart targets.
+
+    One statement loads the day; targets come from the smart target cache,
+    and a miss computes them from the already-loaded day.
+    """
+    day = get_current_workout(db, mesocycle_id, user_id)
+    if not day:
+        return None
+    catalog = exercise_catalog.resolve(db, day_exercise_ids(day))
+    return {
+        "mesocycle_id": mesocycle_id,
+        "week_number": day.week.week_number,
+        "day_name": day.plan_day.name if day.plan_day else f"Day {day.day_order}",
+        "day": serialize_day(day, catalog),
+        "targets": get_cached_smart_targets(db, day.id, user_id, day=day)[1],
+    }
+
+
+def day_exercise_ids(*days) -> set:
+    """Exercise ids referenced by the given MesocycleDays, for catalog lookups."""
+    return {mde.exercise_id for day in days for mde in day.exercises}
 
 
 # ═══════════════════════════════════════════════════════
 # SET LOGGING
 # ═══════════════════════════════════════════════════════
 
-def log_set(db: Session, meso_day_exercise_id: int, set_number: int,
-            weight: float, reps: int):
-    # Check if set already exists (update instead of duplicate)
-    existing = db.query(models.SetLog).filter(
-        models.SetLog.meso_day_exercise_id == meso_day_exercise_id,
-        models.SetLog.set_number == set_number,
-    ).first()
-    if existing:
-        existing.weight = weight
-        existing.reps = reps
-        db.commit()
-        db.refresh(existing)
-        return existing
-
-    sl = models.SetLog(
-        meso_day_exercise_id=meso_day_exercise_id,
-        set_number=set_number,
-        weight=weight,
-        reps=reps,
+SET_LOG_RESULT_COLUMNS = ("id", "meso_day_exercise_id", "set_number", "weight", "reps", "logged_at")
+
+
+def upsert_set_logs_stmt(sets: List[dict], user_id: int):
+    """
+    INSERT ... ON CONFLICT DO UPDATE ... RETURNING for upsert_set_logs()
+    (shared with app.async_crud), or None when there is nothing to write.
+
+    Rows are inserted from a VALUES list joined to their MesocycleDayExercise,
+    which supplies the denormalized user_id and exercise_id. The join only
+    matches the user's exercises, so sets for anyone else's are dropped.
+    """
+    latest = {(s["meso_day_exercise_id"], s["set_number"]): s for s in sets}
+    if not latest:
+        return None
+    # Sorted rows take row locks in a consistent order across concurrent syncs
+    rows = values(
+        column("meso_day_exercise_id", Integer), column("set_number", Integer),
+        column("weight", Float), column("reps", Integer),
+        name="v",
+    ).data([
+        (mde_id, set_number, s["weight"], s["reps"])
+        for (mde_id, set_number), s in sorted(latest.items())
+    ])
+    mde = models.MesocycleDayExercise
+    stmt = pg_insert(models.SetLog).from_select(
+        ["meso_day_exercise_id", "set_number", "weight", "reps", "user_id", "exercise_id"],
+        select(rows.c.meso_day_exercise_id, rows.c.set_number, rows.c.weight, rows.c.reps,
+               mde.user_id, mde.exercise_id)
+        .join(mde, mde.id == rows.c.meso_day_exercise_id)
+        .where(mde.user_id == user_id)
+        .order_by(rows.c.meso_day_exercise_id, rows.c.set_number),
     )
-    db.add(sl)
+    return stmt.on_conflict_do_update(
+        constraint="uq_set_logs_mde_set",
+        set_={"weight": stmt.excluded.weight, "reps": stmt.excluded.reps},
+    ).returning(
+        *(getattr(models.SetLog, c) for c in SET_LOG_RESULT_COLUMNS),
+        # For set_log_performance_stmts(); dropped from the results
+        models.SetLog.user_id,
+        models.SetLog.exercise_id,
+        (literal_column("xmax") == 0).label("inserted"),
+    )
+
+
+def upsert_set_logs(db: Session, sets: List[dict], user_id: int) -> List[dict]:
+    """
+    Insert or overwrite many of the user's set logs in one statement and
+    one commit.
+
+    Each item needs meso_day_exercise_id, set_number, weight and reps. Sets
+    on exercises the user doesn't own are not written. A set
+    that already exists gets its weight and reps replaced (logged_at keeps
+    the first log time), via INSERT ... ON CONFLICT on uq_set_logs_mde_set.
+    When the same set appears twice the last one wins.
+
+    exercise_performance is brought up to date in the same transaction.
+
+    Returns the written rows as dicts, ordered by exercise and set number.
+    """
+    stmt = upsert_set_logs_stmt(sets, user_id)
+    if stmt is None:
+        return []
+    written = db.execute(stmt).mappings().all()
+    for perf_stmt in set_log_performance_stmts(written):
+        db.execute(perf_stmt)
     db.commit()
-    db.refresh(sl)
-    return sl
+    return set_log_results(written)
 
 
-def skip_sets(db: Session, meso_day_exercise_id: int, from_set: int, to_set: int):
+def set_log_results(written) -> List[dict]:
+    """upsert_set_logs_stmt() rows as the API returns them."""
+    rows = [{c: r[c] for c in SET_LOG_RESULT_COLUMNS} for r in written]
+    rows.sort(key=lambda r: (r["meso_day_exercise_id"], r["set_number"]))
+    return rows
+
+
+def log_set(db: Session, meso_day_exercise_id: int, set_number: int,
+            weight: float, reps: int, user_id: int):
+    # Upsert: logging an existing set number updates it instead of duplicating
+    written = upsert_set_logs(db, [{
+        "meso_day_exercise_id": meso_day_exercise_id,
+        "set_number": set_number,
+        "weight": weight,
+        "reps": reps,
+    }], user_id)
+    return written[0] if written else None
+
+
+def get_day_exercise_ids(db: Session, meso_day_id: int, user_id: int) -> Optional[set]:
+    """
+    Ids of the MesocycleDayExercises on a day the user owns, or None if the
+    day does not exist / belongs to someone else.
+    """
+    rows = (
+        db.query(models.MesocycleDay.id, models.MesocycleDayExercise.id)
+        .join(models.MesocycleDay.week)
+        .join(models.MesocycleWeek.mesocycle)
+        .outerjoin(models.MesocycleDay.exercises)
+        .filter(
+            models.MesocycleDay.id == meso_day_id,
+            models.Mesocycle.user_id == user_id,
+        )
+        .all()
+    )
+    if not rows:
+        return None
+    return {mde_id for _, mde_id in rows if mde_id is not None}
+
+
+def owned_day_stmt(meso_day_id: int, user_id: int):
+    """
+    SELECT of a MesocycleDay only if it belongs to the user. The joins that
+    check ownership also populate day.week and day.week.mesocycle; add
+    loader options for whatever else the caller needs.
+    """
+    return (
+        select(models.MesocycleDay)
+        .join(models.MesocycleDay.week)
+        .join(models.MesocycleWeek.mesocycle)
+        .where(
+            models.MesocycleDay.id == meso_day_id,
+            models.Mesocycle.user_id == user_id,
+        )
+        .options(
+            contains_eager(models.MesocycleDay.week)
+            .contains_eager(models.MesocycleWeek.mesocycle)
+        )
+    )
+
+
+def owned_day_id_stmt(meso_day_id: int, user_id: int):
+    """The day's id if it belongs to the user, for scoping writes in SQL."""
+    md, mw, m = models.MesocycleDay, models.MesocycleWeek, models.Mesocycle
+    return (
+        select(md.id)
+        .join(mw, mw.id == md.week_id)
+        .join(m, m.id == mw.mesocycle_id)
+        .where(md.id == meso_day_id, m.user_id == user_id)
+    )
+
+
+def get_owned_set_log(db: Session, set_log_id: int, user_id: int):
+    """The SetLog if it belongs to the user, else None."""
+    return db.query(models.SetLog).filter(
+        models.SetLog.id == set_log_id,
+        models.SetLog.user_id == user_id,
+    ).first()
+
+
+def skip_sets(db: Session, meso_day_exercise_id: int, from_set: int, to_set: int,
+              user_id: int):
     """Mark sets as skipped by logging them with weight=0, reps=0."""
-    results = []
-    for s in range(from_set, to_set + 1):
-        existing = db.query(models.SetLog).filter(
-            models.SetLog.meso_day_exercise_id == meso_day_exercise_id,
-            models.SetLog.set_number == s,
-        ).first()
-        if existing:
-            existing.weight = 0
-            existing.reps = 0
-        else:
-            existing = models.SetLog(
-                meso_day_exercise_id=meso_day_exercise_id,
-                set_number=s, weight=0, reps=0,
-            )
-            db.add(existing)
-        results.append(existing)
-    db.commit()
-    return results
+    return skip_sets_bulk(db, [(meso_day_exercise_id, from_set, to_set)], user_id)
 
 
-def add_set_to_exercise(db: Session, meso_day_exercise_id: int):
-    """Increase prescribed_sets by 1."""
-    mde = db.query(models.MesocycleDayExercise).filter(
-        models.MesocycleDayExercise.id == meso_day_exercise_id
+def skip_sets_bulk(db: Session, ranges: List[tuple], user_id: int) -> List[dict]:
+    """
+    Skip set ranges across several exercises in one upsert.
+
+    ranges: (meso_day_exercise_id, from_set, to_set) tuples, inclusive.
+    Returns the zeroed rows (see upsert_set_logs).
+    """
+    return upsert_set_logs(db, [
+        {"meso_day_exercise_id": mde_id, "set_number": n, "weight": 0, "reps": 0}
+        for mde_id, from_set, to_set in ranges
+        for n in range(from_set, to_set + 1)
+    ], user_id)
+
+
+def get_owned_day_exercise(db: Session, meso_day_exercise_id: int, user_id: int):
+    """The MesocycleDayExercise if it belongs to the user, else None."""
+    return db.query(models.MesocycleDayExercise).filter(
+        models.MesocycleDayExercise.id == meso_day_exercise_id,
+        models.MesocycleDayExercise.user_id == user_id,
     ).first()
+
+
+def add_set_to_exercise(db: Session, meso_day_exercise_id: int, user_id: int):
+    """Increase prescribed_sets by 1."""
+    mde = get_owned_day_exercise(db, meso_day_exercise_id, user_id)
     if not mde:
         return None
     mde.prescribed_sets += 1
@@ -344,10 +542,8 @@ def add_set_to_exercise(db: Session, meso_day_exercise_id: int):
 # EXERCISE NOTES
 # ═══════════════════════════════════════════════════════
 
-def save_exercise_note(db: Session, meso_day_exercise_id: int, note: str):
-    mde = db.query(models.MesocycleDayExercise).filter(
-        models.MesocycleDayExercise.id == meso_day_exercise_id
-    ).first()
+def save_exercise_note(db: Session, meso_day_exercise_id: int, note: str, user_id: int):
+    mde = get_owned_day_exercise(db, meso_day_exercise_id, user_id)
     if not mde:
         return None
     mde.note = note
@@ -364,10 +560,8 @@ def get_exercise_history(db: Session, exercise_id: int, user_id: int, limit: int
     rows = (
         db.query(models.MesocycleDayExercise)
         .join(models.MesocycleDay)
-        .join(models.MesocycleWeek)
-        .join(models.Mesocycle)
         .filter(
-            models.Mesocycle.user_id == user_id,
+            models.MesocycleDayExercise.user_id == user_id,
             models.MesocycleDayExercise.exercise_id == exercise_id,
             models.MesocycleDay.is_completed == True,
         )
@@ -403,97 +597,363 @@ def get_exercise_history(db: Session, exercise_id: int, user_id: int, limit: int
     return history
 
 
+def previous_session_sets_stmt(exercise_ids: List[int], user_id: int,
+                                exclude_meso_day_id: Optional[int] = None):
+    """SELECT behind get_previous_session_sets(), shared with app.async_crud."""
+    filters = [
+        models.MesocycleDayExercise.user_id == user_id,
+        models.MesocycleDayExercise.exercise_id.in_(set(exercise_ids)),
+        models.MesocycleDay.is_completed == True,
+    ]
+    if exclude_meso_day_id is not None:
+        filters.append(models.MesocycleDayExercise.meso_day_id != exclude_meso_day_id)
+
+    latest = (
+        select(
+            models.MesocycleDayExercise.id.label("mde_id"),
+            models.MesocycleDayExercise.exercise_id.label("exercise_id"),
+            func.row_number().over(
+                partition_by=models.MesocycleDayExercise.exercise_id,
+                order_by=models.MesocycleDayExercise.id.desc(),
+            ).label("rn"),
+        )
+        .join(models.MesocycleDay)
+        .where(*filters)
+        .subquery()
+    )
+    return (
+        select(latest.c.exercise_id, models.SetLog.set_number,
+               models.SetLog.weight, models.SetLog.reps)
+        .join(models.SetLog, models.SetLog.meso_day_exercise_id == latest.c.mde_id)
+        .where(latest.c.rn == 1, models.SetLog.weight > 0)
+        .order_by(latest.c.exercise_id, models.SetLog.set_number)
+    )
+
+
+def last_session_sets_stmt(exercise_ids: List[int], user_id: int):
+    """
+    Set logs of each exercise's latest completed occurrence, found through
+    exercise_performance.last_completed_mde_id instead of ranking history.
+    """
+    ep = models.ExercisePerformance
+    return (
+        select(ep.exercise_id, models.SetLog.set_number,
+               models.SetLog.weight, models.SetLog.reps)
+        .join(models.SetLog, models.SetLog.meso_day_exercise_id == ep.last_completed_mde_id)
+        .where(
+            ep.user_id == user_id,
+            ep.exercise_id.in_(set(exercise_ids)),
+            models.SetLog.weight > 0,
+        )
+        .order_by(ep.exercise_id, models.SetLog.set_number)
+    )
+
+
+def session_history_stmt(day: models.MesocycleDay, exercise_ids: List[int], user_id: int):
+    """
+    Previous-session sets for a day's exercises (shared with app.async_crud).
+
+    An open day can't hold any exercise's latest completed occurrence, so
+    exercise_performance answers directly. A completed day must skip its own
+    occurrences, which takes the ranked history query.
+    """
+    if day.is_completed:
+        return previous_session_sets_stmt(exercise_ids, user_id, exclude_meso_day_id=day.id)
+    return last_session_sets_stmt(exercise_ids, user_id)
+
+
+def previous_session_sets_from_rows(rows) -> Dict[int, list]:
+    history: Dict[int, list] = {}
+    for r in rows:
+        history.setdefault(r.exercise_id, []).append({
+            "set_number": r.set_number,
+            "weight": r.weight,
+            "reps": r.reps,
+        })
+    return history
+
+
+def get_previous_session_sets(db: Session, exercise_ids: List[int], user_id: int,
+                              exclude_meso_day_id: Optional[int] = None) -> Dict[int, list]:
+    """
+    Set logs from the most recent completed occurrence of each exercise.
+
+    One query for the whole day: completed occurrences are ranked per
+    exercise with a window function, and only the newest one is joined
+    to its set logs. Skipped sets (weight 0) are left out.
+
+    Args:
+        exercise_ids: Exercises to look up
+        user_id: Owner of the history
+        exclude_meso_day_id: Day whose own exercises must not count as history
+
+    Returns:
+        {exercise_id: [{"set_number", "weight", "reps"}, ...]} ordered by
+        set_number — exercises without usable history are absent.
+    """
+    if not exercise_ids:
+        return {}
+    stmt = previous_session_sets_stmt(exercise_ids, user_id, exclude_meso_day_id)
+    return previous_session_sets_from_rows(db.execute(stmt).all())
+
+
+# ═══════════════════════════════════════════════════════
+# EXERCISE PERFORMANCE (latest / best per user and exercise)
+# ═══════════════════════════════════════════════════════
+
+def estimated_1rm(weight: float, reps: int) -> float:
+    """Epley one-rep max estimate."""
+    return weight * (1 + reps / 30)
+
+
+def estimated_1rm_sql(weight, reps):
+    """estimated_1rm() as a SQL expression, in the same float arithmetic."""
+    return weight * (1 + cast(reps, Float) / 30)
+
+
+def set_log_performance_stmts(written) -> list:
+    """
+    Statements folding rows returned by upsert_set_logs_stmt() into
+    exercise_performance.
+
+    Newly inserted sets merge incrementally: a set replaces the stored
+    latest only if it is newer by (logged_at, id), and the best e1RM only
+    grows, so concurrent writers can't undo each other. An overwritten set
+    may have been the latest or the best, so its (user, exercise) pairs are
+    recomputed from set_logs instead.
+    """
+    ep = models.ExercisePerformance
+    overwritten = {(r["user_id"], r["exercise_id"]) for r in written if not r["inserted"]}
+
+    merged: Dict[tuple, dict] = {}
+    # In (logged_at, id) order, so the last set seen per pair is its latest
+    for r in sorted(written, key=lambda r: (r["logged_at"], r["id"])):
+        key = (r["user_id"], r["exercise_id"])
+        if key in overwritten or r["weight"] <= 0:
+            continue
+        e1rm = estimated_1rm(r["weight"], r["reps"])
+        prev = merged.get(key)
+        merged[key] = {
+            "user_id": key[0],
+            "exercise_id": key[1],
+            "last_weight": r["weight"],
+            "last_reps": r["reps"],
+            "last_logged_at": r["logged_at"],
+            "last_set_log_id": r["id"],
+            "best_e1rm": e1rm if prev is None else max(prev["best_e1rm"], e1rm),
+        }
+
+    stmts = []
+    if merged:
+        stmt = pg_insert(ep).values(sorted(merged.values(), key=lambda m: (m["user_id"], m["exercise_id"])))
+        newer = or_(
+            ep.last_logged_at.is_(None),
+            tuple_(stmt.excluded.last_logged_at, stmt.excluded.last_set_log_id)
+            > tuple_(ep.last_logged_at, ep.last_set_log_id),
+        )
+        latest = ("last_weight", "last_reps", "last_logged_at", "last_set_log_id")
+        stmts.append(stmt.on_conflict_do_update(
+            index_elements=[ep.user_id, ep.exercise_id],
+            set_={
+                **{c: case((newer, stmt.excluded[c]), else_=getattr(ep, c)) for c in latest},
+                "best_e1rm": func.greatest(ep.best_e1rm, stmt.excluded.best_e1rm),
+            },
+        ))
+    if overwritten:
+        pairs = values(column("user_id", Integer), column("exercise_id", Integer),
+                       name="pairs").data(sorted(overwritten))
+        stmts.append(refresh_exercise_performance_stmt(pairs))
+    return stmts
+
+
+def refresh_exercise_performance_stmt(pairs):
+    """
+    Recompute exercise_performance from set_logs and completed days for
+    ``pairs``, a FROM clause with user_id and exercise_id columns. Each part
+    is one short range scan on the per-user indexes.
+    """
+    ep, sl = models.ExercisePerformance, models.SetLog
+    mde, md = models.MesocycleDayExercise, models.MesocycleDay
+    p = pairs
+
+    def same_pair(t):
+        return t.user_id == p.c.user_id, t.exercise_id == p.c.exercise_id
+
+    last = (
+        select(sl.weight, sl.reps, sl.logged_at, sl.id)
+        .where(*same_pair(sl), sl.weight > 0)
+        .order_by(sl.logged_at.desc(), sl.id.desc())
+        .limit(1)
+        .lateral("last")
+    )
+    best = (
+        select(func.max(estimated_1rm_sql(sl.weight, sl.reps)).label("e1rm"))
+        .where(*same_pair(sl), sl.weight > 0)
+        .lateral("best")
+    )
+    done = (
+        select(mde.id)
+        .join(md, md.id == mde.meso_day_id)
+        .where(*same_pair(mde), md.is_completed == True)
+        .order_by(mde.id.desc())
+        .limit(1)
+        .lateral("done")
+    )
+    columns = ["user_id", "exercise_id", "last_weight", "last_reps", "last_logged_at",
+               "last_set_log_id", "best_e1rm", "last_completed_mde_id"]
+    stmt = pg_insert(ep).from_select(
+        columns,
+        select(p.c.user_id, p.c.exercise_id, last.c.weight, last.c.reps, last.c.logged_at,
+               last.c.id, best.c.e1rm, done.c.id)
+        .select_from(p)
+        .outerjoin(last, true())
+        .outerjoin(best, true())
+        .outerjoin(done, true()),
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[ep.user_id, ep.exercise_id],
+        set_={c: stmt.excluded[c] for c in columns[2:]},
+    )
+
+
+def completed_day_performance_stmt(meso_day_id: int):
+    """
+    Mark a completed day's exercises as their latest completed occurrence.
+    Occurrences are ordered by id, so this only ever moves forward.
+    """
+    ep, mde = models.ExercisePerformance, models.MesocycleDayExercise
+    stmt = pg_insert(ep).from_select(
+        ["user_id", "exercise_id", "last_completed_mde_id"],
+        select(mde.user_id, mde.exercise_id, func.max(mde.id))
+        .where(mde.meso_day_id == meso_day_id)
+        .group_by(mde.user_id, mde.exercise_id),
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[ep.user_id, ep.exercise_id],
+        set_={"last_completed_mde_id": func.greatest(ep.last_completed_mde_id,
+                                                     stmt.excluded.last_completed_mde_id)},
+    )
+
+
 # ═══════════════════════════════════════════════════════
 # AUTOFILL
 # ═══════════════════════════════════════════════════════
 
 def get_last_weight_for_exercise(db: Session, exercise_id: int, user_id: int):
-    row = (
-        db.query(models.SetLog)
-        .join(models.MesocycleDayExercise)
-        .join(models.MesocycleDay)
-        .join(models.MesocycleWeek)
-        .join(models.Mesocycle)
-        .filter(
-            models.Mesocycle.user_id == user_id,
-            models.MesocycleDayExercise.exercise_id == exercise_id,
-            models.SetLog.weight > 0,
+    return get_last_weights_for_exercises(db, [exercise_id], user_id).get(exercise_id)
+
+
+def get_last_weights_for_exercises(db: Session, exercise_ids: List[int], user_id: int) -> Dict[int, dict]:
+    """
+    Last non-zero logged weight/reps for each exercise, in a single query.
+
+    Primary-key lookups on exercise_performance, which set logging keeps
+    current (see set_log_performance_stmts()).
+
+    Returns:
+        {exercise_id: {"weight": float, "reps": int}} — exercises with no
+        logged weight are absent from the dict.
+    """
+    if not exercise_ids:
+        return {}
+
+    rows = db.execute(last_weights_stmt(exercise_ids, user_id)).all()
+    return {r.exercise_id: {"weight": r.weight, "reps": r.reps} for r in rows}
+
+
+def last_weights_stmt(exercise_ids: List[int], user_id: int):
+    """SELECT behind get_last_weights_for_exercises(), shared with app.async_crud."""
+    ep = models.ExercisePerformance
+    return (
+        select(ep.exercise_id, ep.last_weight.label("weight"), ep.last_reps.label("reps"))
+        .where(
+            ep.user_id == user_id,
+            ep.exercise_id.in_(set(exercise_ids)),
+            ep.last_weight.isnot(None),
         )
-        .order_by(models.SetLog.logged_at.desc())
-        .first()
     )
-    if row:
-        return {"weight": row.weight, "reps": row.reps}
-    return None
 
 
 # ═══════════════════════════════════════════════════════
 # FEEDBACK
 # ═══════════════════════════════════════════════════════
 
-def create_feedback(db: Session, meso_day_id: int, muscle_group: str,
+def create_feedback(db: Session, meso_day_id: int, user_id: int, muscle_group: str,
                     soreness: str, pump: str, volume_feeling: str,
                     notes: str | None = None):
-    existing = db.query(models.Feedback).filter(
-        models.Feedback.meso_day_id == meso_day_id,
-        models.Feedback.muscle_group == muscle_group,
-    ).first()
-    if existing:
-        existing.soreness = soreness
-        existing.pump = pump
-        existing.volume_feeling = volume_feeling
-        existing.notes = notes
-        db.commit()
-        db.refresh(existing)
-        return existing
-
-    fb = models.Feedback(
-        meso_day_id=meso_day_id,
-        muscle_group=muscle_group,
-        soreness=soreness,
-        pump=pump,
-        volume_feeling=volume_feeling,
-        notes=notes,
+    """
+    Create or update the day's feedback for a muscle group in one upsert.
+
+    The row is inserted from owned_day_id_stmt(), so a day that isn't the
+    user's writes nothing and returns None.
+    """
+    fb = models.Feedback
+    columns = fb.__table__.c
+    stmt = pg_insert(fb).from_select(
+        ["meso_day_id", "muscle_group", "soreness", "pump", "volume_feeling", "notes"],
+        owned_day_id_stmt(meso_day_id, user_id).add_columns(
+            literal(muscle_group, columns.muscle_group.type),
+            literal(soreness, columns.soreness.type),
+            literal(pump, columns.pump.type),
+            literal(volume_feeling, columns.volume_feeling.type),
+            literal(notes, columns.notes.type),
+        ),
     )
-    db.add(fb)
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_feedbacks_day_muscle_group",
+        set_={c: stmt.excluded[c] for c in ("soreness", "pump", "volume_feeling", "notes")},
+    ).returning(fb)
+    feedback = db.scalars(stmt).first()
+    if feedback is None:
+        db.rollback()
+        return None
     db.commit()
-    db.refresh(fb)
-    return fb
+    return feedback
 
 
 # ═══════════════════════════════════════════════════════
 # COMPLETE DAY & PER-DAY PROGRESSION (existing)
 # ═══════════════════════════════════════════════════════
 
-def complete_day(db: Session, meso_day_id: int):
-    day = db.query(models.MesocycleDay).filter(models.MesocycleDay.id == meso_day_id).first()
-    if day:
-        day.is_completed = True
-        db.commit()
-    return day
+def complete_day(db: Session, meso_day_id: int, user_id: int) -> Optional[int]:
+    """Mark the user's day completed; returns its id, or None if not theirs."""
+    md = models.MesocycleDay
+    day_id = db.scalar(
+        update(md)
+        .where(md.id.in_(owned_day_id_stmt(meso_day_id, user_id)))
+        .values(is_completed=True)
+        .returning(md.id)
+    )
+    if day_id is None:
+        db.rollback()
+        return None
+    db.execute(completed_day_performance_stmt(day_id))
+    db.commit()
+    return day_id
 
 
-def calculate_progression(db: Session, meso_day_id: int):
-    day = (
-        db.query(models.MesocycleDay)
-        .filter(models.MesocycleDay.id == meso_day_id)
-        .options(
-            joinedload(models.MesocycleDay.exercises)
-            .joinedload(models.MesocycleDayExercise.exercise),
+def calculate_progression(db: Session, meso_day_id: int, user_id: int):
+    day = db.execute(
+        owned_day_stmt(meso_day_id, user_id).options(
+            joinedload(models.MesocycleDay.exercises),
             joinedload(models.MesocycleDay.feedbacks),
         )
-        .first()
-    )
+    ).unique().scalars().first()
     if not day:
         return []
+    return day_progression(day, exercise_catalog.resolve(db, day_exercise_ids(day)))
 
+
+def day_progression(day: models.MesocycleDay, catalog: CatalogSnapshot) -> List[dict]:
+    """Per-exercise set recommendations from a day's loaded exercises and feedback."""
     fb_map: dict[str, models.Feedback] = {}
     for fb in day.feedbacks:
         fb_map[fb.muscle_group.lower()] = fb
 
     recommendations = []
     for mde in day.exercises:
-        target = mde.exercise.target.lower()
+        exercise = catalog[mde.exercise_id]
+        target = exercise.target.lower()
         fb = fb_map.get(target)
 
         current = mde.prescribed_sets
@@ -517,7 +977,7 @@ def calculate_progression(db: Session, meso_day_id: int):
 
         recommendations.append({
             "exercise_id": mde.exercise_id,
-            "exercise_name": mde.exercise.name,
+            "exercise_name": exercise.name,
             "current_sets": current,
             "recommended_sets": recommended,
             "reason": reason,
@@ -527,6 +987,14 @@ def calculate_progression(db: Session, meso_day_id: int):
 
 
 def apply_progression_to_next_week(db: Session, mesocycle_id: int, user_id: int):
+    """
+    Open the next week of a mesocycle whose current week is fully completed.
+
+    Set counts come from day_progression() over the days and feedback
+    already loaded here. The new days and their exercises are cloned in a
+    single INSERT ... SELECT, so the statement count doesn't grow with the
+    size of the week.
+    """
     meso = (
         db.query(models.Mesocycle)
         .filter(models.Mesocycle.id == mesocycle_id, models.Mesocycle.user_id == user_id)
@@ -550,8 +1018,7 @@ def apply_progression_to_next_week(db: Session, mesocycle_id: int, user_id: int)
         db.query(models.MesocycleDay)
         .filter(models.MesocycleDay.week_id == current_week.id)
         .options(
-            joinedload(models.MesocycleDay.exercises)
-            .joinedload(models.MesocycleDayExercise.exercise),
+            joinedload(models.MesocycleDay.exercises),
             joinedload(models.MesocycleDay.feedbacks),
         )
         .order_by(models.MesocycleDay.day_order)
@@ -561,32 +1028,22 @@ def apply_progression_to_next_week(db: Session, mesocycle_id: int, user_id: int)
     if not all(d.is_completed for d in days):
         return None
 
+    catalog = exercise_catalog.resolve(db, day_exercise_ids(*days))
+    prescribed_sets = {}
+    for old_day in days:
+        rec_map = {r["exercise_id"]: r["recommended_sets"] for r in day_progression(old_day, catalog)}
+        for old_mde in old_day.exercises:
+            prescribed_sets[old_mde.id] = rec_map.get(old_mde.exercise_id, old_mde.prescribed_sets)
+
     new_week_number = meso.current_week + 1
     new_week = models.MesocycleWeek(mesocycle_id=meso.id, week_number=new_week_number)
     db.add(new_week)
     db.flush()
 
-    for old_day in days:
-        recs = calculate_progression(db, old_day.id)
-        rec_map = {r["exercise_id"]: r["recommended_sets"] for r in recs}
-
-        new_day = models.MesocycleDay(
-            week_id=new_week.id,
-            plan_day_id=old_day.plan_day_id,
-            day_order=old_day.day_order,
-        )
-        db.add(new_day)
-        db.flush()
-
-        for old_mde in old_day.exercises:
-            new_sets = rec_map.get(old_mde.exercise_id, old_mde.prescribed_sets)
-            new_mde = models.MesocycleDayExercise(
-                meso_day_id=new_day.id,
-                exercise_id=old_mde.exercise_id,
-                exercise_order=old_mde.exercise_order,
-                prescribed_sets=new_sets,
-            )
-            db.add(new_mde)
+    if prescribed_sets:
+        db.execute(clone_week_stmt(current_week.id, new_week.id, prescribed_sets))
+    elif days:
+        db.execute(clone_week_days_stmt(current_week.id, new_week.id))
 
     meso.current_week = new_week_number
     db.commit()
@@ -594,6 +1051,49 @@ def apply_progression_to_next_week(db: Session, mesocycle_id: int, user_id: int)
     return meso
 
 
+def clone_week_days_stmt(old_week_id: int, new_week_id: int):
+    """INSERT ... SELECT copying a week's days, open, into another week."""
+    md = models.MesocycleDay
+    return (
+        pg_insert(md)
+        .from_select(
+            ["week_id", "plan_day_id", "day_order", "is_completed"],
+            select(literal(new_week_id), md.plan_day_id, md.day_order, false())
+            .where(md.week_id == old_week_id)
+            .order_by(md.day_order, md.id),
+        )
+        .returning(md.id, md.plan_day_id, md.day_order)
+    )
+
+
+def clone_week_stmt(old_week_id: int, new_week_id: int, prescribed_sets: Dict[int, int]):
+    """
+    Copy a week's days and exercises into another week in one statement.
+
+    The day insert runs as a CTE whose RETURNING rows are matched back to
+    the old days by (plan_day_id, day_order); prescribed_sets maps each old
+    MesocycleDayExercise id to the new week's set count.
+    """
+    mde, md = models.MesocycleDayExercise, models.MesocycleDay
+    new_days = clone_week_days_stmt(old_week_id, new_week_id).cte("new_days")
+    sets = values(column("mde_id", Integer), column("sets", Integer),
+                  name="sets").data(sorted(prescribed_sets.items()))
+    return (
+        pg_insert(mde)
+        .from_select(
+            ["meso_day_id", "exercise_id", "user_id", "exercise_order", "prescribed_sets"],
+            select(new_days.c.id, mde.exercise_id, mde.user_id, mde.exercise_order, sets.c.sets)
+            .select_from(sets)
+            .join(mde, mde.id == sets.c.mde_id)
+            .join(md, md.id == mde.meso_day_id)
+            .join(new_days, (new_days.c.plan_day_id == md.plan_day_id)
+                  & (new_days.c.day_order == md.day_order))
+            .order_by(md.day_order, mde.exercise_order, mde.id),
+        )
+        .add_cte(new_days)
+    )
+
+
 # ═══════════════════════════════════════════════════════
 # FEEDBACK-DRIVEN PROGRESSION (Week-Level Intelligence)
 # ═══════════════════════════════════════════════════════
@@ -606,87 +1106,24 @@ def calculate_feedback_driven_progression(db: Session, mesocycle_id: int, user_i
 
     This is the WEEK-LEVEL algorithm (vs calculate_progression which is per-day).
     Uses a multi-signal decision matrix: soreness × pump × volume_feeling.
+    The per-group averages and set totals come from one grouped query
+    (feedback_summary_stmt()), so only the matrix runs in Python.
     """
-    meso = db.query(models.Mesocycle).filter(
-        models.Mesocycle.id == mesocycle_id,
-        models.Mesocycle.user_id == user_id,
-    ).first()
-
-    if not meso:
-        return []
-
-    # ── Find the current week with all data loaded ────
-    current_week = (
-        db.query(models.MesocycleWeek)
-        .filter(
-            models.MesocycleWeek.mesocycle_id == meso.id,
-            models.MesocycleWeek.week_number == meso.current_week,
-        )
-        .options(
-            joinedload(models.MesocycleWeek.days)
-            .joinedload(models.MesocycleDay.feedbacks),
-            joinedload(models.MesocycleWeek.days)
-            .joinedload(models.MesocycleDay.exercises)
-            .joinedload(models.MesocycleDayExercise.exercise),
-        )
-        .first()
-    )
-
-    if not current_week:
-        return []
+    return feedback_decisions(db.execute(feedback_summary_stmt(mesocycle_id, user_id)).all())
 
-    # ── Aggregate feedback per muscle group across ALL days ──
-    muscle_feedbacks: dict[str, list] = {}
-    muscle_current_sets: dict[str, int] = {}
-    muscle_exercise_count: dict[str, int] = {}
-
-    for day in current_week.days:
-        for fb in day.feedbacks:
-            group = fb.muscle_group
-            if group not in muscle_feedbacks:
-                muscle_feedbacks[group] = []
-            muscle_feedbacks[group].append(fb)
-
-        for mde in day.exercises:
-            group = mde.exercise.body_part
-            if group not in muscle_current_sets:
-                muscle_current_sets[group] = 0
-                muscle_exercise_count[group] = 0
-            muscle_current_sets[group] += mde.prescribed_sets
-            muscle_exercise_count[group] += 1
-
-    if not muscle_feedbacks:
-        return []
 
-    # ── Scoring maps ─────────────────────────────────
-    soreness_scores = {"none": 0, "light": 1, "moderate": 2, "severe": 3}
-    pump_scores = {"none": 0, "light": 1, "moderate": 2, "great": 3}
-    volume_scores = {"too_little": -1, "just_right": 0, "too_much": 1}
-
-    def _enum_val(field):
-        """Safely extract string value from enum or string."""
-        return field.value if hasattr(field, 'value') else str(field)
-
-    # ── Apply decision matrix per muscle group ────────
+def feedback_decisions(rows) -> list:
+    """
+    The decision matrix over feedback_summary_stmt() rows, in row order:
+    one set-volume recommendation per muscle group. Pure; no database.
+    """
     decisions = []
 
-    for muscle_group, feedbacks in muscle_feedbacks.items():
-        n = len(feedbacks)
-
-        avg_soreness = sum(
-            soreness_scores.get(_enum_val(fb.soreness), 0) for fb in feedbacks
-        ) / n
-
-        avg_pump = sum(
-            pump_scores.get(_enum_val(fb.pump), 0) for fb in feedbacks
-        ) / n
-
-        avg_volume = sum(
-            volume_scores.get(_enum_val(fb.volume_feeling), 0) for fb in feedbacks
-        ) / n
-
-        current_sets = muscle_current_sets.get(muscle_group, 0)
-        min_sets = muscle_exercise_count.get(muscle_group, 1)
+    for row in rows:
+        muscle_group = row.muscle_group
+        avg_soreness, avg_pump, avg_volume = row.avg_soreness, row.avg_pump, row.avg_volume
+        current_sets = row.current_sets
+        min_sets = row.exercise_count
 
         # ── Multi-signal decision matrix ──────────────
         delta = 0
@@ -781,62 +1218,159 @@ def calculate_feedback_driven_progression(db: Session, mesocycle_id: int, user_i
     return decisions
 
 
-def apply_feedback_progression(db: Session, mesocycle_id: int, user_id: int, decisions: list):
+# ── Scoring maps ─────────────────────────────────────
+SORENESS_SCORES = {
+    models.SorenessLevel.none: 0, models.SorenessLevel.light: 1,
+    models.SorenessLevel.moderate: 2, models.SorenessLevel.severe: 3,
+}
+PUMP_SCORES = {
+    models.PumpLevel.none: 0, models.PumpLevel.light: 1,
+    models.PumpLevel.moderate: 2, models.PumpLevel.great: 3,
+}
+VOLUME_SCORES = {
+    models.VolumeFeeling.too_little: -1, models.VolumeFeeling.just_right: 0,
+    models.VolumeFeeling.too_much: 1,
+}
+
+
+def feedback_summary_stmt(mesocycle_id: int, user_id: int):
     """
-    Apply feedback-driven progression decisions to the NEXT week's exercises.
-    Distributes set changes evenly across exercises targeting each muscle group.
-    Returns number of adjustments made, or None if next week doesn't exist.
+    One row per muscle group with feedback in the mesocycle's current week:
+    average soreness / pump / volume scores (enums mapped with CASE), plus
+    the week's prescribed sets and exercise count for that group
+    (Exercise.body_part). Rows come in order of first feedback by
+    (day_order, feedback id); empty if the mesocycle isn't the user's.
     """
-    meso = db.query(models.Mesocycle).filter(
-        models.Mesocycle.id == mesocycle_id,
-        models.Mesocycle.user_id == user_id,
-    ).first()
-
-    if not meso:
-        return None
+    fb, md, mde = models.Feedback, models.MesocycleDay, models.MesocycleDayExercise
+    week = (
+        select(models.MesocycleWeek.id)
+        .join(models.Mesocycle, models.Mesocycle.id == models.MesocycleWeek.mesocycle_id)
+        .where(
+            models.Mesocycle.id == mesocycle_id,
+            models.Mesocycle.user_id == user_id,
+            models.MesocycleWeek.week_number == models.Mesocycle.current_week,
+        )
+        .scalar_subquery()
+    )
 
-    next_week_num = meso.current_week + 1
+    def score(col, scores):
+        return func.avg(cast(case(scores, value=col, else_=0), Float))
 
-    next_week = (
-        db.query(models.MesocycleWeek)
-        .filter(
-            models.MesocycleWeek.mesocycle_id == meso.id,
-            models.MesocycleWeek.week_number == next_week_num,
+    feedback = (
+        select(
+            fb.muscle_group,
+            score(fb.soreness, SORENESS_SCORES).label("avg_soreness"),
+            score(fb.pump, PUMP_SCORES).label("avg_pump"),
+            score(fb.volume_feeling, VOLUME_SCORES).label("avg_volume"),
+            func.min(pg_array([md.day_order, md.id, fb.id])).label("first_seen"),
         )
-        .options(
-            joinedload(models.MesocycleWeek.days)
-            .joinedload(models.MesocycleDay.exercises)
-            .joinedload(models.MesocycleDayExercise.exercise),
+        .join(md, md.id == fb.meso_day_id)
+        .where(md.week_id == week)
+        .group_by(fb.muscle_group)
+        .subquery("feedback")
+    )
+    volume = (
+        select(
+            models.Exercise.body_part,
+            func.sum(mde.prescribed_sets).label("current_sets"),
+            func.count().label("exercise_count"),
         )
-        .first()
+        .join(md, md.id == mde.meso_day_id)
+        .join(models.Exercise, models.Exercise.id == mde.exercise_id)
+        .where(md.week_id == week)
+        .group_by(models.Exercise.body_part)
+        .subquery("volume")
+    )
+    return (
+        select(
+            feedback.c.muscle_group,
+            feedback.c.avg_soreness,
+            feedback.c.avg_pump,
+            feedback.c.avg_volume,
+            func.coalesce(volume.c.current_sets, 0).label("current_sets"),
+            func.coalesce(volume.c.exercise_count, 1).label("exercise_count"),
+        )
+        .outerjoin(volume, volume.c.body_part == feedback.c.muscle_group)
+        .order_by(feedback.c.first_seen)
     )
 
-    if not next_week:
-        return None
 
-    # Build a map: muscle_group → delta
-    delta_map = {}
-    for d in decisions:
-        delta_map[d["muscle_group"]] = d["delta"]
+def apply_feedback_progression(db: Session, mesocycle_id: int, user_id: int, decisions: list):
+    """
+    Apply feedback-driven progression decisions to the NEXT week's exercises.
+    Distributes set changes evenly across exercises targeting each muscle group.
+    Returns number of adjustments made, or None if next week doesn't exist.
+
+    The whole week is adjusted by one UPDATE (see set_delta_update_stmt());
+    the existence check only runs when nothing was adjusted.
+    """
+    deltas = set_deltas(mesocycle_id, decisions)
 
     adjustments = 0
-    for day in next_week.days:
-        for mde in day.exercises:
-            group = mde.exercise.body_part
-            delta = delta_map.get(group, 0)
-            if delta != 0:
-                # Distribute delta across exercises for this muscle group
-                # For simplicity, apply delta to each exercise (clamped)
-                new_sets = max(MIN_SETS_PER_EXERCISE, min(MAX_SETS_PER_EXERCISE,
-                               mde.prescribed_sets + delta))
-                if new_sets != mde.prescribed_sets:
-                    mde.prescribed_sets = new_sets
-                    adjustments += 1
+    if deltas:
+        adjustments = len(db.execute(set_delta_update_stmt(deltas, user_id)).all())
+    if not adjustments and db.scalar(next_week_stmt(mesocycle_id, user_id)) is None:
+        db.rollback()
+        return None
 
     db.commit()
     return adjustments
 
 
+def set_deltas(mesocycle_id: int, decisions: list) -> List[tuple]:
+    """
+    (mesocycle_id, muscle_group, delta) rows for set_delta_update_stmt().
+    Later decisions for the same group win, as before; zero deltas are dropped.
+    """
+    delta_map = {d["muscle_group"]: d["delta"] for d in decisions}
+    return [(mesocycle_id, group, delta) for group, delta in delta_map.items() if delta != 0]
+
+
+def next_week_stmt(mesocycle_id: int, user_id: int):
+    """Id of the week after the user's mesocycle's current one, if it exists."""
+    mw, m = models.MesocycleWeek, models.Mesocycle
+    return (
+        select(mw.id)
+        .join(m, m.id == mw.mesocycle_id)
+        .where(m.id == mesocycle_id, m.user_id == user_id,
+               mw.week_number == m.current_week + 1)
+    )
+
+
+def set_delta_update_stmt(deltas: List[tuple], user_id: int):
+    """
+    One UPDATE ... FROM (VALUES ...) adding per-muscle-group set deltas to
+    the next week of one or more of the user's mesocycles.
+
+    deltas: (mesocycle_id, muscle_group, delta) tuples; muscle groups match
+    Exercise.body_part. Set counts are clamped to MIN/MAX_SETS_PER_EXERCISE
+    in SQL, and only rows whose count actually changes are updated, so the
+    RETURNING rows (mesocycle_id, meso_day_exercise id) are the adjustments.
+    """
+    mde, md, mw, m = (models.MesocycleDayExercise, models.MesocycleDay,
+                      models.MesocycleWeek, models.Mesocycle)
+    v = values(column("mesocycle_id", Integer), column("muscle_group", String),
+               column("delta", Integer), name="deltas").data(deltas)
+    new_sets = func.greatest(MIN_SETS_PER_EXERCISE,
+                             func.least(MAX_SETS_PER_EXERCISE, mde.prescribed_sets + v.c.delta))
+    return (
+        update(mde)
+        .where(
+            md.id == mde.meso_day_id,
+            mw.id == md.week_id,
+            m.id == mw.mesocycle_id,
+            models.Exercise.id == mde.exercise_id,
+            m.id == v.c.mesocycle_id,
+            m.user_id == user_id,
+            mw.week_number == m.current_week + 1,
+            models.Exercise.body_part == v.c.muscle_group,
+            new_sets != mde.prescribed_sets,
+        )
+        .values(prescribed_sets=new_sets)
+        .returning(m.id.label("mesocycle_id"), mde.id)
+    )
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # PROGRESSION ENGINE — HELPER FUNCTIONS
 # ═══════════════════════════════════════════════════════════════════════════
@@ -850,15 +1384,10 @@ def classify_recovery_state(avg_soreness: float) -> str:
         'under_recovered'   — soreness >= 1.5 → maintain, no progression
         'mostly_recovered'  — soreness >= 0.5 → normal progression
         'fully_recovered'   — soreness < 0.5  → aggressive progression OK
+
+    Single-value form of progression_engine.classify_recovery_states().
     """
-    if avg_soreness >= SORENESS_OVERTRAINED_THRESHOLD:
-        return "overtrained"
-    elif avg_soreness >= SORENESS_UNDER_RECOVERED_THRESHOLD:
-        return "under_recovered"
-    elif avg_soreness >= SORENESS_FULLY_RECOVERED_THRESHOLD:
-        return "mostly_recovered"
-    else:
-        return "fully_recovered"
+    return engine.RECOVERY_STATES[engine.recovery_code(avg_soreness)]
 
 
 def classify_stimulus_quality(avg_pump: float, avg_volume_feeling: float) -> str:
@@ -870,148 +1399,41 @@ def classify_stimulus_quality(avg_pump: float, avg_volume_feeling: float) -> str
         avg_volume_feeling: -1 to +1 scale (too_little=-1, just_right=0, too_much=+1)
 
     Returns one of: 'insufficient', 'optimal', 'excessive'
-    """
-    # Normalize pump to 0-1 range
-    pump_normalized = avg_pump / 3.0
 
-    # Normalize volume feeling to 0-1 range
-    volume_normalized = (avg_volume_feeling + 1) / 2.0
-
-    # Combined stimulus score: pump dominates, volume feeling modulates
-    # Range: 0 (no stimulus at all) → ~1.5 (maximum stimulus)
-    stimulus_score = pump_normalized + (volume_normalized * 0.5)
-
-    if stimulus_score < 0.5:
-        return "insufficient"
-    elif stimulus_score <= 1.0:
-        return "optimal"
-    else:
-        return "excessive"
-
-
-def is_dumbbell_exercise(exercise_name: str, equipment: str | None = None) -> bool:
+    Single-value form of progression_engine.classify_stimulus_qualities().
     """
-    Determine if an exercise uses dumbbells.
-
-    Checks the equipment field first (from Exercise model), then falls back
-    to heuristic name matching.
-
-    Args:
-        exercise_name: The exercise name string
-        equipment: The equipment field from the Exercise model (if available)
-
-    Returns:
-        True if the exercise uses dumbbells
-    """
-    # Check equipment field first (most reliable)
-    if equipment:
-        eq_lower = equipment.lower()
-        if "dumbbell" in eq_lower or "db" in eq_lower:
-            return True
-        # If equipment explicitly says barbell/machine/cable, it's not dumbbell
-        if any(kw in eq_lower for kw in ["barbell", "machine", "cable", "smith",
-                                          "body weight", "bodyweight", "band"]):
-            return False
-
-    # Fall back to name heuristic
-    dumbbell_keywords = [
-        'dumbbell', 'db ', 'db_', 'd.b.',
-        'lateral raise', 'fly', 'flye',
-        'concentration curl', 'hammer curl', 'kickback',
-    ]
-    name_lower = exercise_name.lower()
-    return any(kw in name_lower for kw in dumbbell_keywords)
+    return engine.STIMULUS_QUALITIES[engine.stimulus_code(avg_pump, avg_volume_feeling)]
 
 
 def get_next_available_weight(
     current_weight: float,
     is_dumbbell: bool,
-    target_increment_pct: float = WEEKLY_WEIGHT_INCREMENT_PCT
+    target_increment_pct: float = WEEKLY_WEIGHT_INCREMENT_PCT,
+    equipment_class: int | None = None
 ) -> tuple:
     """
     Calculate the next available weight, respecting equipment constraints.
 
     For dumbbells: snaps to the next available standard weight.
-    For barbells/machines: rounds to the nearest 2.5kg increment.
+    For barbells/machines/cables: snaps to the nearest achievable load.
+    Anything else: rounds to the nearest 2.5kg increment.
 
     Args:
         current_weight: Current working weight in kg
         is_dumbbell: Whether this exercise uses dumbbells
         target_increment_pct: Target percentage increase (default 2.5%)
+        equipment_class: app.equipment class code; overrides is_dumbbell
 
     Returns:
         (next_weight: float, can_achieve: bool, reason: str)
         - next_weight: the weight to prescribe
         - can_achieve: True if this weight increase is reasonable
         - reason: human-readable explanation
-    """
-    if current_weight <= 0:
-        return (current_weight, False, "No prior weight data")
-
-    target_increment = current_weight * target_increment_pct
-    target_weight = current_weight + target_increment
-
-    if is_dumbbell:
-        # Find the smallest dumbbell weight >= target_weight
-        available_weights = [w for w in DUMBBELL_WEIGHTS_KG if w >= target_weight]
-
-        if not available_weights:
-            return (current_weight, False, "At maximum dumbbell weight")
-
-        next_weight = available_weights[0]
-        actual_increment = next_weight - current_weight
-
-        # Safety: if the jump is 0 (already at a dumbbell weight above target)
-        if actual_increment <= 0:
-            # Current weight is already above target, find strictly next
-            strictly_above = [w for w in DUMBBELL_WEIGHTS_KG if w > current_weight]
-            if strictly_above:
-                next_weight = strictly_above[0]
-                actual_increment = next_weight - current_weight
-            else:
-                return (current_weight, False, "At maximum dumbbell weight")
-
-        actual_increment_pct = actual_increment / current_weight
-
-        # If the jump exceeds 2.5× the target percentage, it's too aggressive
-        max_acceptable_pct = target_increment_pct * 2.5
-        if actual_increment_pct > max_acceptable_pct:
-            return (
-                current_weight,
-                False,
-                f"Next dumbbell ({next_weight}kg) requires {actual_increment_pct:.1%} "
-                f"increase, exceeds safe threshold of {max_acceptable_pct:.1%}"
-            )
-
-        return (
-            next_weight,
-            True,
-            f"Progressing to {next_weight}kg dumbbell "
-            f"({actual_increment_pct:.1%} increase)"
-        )
-
-    else:
-        # Barbell / machine: round to nearest 2.5kg increment
-        increments_needed = round(target_increment / MIN_BARBELL_INCREMENT_KG)
-        increments_needed = max(1, increments_needed)
-        next_weight = current_weight + (increments_needed * MIN_BARBELL_INCREMENT_KG)
-
-        actual_increment_pct = (next_weight - current_weight) / current_weight
-
-        max_acceptable_pct = target_increment_pct * 2.5
-        if actual_increment_pct > max_acceptable_pct:
-            return (
-                current_weight,
-                False,
-                f"Weight jump of {actual_increment_pct:.1%} exceeds "
-                f"safe threshold of {max_acceptable_pct:.1%}"
-            )
 
-        return (
-            round(next_weight, 1),
-            True,
-            f"Progressing to {next_weight}kg ({actual_increment_pct:.1%} increase)"
-        )
+    Single-value form of progression_engine.next_available_weights().
+    """
+    equipment = is_dumbbell if equipment_class is None else equipment_class
+    return engine.next_weight_step(current_weight, equipment, target_increment_pct)
 
 
 def calculate_set_target(
@@ -1021,7 +1443,8 @@ def calculate_set_target(
     recovery_state: str,
     stimulus_quality: str,
     rep_floor: int = DEFAULT_REP_FLOOR,
-    rep_ceiling: int = DEFAULT_REP_CEILING
+    rep_ceiling: int = DEFAULT_REP_CEILING,
+    equipment_class: int | None = None
 ) -> dict:
     """
     Calculate the target weight and reps for a SINGLE set using double progression.
@@ -1041,6 +1464,7 @@ def calculate_set_target(
         stimulus_quality: One of 'insufficient', 'optimal', 'excessive'
         rep_floor: Lower bound of target rep range (default 8)
         rep_ceiling: Upper bound of target rep range (default 12)
+        equipment_class: app.equipment class code; overrides is_dumbbell
 
     Returns:
         {
@@ -1050,125 +1474,14 @@ def calculate_set_target(
                                  #         increase_reps, force_weight_increase, initialize
             "reason": str        # human-readable explanation
         }
-    """
-    # ── Handle missing data ──
-    if last_weight <= 0 or last_reps <= 0:
-        return {
-            "target_weight": last_weight,
-            "target_reps": rep_floor,
-            "action": "initialize",
-            "reason": "No prior data — using defaults"
-        }
-
-    # ═══════════════════════════════════════════════════
-    # Priority 1: Handle poor recovery → SAFETY FIRST
-    # ═══════════════════════════════════════════════════
-    if recovery_state == "overtrained":
-        deload_weight = round(last_weight * (1 - DELOAD_WEIGHT_REDUCTION), 1)
-
-        # Snap to valid equipment weight
-        if is_dumbbell:
-            valid_below = [w for w in DUMBBELL_WEIGHTS_KG if w <= deload_weight]
-            if valid_below:
-                deload_weight = valid_below[-1]  # Largest dumbbell <= deload target
-        else:
-            # Round down to nearest 2.5kg
-            deload_weight = (deload_weight // MIN_BARBELL_INCREMENT_KG) * MIN_BARBELL_INCREMENT_KG
-            deload_weight = round(deload_weight, 1)
-
-        return {
-            "target_weight": deload_weight,
-            "target_reps": rep_floor,
-            "action": "deload",
-            "reason": (
-                f"Overtrained — deloading weight by {DELOAD_WEIGHT_REDUCTION:.0%} "
-                f"({last_weight}→{deload_weight}kg) and resetting reps to {rep_floor}"
-            )
-        }
-
-    if recovery_state == "under_recovered":
-        return {
-            "target_weight": last_weight,
-            "target_reps": last_reps,
-            "action": "maintain",
-            "reason": (
-                "Under-recovered — maintaining current prescription "
-                f"({last_weight}kg × {last_reps}) to allow adaptation"
-            )
-        }
-
-    # ═══════════════════════════════════════════════════
-    # Priority 2: Try weight increase (~2.5% weekly)
-    # ═══════════════════════════════════════════════════
-    next_weight, can_achieve, weight_reason = get_next_available_weight(
-        last_weight, is_dumbbell
-    )
-
-    if can_achieve:
-        # Weight increase is achievable — apply it
-        # When weight goes up, allow reps to drop by 1 to accommodate
-        new_reps = last_reps
-        if last_reps > rep_floor + 1:
-            new_reps = max(rep_floor, last_reps - 1)
-
-        return {
-            "target_weight": next_weight,
-            "target_reps": new_reps,
-            "action": "increase_weight",
-            "reason": (
-                f"{weight_reason}. "
-                f"Reps adjusted to {new_reps} to accommodate heavier load."
-            )
-        }
-
-    # ═══════════════════════════════════════════════════
-    # Priority 3: Can't increase weight → try adding reps
-    # ═══════════════════════════════════════════════════
-    if last_reps < rep_ceiling:
-        new_reps = last_reps + 1
-        return {
-            "target_weight": last_weight,
-            "target_reps": new_reps,
-            "action": "increase_reps",
-            "reason": (
-                f"Weight increment not achievable ({weight_reason}). "
-                f"Adding 1 rep ({last_reps}→{new_reps}) at {last_weight}kg instead."
-            )
-        }
-
-    # ═══════════════════════════════════════════════════
-    # Priority 4: Reps at ceiling → FORCE weight jump
-    # ═══════════════════════════════════════════════════
-    if last_reps >= rep_ceiling:
-        if is_dumbbell:
-            available_weights = [w for w in DUMBBELL_WEIGHTS_KG if w > last_weight]
-            if available_weights:
-                forced_weight = available_weights[0]
-            else:
-                forced_weight = last_weight + MIN_DUMBBELL_INCREMENT_KG
-        else:
-            forced_weight = last_weight + MIN_BARBELL_INCREMENT_KG
-
-        return {
-            "target_weight": round(forced_weight, 1),
-            "target_reps": rep_floor,
-            "action": "force_weight_increase",
-            "reason": (
-                f"Reps hit ceiling ({rep_ceiling}). Forcing weight increase to "
-                f"{forced_weight}kg and resetting reps to {rep_floor}. "
-                f"This is the double progression reset point."
-            )
-        }
 
-    # ═══════════════════════════════════════════════════
-    # Fallback: maintain (should rarely reach here)
-    # ═══════════════════════════════════════════════════
-    return {
-        "target_weight": last_weight,
-        "target_reps": last_reps,
-        "action": "maintain",
-        "reason": "No progression criteria met — maintaining current prescription"
-    }
+    Single-set form of progression_engine.compute_set_targets(); use that
+    directly when computing many sets at once.
+    """
+    recovery_code = engine.RECOVERY_CODES.get(recovery_state, engine.MOSTLY_RECOVERED)
+    equipment = is_dumbbell if equipment_class is None else equipment_class
+    return engine.set_target(last_weight, last_reps, equipment, recovery_code,
+                             rep_floor=rep_floor, rep_ceiling=rep_ceiling)
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -1178,7 +1491,9 @@ def calculate_set_target(
 def calculate_smart_progression(
     db: Session,
     meso_day_id: int,
-    soreness_overrides: dict | None = None
+    soreness_overrides: dict | None = None,
+    day: Optional[models.MesocycleDay] = None,
+    user_id: Optional[int] = None,
 ) -> list:
     """
     Calculate smart progression targets for ALL exercises in a workout day.
@@ -1186,7 +1501,7 @@ def calculate_smart_progression(
     This is the main entry point called by the API. It combines:
     1. Historical performance data (last completed sets)
     2. Biofeedback signals (soreness, pump, volume perception)
-    3. Equipment-aware weight rounding (dumbbell vs barbell)
+    3. Equipment-aware weight rounding (per-equipment weight ladders)
     4. Double progression logic (weight → reps → force weight at ceiling)
 
     Args:
@@ -1194,6 +1509,11 @@ def calculate_smart_progression(
         meso_day_id: The MesocycleDay ID to generate targets for
         soreness_overrides: Optional dict of {"muscle_group": "soreness_level"}
                            to override stored feedback (for pre-workout input)
+        day: The MesocycleDay if the caller already loaded it (with exercises,
+             feedbacks and week.mesocycle); skips reloading it. Exercise
+             details come from the catalog snapshot, not mde.exercise.
+        user_id: Only load the day if it belongs to this user (ownership
+                 is checked by the loading query itself)
 
     Returns:
         List of per-exercise target dictionaries:
@@ -1205,6 +1525,7 @@ def calculate_smart_progression(
                 "muscle_group": str,
                 "equipment": str,
                 "is_dumbbell": bool,
+                "equipment_class": str,   # dumbbell | barbell | machine | cable | other
                 "prescribed_sets": int,
                 "recovery_state": str,
                 "stimulus_quality": str,
@@ -1224,27 +1545,87 @@ def calculate_smart_progression(
         ]
     """
     # ── Load the workout day with all related data ──
-    day = (
-        db.query(models.MesocycleDay)
-        .filter(models.MesocycleDay.id == meso_day_id)
+    if day is None:
+        day = db.execute(
+            smart_progression_day_stmt(meso_day_id, user_id)
+        ).unique().scalars().first()
+
+    if not day:
+        return []
+
+    # Get user_id through the relationship chain
+    user_id = day.week.mesocycle.user_id if day.week and day.week.mesocycle else None
+
+    # Feedback from completed sibling days in the same week, in one query
+    sibling_feedbacks = db.scalars(sibling_feedbacks_stmt(day)).all() if day.week else []
+
+    # ── Batch-load previous session data for every exercise on the day ──
+    exercise_ids = [mde.exercise_id for mde in day.exercises]
+    catalog = exercise_catalog.resolve(db, exercise_ids)
+    history_map: Dict[int, list] = {}
+    autofill_map: Dict[int, dict] = {}
+    if user_id and exercise_ids:
+        history_map = previous_session_sets_from_rows(
+            db.execute(session_history_stmt(day, exercise_ids, user_id)).all()
+        )
+        # Autofill is only consulted for exercises with no session history
+        missing = [eid for eid in exercise_ids if eid not in history_map]
+        if missing:
+            autofill_map = get_last_weights_for_exercises(db, missing, user_id)
+
+    return build_smart_progression(day, catalog, user_id, sibling_feedbacks,
+                                   history_map, autofill_map, soreness_overrides)
+
+
+def smart_progression_day_stmt(meso_day_id: int, user_id: Optional[int] = None):
+    """
+    The day with exercises, feedbacks and week.mesocycle eager-loaded;
+    scoped to the user's days when user_id is given (see owned_day_stmt()).
+    """
+    if user_id is not None:
+        return owned_day_stmt(meso_day_id, user_id).options(
+            joinedload(models.MesocycleDay.exercises),
+            joinedload(models.MesocycleDay.feedbacks),
+        )
+    return (
+        select(models.MesocycleDay)
+        .where(models.MesocycleDay.id == meso_day_id)
         .options(
-            joinedload(models.MesocycleDay.exercises)
-            .joinedload(models.MesocycleDayExercise.exercise),
-            joinedload(models.MesocycleDay.exercises)
-            .joinedload(models.MesocycleDayExercise.set_logs),
+            joinedload(models.MesocycleDay.exercises),
             joinedload(models.MesocycleDay.feedbacks),
             joinedload(models.MesocycleDay.week)
             .joinedload(models.MesocycleWeek.mesocycle),
         )
-        .first()
     )
 
-    if not day:
-        return []
 
-    # Get user_id through the relationship chain
-    user_id = day.week.mesocycle.user_id if day.week and day.week.mesocycle else None
+def sibling_feedbacks_stmt(day: models.MesocycleDay):
+    """Feedback from the other completed days of the day's week."""
+    return (
+        select(models.Feedback)
+        .join(models.MesocycleDay)
+        .where(
+            models.MesocycleDay.week_id == day.week_id,
+            models.MesocycleDay.id != day.id,
+            models.MesocycleDay.is_completed == True,
+        )
+    )
 
+
+def build_smart_progression(
+    day: models.MesocycleDay,
+    catalog: CatalogSnapshot,
+    user_id: Optional[int],
+    sibling_feedbacks: list,
+    history_map: Dict[int, list],
+    autofill_map: Dict[int, dict],
+    soreness_overrides: dict | None = None
+) -> list:
+    """
+    The compute half of calculate_smart_progression(): builds the targets
+    from already-loaded inputs without touching the database, so the sync
+    and async loaders share it. ``catalog`` must cover the day's exercises.
+    """
     # ── Build feedback map for this day's muscle groups ──
     # Scoring maps
     soreness_scores = {"none": 0, "light": 1, "moderate": 2, "severe": 3}
@@ -1280,44 +1661,24 @@ def calculate_smart_progression(
 
     # Also check feedback from PREVIOUS days in the same week
     # (important for recovery assessment)
-    if day.week:
-        for sibling_day in day.week.days:
-            if sibling_day.id == day.id:
-                continue  # Skip current day
-            if not sibling_day.is_completed:
-                continue  # Only use completed days
-
-            # Lazy-load feedbacks for sibling days
-            sibling_feedbacks = (
-                db.query(models.Feedback)
-                .filter(models.Feedback.meso_day_id == sibling_day.id)
-                .all()
-            )
-            for fb in sibling_feedbacks:
-                group = fb.muscle_group.lower()
-                soreness_val = soreness_scores.get(_enum_val(fb.soreness), 1)
-                pump_val = pump_scores.get(_enum_val(fb.pump), 1.5)
-                volume_val = volume_scores.get(_enum_val(fb.volume_feeling), 0)
-
-                if group not in muscle_fb:
-                    muscle_fb[group] = {"soreness": [], "pump": [], "volume": []}
-                muscle_fb[group]["soreness"].append(soreness_val)
-                muscle_fb[group]["pump"].append(pump_val)
-                muscle_fb[group]["volume"].append(volume_val)
-
-    # ── Process each exercise ──
-    results = []
+    for fb in sibling_feedbacks:
+        group = fb.muscle_group.lower()
+        soreness_val = soreness_scores.get(_enum_val(fb.soreness), 1)
+        pump_val = pump_scores.get(_enum_val(fb.pump), 1.5)
+        volume_val = volume_scores.get(_enum_val(fb.volume_feeling), 0)
 
-    for mde in sorted(day.exercises, key=lambda e: e.exercise_order):
-        exercise = mde.exercise
-        exercise_name = exercise.name if exercise else "Unknown"
-        muscle_group = (exercise.target or exercise.body_part or "unknown").lower()
-        equipment = exercise.equipment if exercise else None
+        if group not in muscle_fb:
+            muscle_fb[group] = {"soreness": [], "pump": [], "volume": []}
+        muscle_fb[group]["soreness"].append(soreness_val)
+        muscle_fb[group]["pump"].append(pump_val)
+        muscle_fb[group]["volume"].append(volume_val)
 
-        # Determine equipment type
-        is_db = is_dumbbell_exercise(exercise_name, equipment)
+    exercises = sorted(day.exercises, key=lambda e: e.exercise_order)
 
-        # ── Get recovery & stimulus classification for this muscle group ──
+    # ── Recovery & stimulus classification, one batch for the day's muscle groups ──
+    muscle_groups = list(dict.fromkeys(catalog[mde.exercise_id].muscle_group for mde in exercises))
+    averages = {}
+    for muscle_group in muscle_groups:
         fb_data = muscle_fb.get(muscle_group, None)
 
         if fb_data and fb_data["soreness"]:
@@ -1335,75 +1696,86 @@ def calculate_smart_progression(
         else:
             avg_volume = 0.0  # Default: just right
 
-        recovery_state = classify_recovery_state(avg_soreness)
-        stimulus_quality = classify_stimulus_quality(avg_pump, avg_volume)
-
-        # ── Get previous session data for this exercise ──
-        # Find the most recent completed occurrence of this exercise for this user
-        prev_sets_data = []
-        if user_id:
-            prev_mde = (
-                db.query(models.MesocycleDayExercise)
-                .join(models.MesocycleDay)
-                .join(models.MesocycleWeek)
-                .join(models.Mesocycle)
-                .filter(
-                    models.Mesocycle.user_id == user_id,
-                    models.MesocycleDayExercise.exercise_id == mde.exercise_id,
-                    models.MesocycleDay.is_completed == True,
-                    models.MesocycleDayExercise.id != mde.id,  # Exclude current
-                )
-                .options(joinedload(models.MesocycleDayExercise.set_logs))
-                .order_by(models.MesocycleDayExercise.id.desc())
-                .first()
-            )
+        averages[muscle_group] = (avg_soreness, avg_pump, avg_volume)
 
-            if prev_mde and prev_mde.set_logs:
-                for sl in sorted(prev_mde.set_logs, key=lambda s: s.set_number):
-                    if sl.weight > 0:  # Skip skipped sets
-                        prev_sets_data.append({
-                            "set_number": sl.set_number,
-                            "weight": sl.weight,
-                            "reps": sl.reps,
-                        })
+    soreness_avgs, pump_avgs, volume_avgs = zip(*averages.values()) if averages else ((), (), ())
+    recovery_codes = dict(zip(muscle_groups, engine.classify_recovery_states(soreness_avgs).tolist()))
+    stimulus_codes = dict(zip(muscle_groups, engine.classify_stimulus_qualities(
+        pump_avgs, volume_avgs).tolist()))
+
+    # ── Process each exercise ──
+    results = []
+
+    # Sets with history are collected here and run through the engine after
+    # the loop (in one batch for large days); their dicts are filled in place.
+    pending_targets: List[dict] = []
+    hist_weight: List[float] = []
+    hist_reps: List[int] = []
+    hist_equipment: List[int] = []
+    hist_recovery: List[int] = []
+    # Per exercise: previous sets by set number (first wins) and the average
+    # of its usable sets for new sets, or None when there are none
+    history_index: Dict[int, tuple] = {}
+
+    for mde in exercises:
+        # Name, muscle group and equipment type (selects the weight ladder)
+        # come precomputed from the catalog snapshot
+        exercise = catalog[mde.exercise_id]
+        exercise_name = exercise.name
+        muscle_group = exercise.muscle_group
+        equipment = exercise.equipment
+        equipment_class = exercise.equipment_class
+        is_db = exercise.is_dumbbell
+
+        avg_soreness, avg_pump, avg_volume = averages[muscle_group]
+        recovery_code = recovery_codes[muscle_group]
+        recovery_state = engine.RECOVERY_STATES[recovery_code]
+        stimulus_quality = engine.STIMULUS_QUALITIES[stimulus_codes[muscle_group]]
+
+        # ── Previous session data for this exercise (already batch-loaded) ──
+        prev_sets_data = history_map.get(mde.exercise_id, [])
+        if mde.exercise_id not in history_index:
+            by_number: Dict[int, dict] = {}
+            for s in prev_sets_data:
+                by_number.setdefault(s["set_number"], s)
+            valid_sets = [s for s in prev_sets_data if s["weight"] > 0]
+            new_set_average = (
+                (sum(s["weight"] for s in valid_sets) / len(valid_sets),
+                 int(sum(s["reps"] for s in valid_sets) / len(valid_sets)))
+                if valid_sets else None
+            )
+            history_index[mde.exercise_id] = (by_number, new_set_average)
+        prev_by_number, new_set_average = history_index[mde.exercise_id]
 
         # ── Calculate per-set targets ──
         set_targets = []
 
         for set_num in range(1, mde.prescribed_sets + 1):
             # Find the matching set from previous session
-            prev_set = next(
-                (s for s in prev_sets_data if s["set_number"] == set_num),
-                None
-            )
+            prev_set = prev_by_number.get(set_num)
 
             if prev_set and prev_set["weight"] > 0:
                 # We have history for this set — apply double progression
-                target = calculate_set_target(
-                    last_weight=prev_set["weight"],
-                    last_reps=prev_set["reps"],
-                    is_dumbbell=is_db,
-                    recovery_state=recovery_state,
-                    stimulus_quality=stimulus_quality,
-                )
-                set_targets.append({
+                set_target = {
                     "set_number": set_num,
-                    "target_weight": target["target_weight"],
-                    "target_reps": target["target_reps"],
-                    "action": target["action"],
-                    "reason": target["reason"],
+                    "target_weight": None,
+                    "target_reps": None,
+                    "action": None,
+                    "reason": None,
                     "source": "history",
-                })
+                }
+                pending_targets.append(set_target)
+                hist_weight.append(prev_set["weight"])
+                hist_reps.append(prev_set["reps"])
+                hist_equipment.append(equipment_class)
+                hist_recovery.append(recovery_code)
+                set_targets.append(set_target)
 
             elif prev_sets_data:
                 # No data for this specific set number (maybe it's a new set)
                 # Use the average of existing sets as a starting point
-                valid_sets = [s for s in prev_sets_data if s["weight"] > 0]
-                if valid_sets:
-                    avg_weight = sum(s["weight"] for s in valid_sets) / len(valid_sets)
-                    avg_reps = int(
-                        sum(s["reps"] for s in valid_sets) / len(valid_sets)
-                    )
+                if new_set_average:
+                    avg_weight, avg_reps = new_set_average
                     set_targets.append({
                         "set_number": set_num,
                         "target_weight": round(avg_weight, 1),
@@ -1428,9 +1800,7 @@ def calculate_smart_progression(
             else:
                 # No history at all — check autofill from any previous occurrence
                 if user_id:
-                    autofill = get_last_weight_for_exercise(
-                        db, mde.exercise_id, user_id
-                    )
+                    autofill = autofill_map.get(mde.exercise_id)
                     if autofill and autofill["weight"]:
                         set_targets.append({
                             "set_number": set_num,
@@ -1472,6 +1842,7 @@ def calculate_smart_progression(
             "muscle_group": muscle_group,
             "equipment": equipment or "unknown",
             "is_dumbbell": is_db,
+            "equipment_class": EQUIPMENT_CLASSES[equipment_class],
             "prescribed_sets": mde.prescribed_sets,
             "recovery_state": recovery_state,
             "stimulus_quality": stimulus_quality,
@@ -1483,9 +1854,69 @@ def calculate_smart_progression(
             "set_targets": set_targets,
         })
 
+    # ── Double progression for every set with history ──
+    if len(pending_targets) >= engine.BATCH_MIN_ROWS:
+        batch = engine.compute_set_targets(hist_weight, hist_reps, hist_equipment, hist_recovery)
+        for i, set_target in enumerate(pending_targets):
+            set_target.update(batch.record(i))
+    else:
+        for set_target, *row in zip(pending_targets, hist_weight, hist_reps,
+                                    hist_equipment, hist_recovery):
+            set_target.update(engine.set_target(*row))
+
     return results
 
 
+def get_cached_smart_targets(db: Session, meso_day_id: int, user_id: int,
+                             day: Optional[models.MesocycleDay] = None) -> Optional[tuple]:
+    """
+    calculate_smart_progression() behind the per-day smart target cache, as
+    (week_number, targets); None if the day doesn't exist or isn't the user's.
+
+    Only the plain (no soreness override) targets are cached — those are the
+    ones the workout page and set evaluation read. A hit costs no query; a
+    miss loads the day once (scoped to the user) unless the caller has it.
+    """
+    cached = smart_target_cache.get_day(meso_day_id, user_id)
+    if cached is not None:
+        return cached
+    if day is None:
+        day = db.execute(
+            smart_progression_day_stmt(meso_day_id, user_id)
+        ).unique().scalars().first()
+        if day is None:
+            return None
+    targets = calculate_smart_progression(db, meso_day_id, day=day, user_id=user_id)
+    smart_target_cache.put(meso_day_id, user_id, day.week.week_number, targets)
+    return day.week.week_number, targets
+
+
+def get_set_target(db: Session, meso_day_exercise_id: int, set_number: int,
+                   user_id: int) -> Optional[tuple]:
+    """
+    (target_weight, target_reps) for a single set.
+
+    A cache hit is a dict lookup; on a miss the whole day is computed once
+    and cached. Returns None if the MesocycleDayExercise does not exist or
+    isn't the user's.
+    """
+    target = smart_target_cache.get_set_target(meso_day_exercise_id, set_number)
+    if target is not None:
+        return target
+
+    meso_day_id = (
+        db.query(models.MesocycleDayExercise.meso_day_id)
+        .filter(models.MesocycleDayExercise.id == meso_day_exercise_id,
+                models.MesocycleDayExercise.user_id == user_id)
+        .scalar()
+    )
+    if meso_day_id is None:
+        return None
+
+    get_cached_smart_targets(db, meso_day_id, user_id)
+    return smart_target_cache.get_set_target(meso_day_exercise_id, set_number) or (0, 0)
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # SET PERFORMANCE EVALUATION
 # ═══════════════════════════════════════════════════════════════════════════
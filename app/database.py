@@ -1,6 +1,176 @@
-from sqlalchemy import create_engine
+# app/database.py
+"""
+Engines and sessions.
+
+Nothing connects at import time: the app builds its engines in its lifespan
+(init_engines / dispose_engines), scripts call get_engine(). SessionLocal and
+AsyncSessionLocal are importable up front and get bound by init_engines().
+"""
+import threading
+import time
+
+from sqlalchemy import create_engine, exc
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from app.config import SQLALCHEMY_DATABASE_URL
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.config import (
+    SQLALCHEMY_DATABASE_URL,
+    SQLALCHEMY_ASYNC_DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT_SECONDS,
+    DB_POOL_RECYCLE_SECONDS,
+    DB_PRE_PING,
+    DB_STATEMENT_TIMEOUT_MS,
+)
+
+
+# ═══════════════════════════════════════════════════════
+# POOL METRICS
+# ═══════════════════════════════════════════════════════
+
+class PoolMetrics:
+    """Checkout counts and wait times for one pool (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_checkout(self, wait: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 3)
+                if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+class _InstrumentedPool:
+    """Times every checkout; metrics survive pool recreation (dispose)."""
+
+    def __init__(self, *args, **kw):
+        super().__init__(*args, **kw)
+        self.metrics = PoolMetrics()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(time.perf_counter() - start)
+        return conn
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size(),
+            "open": self.checkedin() + self.checkedout(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "max_connections": self.size() + self._max_overflow,
+            **self.metrics.snapshot(),
+        }
+
+
+class InstrumentedQueuePool(_InstrumentedPool, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    pass
+
+
+# ═══════════════════════════════════════════════════════
+# ENGINE LIFECYCLE
+# ═══════════════════════════════════════════════════════
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+# Objects stay usable after commit so responses can be built without an
+# implicit refresh.
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+engine = None
+async_engine = None
+
+
+def _pool_options() -> dict:
+    if DB_PRE_PING not in ("recycle", "always"):
+        raise ValueError(f"DB_PRE_PING must be 'recycle' or 'always', got {DB_PRE_PING!r}")
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": DB_PRE_PING == "always",
+        # Hand out the most recently used connection so surplus ones go idle
+        # and get recycled instead of being kept warm round-robin
+        "pool_use_lifo": True,
+    }
+
+
+def init_engines() -> None:
+    """Build the sync and async engines (idempotent) and bind the sessionmakers."""
+    global engine, async_engine
+    if engine is None:
+        engine = create_engine(
+            SQLALCHEMY_DATABASE_URL,
+            poolclass=InstrumentedQueuePool,
+            connect_args={"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"},
+            **_pool_options(),
+        )
+        SessionLocal.configure(bind=engine)
+    if async_engine is None:
+        async_engine = create_async_engine(
+            SQLALCHEMY_ASYNC_DATABASE_URL,
+            poolclass=InstrumentedAsyncQueuePool,
+            connect_args={"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}},
+            **_pool_options(),
+        )
+        AsyncSessionLocal.configure(bind=async_engine)
+
+
+async def dispose_engines() -> None:
+    """Close every pooled connection; init_engines() may be called again."""
+    global engine, async_engine
+    if async_engine is not None:
+        await async_engine.dispose()
+        async_engine = None
+    if engine is not None:
+        engine.dispose()
+        engine = None
+
+
+def get_engine():
+    """The sync engine, built on first use (scripts, migrations helpers)."""
+    init_engines()
+    return engine
+
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def pool_stats() -> dict:
+    """Connection usage and checkout wait metrics for both pools."""
+    return {
+        name: eng.pool.stats() if eng is not None else None
+        for name, eng in (("sync", engine), ("async", async_engine and async_engine.sync_engine))
+    }
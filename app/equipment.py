@@ -0,0 +1,340 @@
+# app/equipment.py
+"""
+Equipment classification and weight ladders.
+
+A weight ladder is the sorted set of loads a piece of equipment can
+actually be set to: the dumbbell rack, bar + plate pairs, a selectorized
+machine stack, a cable stack. Ladders are built once as sorted arrays and
+every snap (up, down, strictly above, nearest) is a binary search —
+``bisect`` for a single weight, ``np.searchsorted`` for a column.
+"""
+from bisect import bisect_left, bisect_right
+from math import gcd
+
+import numpy as np
+
+from app.config import (
+    GYM_DUMBBELL_WEIGHTS_KG,
+    GYM_BARBELL_BAR_KG,
+    GYM_BARBELL_PLATES_KG,
+    GYM_BARBELL_MAX_KG,
+    GYM_MACHINE_STACK_STEP_KG,
+    GYM_MACHINE_STACK_MAX_KG,
+    GYM_CABLE_STACK_STEP_KG,
+    GYM_CABLE_STACK_MAX_KG,
+)
+
+
+# Standard dumbbell weights available in most gyms (in kg)
+DUMBBELL_WEIGHTS_KG = [
+    2, 4, 5, 6, 7.5, 8, 10, 12, 12.5, 14, 15, 16, 17.5, 20,
+    22.5, 25, 27.5, 30, 32.5, 35, 37.5, 40, 42.5, 45, 47.5, 50,
+    52.5, 55, 57.5, 60
+]
+
+MIN_BARBELL_INCREMENT_KG = 2.5        # Smallest barbell plate jump
+MIN_DUMBBELL_INCREMENT_KG = 2.0       # Smallest dumbbell jump
+
+
+# ═══════════════════════════════════════════════════════
+# EQUIPMENT CLASSES
+# ═══════════════════════════════════════════════════════
+
+# OTHER covers anything without a known ladder (body weight, bands, …);
+# it moves in plain 2.5 kg increments. OTHER/DUMBBELL are 0/1 so legacy
+# is_dumbbell booleans are valid codes.
+OTHER, DUMBBELL, BARBELL, MACHINE, CABLE = range(5)
+EQUIPMENT_CLASSES = ("other", "dumbbell", "barbell", "machine", "cable")
+EQUIPMENT_CODES = {name: code for code, name in enumerate(EQUIPMENT_CLASSES)}
+
+_DUMBBELL_NAME_KEYWORDS = [
+    'dumbbell', 'db ', 'db_', 'd.b.',
+    'lateral raise', 'fly', 'flye',
+    'concentration curl', 'hammer curl', 'kickback',
+]
+
+
+def classify_equipment(exercise_name: str, equipment: str | None = None) -> int:
+    """
+    Equipment class code for an exercise.
+
+    The equipment field is checked first (most reliable); when it is
+    missing or unrecognised the exercise name is used as a heuristic.
+    """
+    if equipment:
+        eq_lower = equipment.lower()
+        if "dumbbell" in eq_lower or "db" in eq_lower:
+            return DUMBBELL
+        if "barbell" in eq_lower or "smith" in eq_lower:
+            return BARBELL
+        if "cable" in eq_lower:
+            return CABLE
+        if "machine" in eq_lower:
+            return MACHINE
+        if any(kw in eq_lower for kw in ["body weight", "bodyweight", "band"]):
+            return OTHER
+
+    name_lower = exercise_name.lower()
+    if any(kw in name_lower for kw in _DUMBBELL_NAME_KEYWORDS):
+        return DUMBBELL
+    if "cable" in name_lower:
+        return CABLE
+    if "machine" in name_lower or "lever" in name_lower:
+        return MACHINE
+    if "barbell" in name_lower or "smith" in name_lower:
+        return BARBELL
+    return OTHER
+
+
+def is_dumbbell_exercise(exercise_name: str, equipment: str | None = None) -> bool:
+    """
+    Determine if an exercise uses dumbbells.
+
+    Checks the equipment field first (from Exercise model), then falls back
+    to heuristic name matching.
+
+    Args:
+        exercise_name: The exercise name string
+        equipment: The equipment field from the Exercise model (if available)
+
+    Returns:
+        True if the exercise uses dumbbells
+    """
+    return classify_equipment(exercise_name, equipment) == DUMBBELL
+
+
+# ═══════════════════════════════════════════════════════
+# WEIGHT LADDERS
+# ═══════════════════════════════════════════════════════
+
+def _is_scalar(weight) -> bool:
+    # isinstance rather than np.ndim(): this runs several times per set
+    return isinstance(weight, (int, float, np.number))
+
+
+def round_1(weight: float) -> float:
+    """np.round(weight, 1) for a single float: round half to even on weight × 10."""
+    return round(weight * 10) / 10
+
+
+class WeightLadder:
+    """
+    Sorted, de-duplicated loads for one kind of equipment.
+
+    Snap methods accept a single weight (bisect, returns None when nothing
+    qualifies) or an array (searchsorted, returns NaN where nothing
+    qualifies). The progression primitives built on them take either too.
+
+    Attributes:
+        label: Used in explanations ("At maximum {label} weight")
+        rounding: "up" snaps a progression target to the next load at or
+                  above it; "nearest" picks the closest load (ties go down)
+        overflow_step: Increment used when a forced jump runs off the top
+    """
+
+    __slots__ = ("label", "weights", "rounding", "overflow_step", "_values")
+
+    def __init__(self, label: str, weights, rounding: str = "nearest",
+                 overflow_step: float = MIN_BARBELL_INCREMENT_KG):
+        if rounding not in ("up", "nearest"):
+            raise ValueError(f"Unknown rounding mode: {rounding}")
+        self.label = label
+        self.weights = np.unique(np.asarray(weights, dtype=np.float64))
+        if not len(self.weights):
+            raise ValueError(f"Empty {label} ladder")
+        self.weights.flags.writeable = False
+        self.rounding = rounding
+        self.overflow_step = overflow_step
+        self._values = self.weights.tolist()
+
+    def __len__(self):
+        return len(self._values)
+
+    @property
+    def max_weight(self) -> float:
+        return self._values[-1]
+
+    # ── Snapping ───────────────────────────────────────
+
+    def snap_up(self, weight):
+        """Smallest load >= weight."""
+        if _is_scalar(weight):
+            i = bisect_left(self._values, weight)
+            return self._values[i] if i < len(self._values) else None
+        return self._take(np.searchsorted(self.weights, weight, side="left"))
+
+    def snap_down(self, weight):
+        """Largest load <= weight."""
+        if _is_scalar(weight):
+            i = bisect_right(self._values, weight) - 1
+            return self._values[i] if i >= 0 else None
+        return self._take(np.searchsorted(self.weights, weight, side="right") - 1)
+
+    def next_above(self, weight):
+        """Smallest load strictly > weight."""
+        if _is_scalar(weight):
+            i = bisect_right(self._values, weight)
+            return self._values[i] if i < len(self._values) else None
+        return self._take(np.searchsorted(self.weights, weight, side="right"))
+
+    def snap_nearest(self, weight):
+        """Closest load; ties go to the lighter one."""
+        if _is_scalar(weight):
+            up, down = self.snap_up(weight), self.snap_down(weight)
+            if up is None or down is None:
+                return down if up is None else up
+            return up if up - weight < weight - down else down
+        weight = np.asarray(weight, dtype=np.float64)
+        up, down = self.snap_up(weight), self.snap_down(weight)
+        pick_up = np.isnan(down) | (~np.isnan(up) & (up - weight < weight - down))
+        return np.where(pick_up, up, down)
+
+    def _take(self, idx):
+        idx = np.asarray(idx)
+        valid = (idx >= 0) & (idx < len(self._values))
+        return np.where(valid, self.weights[np.clip(idx, 0, len(self._values) - 1)], np.nan)
+
+    # ── Progression primitives ─────────────────────────
+
+    def progress(self, current, target):
+        """
+        Candidate load for a weight increase from current towards target.
+
+        Returns (candidate, at_max). The candidate is always strictly above
+        current; at_max marks rows with nothing heavier on the ladder.
+        """
+        snapped = self.snap_up(target) if self.rounding == "up" else self.snap_nearest(target)
+        if _is_scalar(current):
+            candidate = self.next_above(current) if snapped is None or snapped <= current else snapped
+            return (current, True) if candidate is None else (candidate, False)
+        candidate = np.where(np.isnan(snapped) | (snapped <= current),
+                             self.next_above(current), snapped)
+        at_max = np.isnan(candidate)
+        return np.where(at_max, current, candidate), at_max
+
+    def deload(self, weight):
+        """Snap a reduced weight down onto the ladder (kept as-is below it)."""
+        snapped = self.snap_down(weight)
+        if _is_scalar(weight):
+            return weight if snapped is None else snapped
+        return np.where(np.isnan(snapped), weight, snapped)
+
+    def force(self, current):
+        """Next load above current, or current + overflow_step past the top."""
+        above = self.next_above(current)
+        if _is_scalar(current):
+            return round_1(current + self.overflow_step) if above is None else above
+        return np.where(np.isnan(above), np.round(current + self.overflow_step, 1), above)
+
+
+class PlateIncrements:
+    """
+    Open-ended loading in fixed plate increments, relative to the current
+    weight — the fallback for equipment without a known ladder.
+
+    Same progression primitives as WeightLadder; there is no maximum.
+    """
+
+    __slots__ = ("label", "step")
+
+    def __init__(self, label: str, step: float = MIN_BARBELL_INCREMENT_KG):
+        self.label = label
+        self.step = step
+
+    def progress(self, current, target):
+        if _is_scalar(current):
+            return current + max(1, round((target - current) / self.step)) * self.step, False
+        current = np.asarray(current, dtype=np.float64)
+        increments = np.maximum(1, np.rint((np.asarray(target) - current) / self.step))
+        return current + increments * self.step, np.zeros(current.shape, dtype=bool)
+
+    def deload(self, weight):
+        if _is_scalar(weight):
+            return round_1((weight // self.step) * self.step)
+        return np.round((np.asarray(weight) // self.step) * self.step, 1)
+
+    def force(self, current):
+        if _is_scalar(current):
+            return round_1(current + self.step)
+        return np.round(np.asarray(current) + self.step, 1)
+
+
+def barbell_loads(bar_kg: float, plates_kg, max_kg: float) -> list:
+    """
+    Every total achievable with the bar plus matching plate pairs.
+
+    Plates are assumed to be available in as many pairs as needed.
+    Computed on integer grams to stay exact.
+    """
+    plates_g = sorted({round(p * 1000) for p in plates_kg if p > 0})
+    if not plates_g:
+        return [bar_kg]
+    unit = 0
+    for p in plates_g:
+        unit = gcd(unit, p)
+    max_side_units = int(round((max_kg - bar_kg) * 1000)) // 2 // unit
+    plate_units = [p // unit for p in plates_g]
+
+    reachable = [False] * (max_side_units + 1)
+    reachable[0] = True
+    for n in range(1, max_side_units + 1):
+        reachable[n] = any(n >= p and reachable[n - p] for p in plate_units)
+
+    return [bar_kg + 2 * n * unit / 1000 for n, ok in enumerate(reachable) if ok]
+
+
+def stack_loads(step_kg: float, max_kg: float) -> list:
+    """Pin-selected stack: step, 2×step, … up to max."""
+    return (np.arange(1, int(max_kg // step_kg) + 1) * step_kg).tolist()
+
+
+class EquipmentLadders:
+    """One ladder per equipment class — i.e. the loads of one gym."""
+
+    __slots__ = ("_ladders",)
+
+    def __init__(self, ladders: dict):
+        missing = set(range(len(EQUIPMENT_CLASSES))) - set(ladders)
+        if missing:
+            raise ValueError(
+                f"Missing ladders for: {', '.join(EQUIPMENT_CLASSES[c] for c in sorted(missing))}"
+            )
+        self._ladders = dict(ladders)
+
+    def __getitem__(self, equipment_class: int):
+        return self._ladders[equipment_class]
+
+
+def build_ladders(
+    dumbbells_kg=None,
+    bar_kg: float = 20.0,
+    plates_kg=(25, 20, 15, 10, 5, 2.5, 1.25),
+    barbell_max_kg: float = 400.0,
+    machine_step_kg: float = 5.0,
+    machine_max_kg: float = 200.0,
+    cable_step_kg: float = 2.5,
+    cable_max_kg: float = 120.0,
+) -> EquipmentLadders:
+    """Build the weight ladders for a gym's equipment inventory."""
+    return EquipmentLadders({
+        DUMBBELL: WeightLadder("dumbbell", dumbbells_kg or DUMBBELL_WEIGHTS_KG,
+                               rounding="up", overflow_step=MIN_DUMBBELL_INCREMENT_KG),
+        BARBELL: WeightLadder("barbell", barbell_loads(bar_kg, plates_kg, barbell_max_kg)),
+        MACHINE: WeightLadder("machine stack", stack_loads(machine_step_kg, machine_max_kg),
+                              overflow_step=machine_step_kg),
+        CABLE: WeightLadder("cable stack", stack_loads(cable_step_kg, cable_max_kg),
+                            overflow_step=cable_step_kg),
+        OTHER: PlateIncrements("free weight", MIN_BARBELL_INCREMENT_KG),
+    })
+
+
+DEFAULT_LADDERS = build_ladders(
+    dumbbells_kg=GYM_DUMBBELL_WEIGHTS_KG,
+    bar_kg=GYM_BARBELL_BAR_KG,
+    plates_kg=GYM_BARBELL_PLATES_KG or (),
+    barbell_max_kg=GYM_BARBELL_MAX_KG,
+    machine_step_kg=GYM_MACHINE_STACK_STEP_KG,
+    machine_max_kg=GYM_MACHINE_STACK_MAX_KG,
+    cable_step_kg=GYM_CABLE_STACK_STEP_KG,
+    cable_max_kg=GYM_CABLE_STACK_MAX_KG,
+)
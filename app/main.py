@@ -1,37 +1,45 @@
 # app/main.py
-from fastapi import FastAPI, Depends, HTTPException, Query, status
+from contextlib import asynccontextmanager
+
+from fastapi import APIRouter, FastAPI, Depends, HTTPException, Query, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session, joinedload
+from jose import JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 from typing import List, Optional
 
-from app.database import engine, SessionLocal
-from app.models import Base, User
-from app import schemas, crud, models
+from app.database import (
+    SessionLocal, AsyncSessionLocal, init_engines, dispose_engines, pool_stats,
+)
+from app.models import User
+from app import schemas, crud, async_crud
+from app.cache import AuthUser, auth_cache, smart_target_cache
+from app.catalog import exercise_catalog
+from app.serializers import serialize_day, serialize_mesocycle_detail
 from app.utils import (
     create_access_token,
     create_refresh_token,
     decode_token,
-    verify_password,
+    shutdown_hash_pool,
+    verify_and_update_async,
 )
 
 
-# ─── Create all tables ───────────────────────────────
-Base.metadata.create_all(bind=engine)
+# ─── Lifespan: engines, warm caches and hash pool live with the app ─
+# The schema is owned by Alembic (``alembic upgrade head``), so importing
+# this module or starting a worker never touches the database schema.
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_engines()
+    async with AsyncSessionLocal() as db:
+        catalog = await exercise_catalog.refresh_async(db)
+    catalog.search_index            # build it now rather than on the first search
+    yield
+    await dispose_engines()
+    shutdown_hash_pool()
 
-# ─── App ──────────────────────────────────────────────
-app = FastAPI(
-    title="Iron Protocol API",
-    description="Systematic destruction. Calculated growth.",
-)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+router = APIRouter()
 
 # ─── Dependencies ─────────────────────────────────────
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
@@ -43,44 +51,80 @@ def get_db():
     finally:
         db.close()
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> User:
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> AuthUser:
+    """
+    The authenticated user as an AuthUser snapshot.
+
+    Steady state costs no queries and no JWT verification: the token hash
+    maps to a user id, and active users are cached by id (see AuthCache).
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Invalid or expired token",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    payload = decode_token(token)
-    if payload is None:
-        raise credentials_exception
-    if payload.get("type") != "access":
-        raise credentials_exception
-    user_id = payload.get("sub")
+    user_id = auth_cache.get_token_user_id(token)
     if user_id is None:
-        raise credentials_exception
-    user = db.query(User).filter(User.id == int(user_id)).first()
-    if user is None or not user.is_active:
-        raise credentials_exception
+        try:
+            payload = decode_token(token)
+        except JWTError:
+            raise credentials_exception
+        if payload is None:
+            raise credentials_exception
+        if payload.get("type") != "access":
+            raise credentials_exception
+        if payload.get("sub") is None or payload.get("exp") is None:
+            raise credentials_exception
+        user_id = int(payload["sub"])
+        auth_cache.put_token(token, user_id, payload["exp"])
+
+    user = auth_cache.get_user(user_id)
+    if user is None:
+        # Short-lived session: the connection goes back to the pool right away
+        async with AsyncSessionLocal() as db:
+            db_user = await db.get(User, user_id)
+            user = AuthUser.from_user(db_user) if db_user is not None else None
+        if user is None or not user.is_active:
+            raise credentials_exception
+        auth_cache.put_user(user)
     return user
 
+# ═════════════════════════════════════════════════════════
+# HEALTH
+# ═════════════════════════════════════════════════════════
+@router.get("/health/db-pool")
+def db_pool_health(current_user: AuthUser = Depends(get_current_user)):
+    """Connection usage and checkout wait metrics for this worker's pools (authenticated only)."""
+    return pool_stats()
+
 # ═════════════════════════════════════════════════════════
 # AUTH ROUTES
 # ═════════════════════════════════════════════════════════
-@app.post("/auth/register", response_model=schemas.UserResponse)
-def register(user_in: schemas.UserCreate, db: Session = Depends(get_db)):
-    existing = crud.get_user_by_email(db, user_in.email)
+@router.post("/auth/register", response_model=schemas.UserResponse)
+async def register(user_in: schemas.UserCreate, db: AsyncSession = Depends(get_async_db)):
+    existing = await async_crud.get_user_by_email(db, user_in.email)
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
-    user = crud.create_user(db, name=user_in.name, email=user_in.email, password=user_in.password)
+    user = await async_crud.create_user(db, name=user_in.name, email=user_in.email,
+                                        password=user_in.password)
     return user
 
-@app.post("/auth/login")
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = crud.get_user_by_email(db, form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+@router.post("/auth/login")
+async def login(form_data: OAuth2PasswordRequestForm = Depends(),
+                db: AsyncSession = Depends(get_async_db)):
+    user = await async_crud.get_user_by_email(db, form_data.username)
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    verified, new_hash = await verify_and_update_async(form_data.password, user.hashed_password)
+    if not verified:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    if new_hash:
+        # Hashing scheme or cost changed since this password was stored
+        await async_crud.update_password_hash(db, user, new_hash)
     access_token = create_access_token(data={"sub": str(user.id), "type": "access"})
     refresh_token = create_refresh_token(data={"sub": str(user.id), "type": "refresh"})
     return {
@@ -89,7 +133,7 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
         "token_type": "bearer",
     }
 
-@app.post("/auth/refresh")
+@router.post("/auth/refresh")
 def refresh_token(body: schemas.RefreshRequest):
     payload = decode_token(body.refresh_token)
     if payload is None or payload.get("type") != "refresh":
@@ -98,31 +142,32 @@ def refresh_token(body: schemas.RefreshRequest):
     new_access = create_access_token(data={"sub": user_id, "type": "access"})
     return {"access_token": new_access, "token_type": "bearer"}
 
-@app.get("/auth/me", response_model=schemas.UserResponse)
-def get_me(current_user: User = Depends(get_current_user)):
+@router.get("/auth/me", response_model=schemas.UserResponse)
+def get_me(current_user: AuthUser = Depends(get_current_user)):
     return current_user
 
 # ═════════════════════════════════════════════════════════
 # EXERCISE ROUTES
 # ═════════════════════════════════════════════════════════
-@app.get("/exercises/", response_model=List[schemas.ExerciseResponse])
+@router.get("/exercises/", response_model=List[schemas.ExerciseResponse])
 def list_exercises(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
     body_part: Optional[str] = None,
     target: Optional[str] = None,
+    equipment: Optional[str] = None,
     search: Optional[str] = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
 ):
-    return crud.get_exercises(db, skip=skip, limit=limit,
-                              body_part=body_part, target=target, search=search)
+    return crud.get_exercises(db, skip=skip, limit=limit, body_part=body_part,
+                              target=target, equipment=equipment, search=search)
 
-@app.get("/exercises/{exercise_id}", response_model=schemas.ExerciseResponse)
+@router.get("/exercises/{exercise_id}", response_model=schemas.ExerciseResponse)
 def get_exercise(
     exercise_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     ex = crud.get_exercise_by_id(db, exercise_id)
     if not ex:
@@ -132,11 +177,11 @@ def get_exercise(
 # ═════════════════════════════════════════════════════════
 # PLAN ROUTES
 # ═════════════════════════════════════════════════════════
-@app.post("/plans/", response_model=schemas.PlanResponse)
+@router.post("/plans/", response_model=schemas.PlanResponse)
 def create_plan(
     plan_in: schemas.PlanCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     days_data = []
     for d in plan_in.days:
@@ -148,32 +193,38 @@ def create_plan(
             })
         days_data.append(day_dict)
 
+    unknown = crud.unknown_exercise_ids(
+        db, (ex["exercise_id"] for d in days_data for ex in d["exercises"])
+    )
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown exercises: {unknown}")
+
     plan = crud.create_plan(db, user_id=current_user.id, name=plan_in.name, days_data=days_data)
     return crud.get_plan_by_id(db, plan.id, current_user.id)
 
-@app.get("/plans/", response_model=List[schemas.PlanResponse])
+@router.get("/plans/", response_model=List[schemas.PlanResponse])
 def list_plans(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     return crud.get_plans(db, current_user.id)
 
-@app.get("/plans/{plan_id}", response_model=schemas.PlanResponse)
+@router.get("/plans/{plan_id}", response_model=schemas.PlanResponse)
 def get_plan(
     plan_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     plan = crud.get_plan_by_id(db, plan_id, current_user.id)
     if not plan:
         raise HTTPException(status_code=404, detail="Plan not found")
     return plan
 
-@app.delete("/plans/{plan_id}")
+@router.delete("/plans/{plan_id}")
 def delete_plan(
     plan_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     result = crud.delete_plan(db, plan_id, current_user.id)
     if result == "in_use":
@@ -186,11 +237,11 @@ def delete_plan(
 # ═════════════════════════════════════════════════════════
 # MESOCYCLE ROUTES
 # ═════════════════════════════════════════════════════════
-@app.post("/mesocycles/", response_model=schemas.MesocycleResponse)
+@router.post("/mesocycles/", response_model=schemas.MesocycleResponse)
 def start_mesocycle(
     meso_in: schemas.MesocycleCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     meso = crud.start_mesocycle(db, user_id=current_user.id,
                                 plan_id=meso_in.plan_id, name=meso_in.name)
@@ -198,178 +249,206 @@ def start_mesocycle(
         raise HTTPException(status_code=404, detail="Plan not found or not yours")
     return meso
 
-@app.get("/mesocycles/", response_model=List[schemas.MesocycleResponse])
+@router.get("/mesocycles/", response_model=List[schemas.MesocycleResponse])
 def list_mesocycles(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     return crud.get_mesocycles(db, current_user.id)
 
-@app.get("/mesocycles/{mesocycle_id}")
-def get_mesocycle(
+@router.get("/mesocycles/{mesocycle_id}")
+async def get_mesocycle(
     mesocycle_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthUser = Depends(get_current_user),
 ):
-    meso = crud.get_mesocycle_detail(db, mesocycle_id, current_user.id)
+    meso = await async_crud.get_mesocycle_detail(db, mesocycle_id, current_user.id)
     if not meso:
         raise HTTPException(status_code=404, detail="Mesocycle not found")
+    days = [day for week in meso.weeks for day in week.days]
+    catalog = await exercise_catalog.resolve_async(db, crud.day_exercise_ids(*days))
+    return serialize_mesocycle_detail(meso, catalog)
 
-    weeks_out = []
-    for week in sorted(meso.weeks, key=lambda w: w.week_number):
-        days_out = []
-        for day in sorted(week.days, key=lambda d: d.day_order):
-            day_name = day.plan_day.name if day.plan_day else f"Day {day.day_order}"
-            days_out.append({
-                "id": day.id,
-                "plan_day_id": day.plan_day_id,
-                "day_order": day.day_order,
-                "is_completed": day.is_completed,
-                "day_name": day_name,
-                "exercises": [
-                    {
-                        "id": mde.id,
-                        "exercise_id": mde.exercise_id,
-                        "exercise_order": mde.exercise_order,
-                        "prescribed_sets": mde.prescribed_sets,
-                        "prescribed_reps": mde.prescribed_reps,
-                        "note": mde.note,
-                        "exercise": {
-                            "id": mde.exercise.id,
-                            "name": mde.exercise.name,
-                            "body_part": mde.exercise.body_part,
-                            "equipment": mde.exercise.equipment,
-                            "target": mde.exercise.target,
-                        },
-                        "set_logs": [
-                            {
-                                "id": sl.id,
-                                "set_number": sl.set_number,
-                                "weight": sl.weight,
-                                "reps": sl.reps,
-                                "logged_at": sl.logged_at.isoformat() if sl.logged_at else None,
-                            }
-                            for sl in sorted(mde.set_logs, key=lambda s: s.set_number)
-                        ],
-                    }
-                    for mde in sorted(day.exercises, key=lambda e: e.exercise_order)
-                ],
-                "feedbacks": [
-                    {
-                        "id": fb.id,
-                        "muscle_group": fb.muscle_group,
-                        "soreness": fb.soreness.value if hasattr(fb.soreness, 'value') else fb.soreness,
-                        "pump": fb.pump.value if hasattr(fb.pump, 'value') else fb.pump,
-                        "volume_feeling": fb.volume_feeling.value if hasattr(fb.volume_feeling, 'value') else fb.volume_feeling,
-                        "notes": fb.notes,
-                    }
-                    for fb in day.feedbacks
-                ],
-            })
-        weeks_out.append({
-            "id": week.id,
-            "week_number": week.week_number,
-            "days": days_out,
-        })
-
-    return {
-        "id": meso.id,
-        "plan_id": meso.plan_id,
-        "name": meso.name,
-        "current_week": meso.current_week,
-        "is_active": meso.is_active,
-        "started_at": meso.started_at.isoformat() if meso.started_at else None,
-        "weeks": weeks_out,
-    }
-
-@app.delete("/mesocycles/{mesocycle_id}")
+@router.delete("/mesocycles/{mesocycle_id}")
 def delete_mesocycle(
     mesocycle_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     result = crud.delete_mesocycle(db, mesocycle_id, current_user.id)
     if not result:
         raise HTTPException(status_code=404, detail="Mesocycle not found")
+    smart_target_cache.invalidate_user(current_user.id)
     return {"detail": "Mesocycle deleted"}
 
 # ── Current workout ───────────────────────────────────
-@app.get("/mesocycles/{mesocycle_id}/current-workout", response_model=schemas.MesocycleDayResponse)
-def current_workout(
+@router.get("/mesocycles/{mesocycle_id}/current-workout", response_model=schemas.MesocycleDayResponse)
+async def current_workout(
     mesocycle_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthUser = Depends(get_current_user),
 ):
-    day = crud.get_current_workout(db, mesocycle_id, current_user.id)
+    day = await async_crud.get_current_workout(db, mesocycle_id, current_user.id)
     if not day:
         raise HTTPException(status_code=404,
                             detail="No incomplete workout found — week may be complete")
-    return day
+    catalog = await exercise_catalog.resolve_async(db, crud.day_exercise_ids(day))
+    return serialize_day(day, catalog)
+
+@router.get("/mesocycles/{mesocycle_id}/workout-bundle", response_model=schemas.WorkoutBundleResponse)
+async def workout_bundle(
+    mesocycle_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthUser = Depends(get_current_user),
+):
+    """
+    Current workout day, its logs, feedback and smart targets in one
+    response — replaces current-workout + smart-targets on page load.
+    """
+    bundle = await async_crud.get_workout_bundle(db, mesocycle_id, current_user.id)
+    if not bundle:
+        raise HTTPException(status_code=404,
+                            detail="No incomplete workout found — week may be complete")
+    return bundle
 
 # ── Log a set ─────────────────────────────────────────
-@app.post("/mesocycle-day-exercises/{mde_id}/log-set", response_model=schemas.SetLogResponse)
-def log_set(
+@router.post("/mesocycle-day-exercises/{mde_id}/log-set", response_model=schemas.SetLogResponse)
+async def log_set(
     mde_id: int,
     set_in: schemas.SetLogCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthUser = Depends(get_current_user),
 ):
-    sl = crud.log_set(db, meso_day_exercise_id=mde_id,
-                      set_number=set_in.set_number,
-                      weight=set_in.weight, reps=set_in.reps)
+    sl = await async_crud.log_set(db, meso_day_exercise_id=mde_id,
+                                  set_number=set_in.set_number,
+                                  weight=set_in.weight, reps=set_in.reps,
+                                  user_id=current_user.id)
+    if sl is None:
+        raise HTTPException(status_code=404, detail="Exercise not found")
+    smart_target_cache.invalidate_user(current_user.id, keep_mde_id=mde_id)
     return sl
 
+# ── Log many sets (session sync) ──────────────────────
+@router.post("/mesocycle-day-exercises/{mde_id}/log-sets", response_model=List[schemas.SetLogResponse])
+async def log_sets(
+    mde_id: int,
+    body: schemas.BulkSetLogCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthUser = Depends(get_current_user),
+):
+    """Log all sets of one exercise in a single upsert."""
+    logs = await async_crud.upsert_set_logs(db, [
+        {"meso_day_exercise_id": mde_id, **s.model_dump()} for s in body.sets
+    ], current_user.id)
+    if body.sets and not logs:
+        raise HTTPException(status_code=404, detail="Exercise not found")
+    smart_target_cache.invalidate_user(current_user.id, keep_mde_id=mde_id)
+    return logs
+
+@router.post("/mesocycle-days/{meso_day_id}/log-sets", response_model=List[schemas.DaySetLogResponse])
+def log_day_sets(
+    meso_day_id: int,
+    body: schemas.DaySetLogCreate,
+    db: Session = Depends(get_db),
+    current_user: AuthUser = Depends(get_current_user),
+):
+    """Log every set of a workout day in a single upsert."""
+    day_mde_ids = crud.get_day_exercise_ids(db, meso_day_id, current_user.id)
+    if day_mde_ids is None:
+        raise HTTPException(status_code=404, detail="Day not found")
+    foreign = sorted({ex.mde_id for ex in body.exercises} - day_mde_ids)
+    if foreign:
+        raise HTTPException(status_code=400,
+                            detail=f"Exercises not on this day: {foreign}")
+
+    logs = crud.upsert_set_logs(db, [
+        {"meso_day_exercise_id": ex.mde_id, **s.model_dump()}
+        for ex in body.exercises for s in ex.sets
+    ], current_user.id)
+    if body.exercises:
+        smart_target_cache.invalidate_user(current_user.id,
+                                           keep_mde_id=body.exercises[0].mde_id)
+    return logs
+
 # ── Skip sets ─────────────────────────────────────────
-@app.post("/mesocycle-day-exercises/{mde_id}/skip-sets")
+@router.post("/mesocycle-day-exercises/{mde_id}/skip-sets")
 def skip_sets(
     mde_id: int,
     body: schemas.SkipSetsRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
 ):
-    crud.skip_sets(db, mde_id, body.from_set, body.to_set)
+    skipped = crud.skip_sets(db, mde_id, body.from_set, body.to_set, current_user.id)
+    if not skipped:
+        raise HTTPException(status_code=404, detail="Exercise not found")
+    smart_target_cache.invalidate_user(current_user.id, keep_mde_id=mde_id)
     return {"detail": f"Sets {body.from_set}-{body.to_set} skipped"}
 
+@router.post("/mesocycle-days/{meso_day_id}/skip-sets", response_model=List[schemas.DaySetLogResponse])
+def skip_day_sets(
+    meso_day_id: int,
+    body: schemas.DaySkipSetsRequest,
+    db: Session = Depends(get_db),
+    current_user: AuthUser = Depends(get_current_user),
+):
+    """Skip set ranges on several exercises at once (ending a workout early)."""
+    day_mde_ids = crud.get_day_exercise_ids(db, meso_day_id, current_user.id)
+    if day_mde_ids is None:
+        raise HTTPException(status_code=404, detail="Day not found")
+    foreign = sorted({ex.mde_id for ex in body.exercises} - day_mde_ids)
+    if foreign:
+        raise HTTPException(status_code=400,
+                            detail=f"Exercises not on this day: {foreign}")
+
+    skipped = crud.skip_sets_bulk(db, [
+        (ex.mde_id, ex.from_set, ex.to_set) for ex in body.exercises
+    ], current_user.id)
+    if body.exercises:
+        smart_target_cache.invalidate_user(current_user.id,
+                                           keep_mde_id=body.exercises[0].mde_id)
+    return skipped
+
 # ── Add set to exercise ──────────────────────────────
-@app.post("/mesocycle-day-exercises/{mde_id}/add-set")
+@router.post("/mesocycle-day-exercises/{mde_id}/add-set")
 def add_set(
     mde_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
 ):
-    mde = crud.add_set_to_exercise(db, mde_id)
+    mde = crud.add_set_to_exercise(db, mde_id, current_user.id)
     if not mde:
         raise HTTPException(status_code=404, detail="Exercise not found")
+    smart_target_cache.invalidate_day(mde.meso_day_id)
     return {"prescribed_sets": mde.prescribed_sets}
 
 # ── Save note ─────────────────────────────────────────
-@app.post("/mesocycle-day-exercises/{mde_id}/note")
+@router.post("/mesocycle-day-exercises/{mde_id}/note")
 def save_note(
     mde_id: int,
     body: schemas.ExerciseNoteRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
 ):
-    mde = crud.save_exercise_note(db, mde_id, body.note)
+    mde = crud.save_exercise_note(db, mde_id, body.note, current_user.id)
     if not mde:
         raise HTTPException(status_code=404, detail="Exercise not found")
     return {"detail": "Note saved", "note": mde.note}
 
 # ── Exercise history ──────────────────────────────────
-@app.get("/exercises/{exercise_id}/history", response_model=List[schemas.ExerciseHistoryItem])
+@router.get("/exercises/{exercise_id}/history", response_model=List[schemas.ExerciseHistoryItem])
 def exercise_history(
     exercise_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     return crud.get_exercise_history(db, exercise_id, current_user.id)
 
 # ── Autofill (last weight) ───────────────────────────
-@app.get("/exercises/{exercise_id}/autofill")
+@router.get("/exercises/{exercise_id}/autofill")
 def autofill_exercise(
     exercise_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     result = crud.get_last_weight_for_exercise(db, exercise_id, current_user.id)
     if not result:
@@ -377,55 +456,60 @@ def autofill_exercise(
     return result
 
 # ── Submit feedback ───────────────────────────────────
-@app.post("/mesocycle-days/{meso_day_id}/feedback", response_model=schemas.FeedbackResponse)
+@router.post("/mesocycle-days/{meso_day_id}/feedback", response_model=schemas.FeedbackResponse)
 def submit_feedback(
     meso_day_id: int,
     fb_in: schemas.FeedbackCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     fb = crud.create_feedback(
         db,
         meso_day_id=meso_day_id,
+        user_id=current_user.id,
         muscle_group=fb_in.muscle_group,
         soreness=fb_in.soreness.value,
         pump=fb_in.pump.value,
         volume_feeling=fb_in.volume_feeling.value,
         notes=fb_in.notes,
     )
+    if not fb:
+        raise HTTPException(status_code=404, detail="Day not found")
+    smart_target_cache.invalidate_user(current_user.id)
     return fb
 
 # ── Complete a day ────────────────────────────────────
-@app.post("/mesocycle-days/{meso_day_id}/complete")
+@router.post("/mesocycle-days/{meso_day_id}/complete")
 def complete_day(
     meso_day_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
 ):
-    day = crud.complete_day(db, meso_day_id)
+    day = crud.complete_day(db, meso_day_id, current_user.id)
     if not day:
         raise HTTPException(status_code=404, detail="Day not found")
+    smart_target_cache.invalidate_user(current_user.id)
     return {"detail": "Day completed", "meso_day_id": meso_day_id}
 
 # ── Per-day progression preview ───────────────────────
-@app.get("/mesocycle-days/{meso_day_id}/progression",
+@router.get("/mesocycle-days/{meso_day_id}/progression",
          response_model=List[schemas.ProgressionRecommendation])
 def get_progression(
     meso_day_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
 ):
-    return crud.calculate_progression(db, meso_day_id)
+    return crud.calculate_progression(db, meso_day_id, current_user.id)
 
 # ═════════════════════════════════════════════════════════
 # FEEDBACK-DRIVEN PROGRESSION (Week-Level Intelligence)
 # ═════════════════════════════════════════════════════════
-@app.get("/mesocycles/{mesocycle_id}/feedback-progression",
+@router.get("/mesocycles/{mesocycle_id}/feedback-progression",
          response_model=List[schemas.ProgressionDecision])
 def get_feedback_progression(
     mesocycle_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     decisions = crud.calculate_feedback_driven_progression(db, mesocycle_id, current_user.id)
     if not decisions:
@@ -435,11 +519,11 @@ def get_feedback_progression(
         )
     return decisions
 
-@app.post("/mesocycles/{mesocycle_id}/apply-progression")
+@router.post("/mesocycles/{mesocycle_id}/apply-progression")
 def apply_feedback_progression(
     mesocycle_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     decisions = crud.calculate_feedback_driven_progression(db, mesocycle_id, current_user.id)
     if not decisions:
@@ -454,6 +538,7 @@ def apply_feedback_progression(
             status_code=400,
             detail="Could not apply — next week may not exist yet. Advance the week first."
         )
+    smart_target_cache.invalidate_user(current_user.id)
 
     return {
         "detail": f"Progression applied — {result} exercise(s) adjusted",
@@ -465,105 +550,74 @@ def apply_feedback_progression(
 # SMART PROGRESSION TARGETS
 # ═════════════════════════════════════════════════════════
 
-@app.get("/mesocycle-days/{meso_day_id}/smart-targets")
-def get_smart_targets(
+@router.get("/mesocycle-days/{meso_day_id}/smart-targets")
+async def get_smart_targets(
     meso_day_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     """
     Returns per-exercise, per-set target recommendations (shadow text values).
     Called when workout page loads to populate ghost/shadow inputs.
     """
-    # Verify ownership
-    meso_day = db.query(models.MesocycleDay).join(
-        models.MesocycleWeek
-    ).join(
-        models.Mesocycle
-    ).filter(
-        models.MesocycleDay.id == meso_day_id,
-        models.Mesocycle.user_id == current_user.id
-    ).first()
-
-    if not meso_day:
+    # Cache hits are owner-only and cost no query; a miss loads the day once,
+    # scoped to the user
+    cached = await async_crud.get_cached_smart_targets(db, meso_day_id, current_user.id)
+    if cached is None:
         raise HTTPException(status_code=404, detail="Day not found")
-
-    targets = crud.calculate_smart_progression(db, meso_day_id)
+    week_number, targets = cached
 
     return {
         "meso_day_id": meso_day_id,
-        "week_number": meso_day.mesocycle_week.week_number if hasattr(meso_day, 'mesocycle_week') and meso_day.mesocycle_week else 1,
+        "week_number": week_number,
         "targets": targets
     }
 
-@app.post("/mesocycle-days/{meso_day_id}/smart-targets")
+@router.post("/mesocycle-days/{meso_day_id}/smart-targets")
 def get_smart_targets_with_soreness(
     meso_day_id: int,
     soreness_data: dict,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     """
     Get smart progression targets with explicit soreness overrides.
     Body: {"muscle_group": "soreness_level", ...}
     """
-    meso_day = db.query(models.MesocycleDay).join(
-        models.MesocycleWeek
-    ).join(
-        models.Mesocycle
-    ).filter(
-        models.MesocycleDay.id == meso_day_id,
-        models.Mesocycle.user_id == current_user.id
-    ).first()
-
+    meso_day = db.execute(
+        crud.smart_progression_day_stmt(meso_day_id, current_user.id)
+    ).unique().scalars().first()
     if not meso_day:
         raise HTTPException(status_code=404, detail="Day not found")
 
-    targets = crud.calculate_smart_progression(db, meso_day_id, soreness_overrides=soreness_data)
+    targets = crud.calculate_smart_progression(db, meso_day_id, soreness_overrides=soreness_data,
+                                               day=meso_day)
 
     return {
         "meso_day_id": meso_day_id,
-        "week_number": meso_day.mesocycle_week.week_number if hasattr(meso_day, 'mesocycle_week') and meso_day.mesocycle_week else 1,
+        "week_number": meso_day.week.week_number,
         "targets": targets
     }
 
-@app.post("/sets/{set_log_id}/evaluate")
+@router.post("/sets/{set_log_id}/evaluate")
 def evaluate_set(
     set_log_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     """
     After logging a set, evaluate performance vs target.
     Returns: hit / improved / decreased
     """
-    sl = db.query(models.SetLog).filter(models.SetLog.id == set_log_id).first()
+    sl = crud.get_owned_set_log(db, set_log_id, current_user.id)
     if not sl:
         raise HTTPException(status_code=404, detail="Set log not found")
 
-    # Get the target for this set
-    mde = db.query(models.MesocycleDayExercise).filter(
-        models.MesocycleDayExercise.id == sl.meso_day_exercise_id
-    ).options(
-        joinedload(models.MesocycleDayExercise.meso_day)
-    ).first()
-
-    if not mde:
+    # Get the target for this set (cached per day — O(1) after the first set)
+    target = crud.get_set_target(db, sl.meso_day_exercise_id, sl.set_number, current_user.id)
+    if target is None:
         return {"verdict": "hit", "detail": "No target data"}
-
-    targets = crud.calculate_smart_progression(db, mde.meso_day_id)
-
-    # Find the matching target
-    target_weight = 0
-    target_reps = 0
-    for t in targets:
-        if t["mde_id"] == mde.id:
-            for st in t["set_targets"]:
-                if st["set_number"] == sl.set_number:
-                    target_weight = st["target_weight"]
-                    target_reps = st["target_reps"]
-                    break
-            break
+    target_weight, target_reps = target
 
     verdict = crud.evaluate_set_performance(
         target_weight, target_reps, sl.weight, sl.reps
@@ -578,11 +632,11 @@ def evaluate_set(
     }
 
 # ── Advance to next week ─────────────────────────────
-@app.post("/mesocycles/{mesocycle_id}/next-week", response_model=schemas.MesocycleResponse)
+@router.post("/mesocycles/{mesocycle_id}/next-week", response_model=schemas.MesocycleResponse)
 def advance_to_next_week(
     mesocycle_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     meso = crud.apply_progression_to_next_week(db, mesocycle_id, current_user.id)
     if not meso:
@@ -590,4 +644,28 @@ def advance_to_next_week(
             status_code=400,
             detail="Cannot advance — either mesocycle not found or not all days are completed",
         )
+    smart_target_cache.invalidate_user(current_user.id)
     return meso
+
+# ═════════════════════════════════════════════════════════
+# APP
+# ═════════════════════════════════════════════════════════
+def create_app() -> FastAPI:
+    """Build the API. Nothing connects to the database until the lifespan starts."""
+    app = FastAPI(
+        title="Iron Protocol API",
+        description="Systematic destruction. Calculated growth.",
+        lifespan=lifespan,
+    )
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.include_router(router)
+    return app
+
+
+app = create_app()
@@ -2,7 +2,7 @@
 import enum
 from sqlalchemy import (
     Column, Integer, String, Float, Boolean, ForeignKey,
-    DateTime, Enum, Text, func,
+    DateTime, Enum, Index, Text, UniqueConstraint, func, text,
 )
 from sqlalchemy.orm import declarative_base, relationship
 
@@ -45,6 +45,8 @@ class Exercise(Base):
     __tablename__ = "exercises"
 
     id = Column(Integer, primary_key=True, index=True)
+    # Stable id from the source CSV; import_exercises.py syncs on it
+    source_id = Column(String, unique=True, nullable=True)
     name = Column(String, nullable=False, index=True)
     body_part = Column(String, nullable=False, index=True)
     equipment = Column(String, nullable=True)
@@ -55,6 +57,9 @@ class Exercise(Base):
 # ═══════════════════════════════════════════════════════
 class Plan(Base):
     __tablename__ = "plans"
+    __table_args__ = (
+        Index("ix_plans_user_id", "user_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -67,6 +72,9 @@ class Plan(Base):
 
 class PlanDay(Base):
     __tablename__ = "plan_days"
+    __table_args__ = (
+        Index("ix_plan_days_plan_id_order", "plan_id", "order"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     plan_id = Column(Integer, ForeignKey("plans.id"), nullable=False)
@@ -79,6 +87,10 @@ class PlanDay(Base):
 
 class PlanDayExercise(Base):
     __tablename__ = "plan_day_exercises"
+    __table_args__ = (
+        Index("ix_plan_day_exercises_plan_day_id_order", "plan_day_id", "order"),
+        Index("ix_plan_day_exercises_exercise_id", "exercise_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     plan_day_id = Column(Integer, ForeignKey("plan_days.id"), nullable=False)
@@ -93,6 +105,11 @@ class PlanDayExercise(Base):
 # ═══════════════════════════════════════════════════════
 class Mesocycle(Base):
     __tablename__ = "mesocycles"
+    __table_args__ = (
+        # Ownership checks and the newest-first mesocycle list
+        Index("ix_mesocycles_user_id_started_at", "user_id", "started_at"),
+        Index("ix_mesocycles_plan_id", "plan_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -109,6 +126,10 @@ class Mesocycle(Base):
 
 class MesocycleWeek(Base):
     __tablename__ = "mesocycle_weeks"
+    __table_args__ = (
+        # Weeks are looked up by (mesocycle, week number) and expected to be unique
+        UniqueConstraint("mesocycle_id", "week_number", name="uq_mesocycle_weeks_mesocycle_week"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     mesocycle_id = Column(Integer, ForeignKey("mesocycles.id"), nullable=False)
@@ -120,6 +141,13 @@ class MesocycleWeek(Base):
 
 class MesocycleDay(Base):
     __tablename__ = "mesocycle_days"
+    __table_args__ = (
+        Index("ix_mesocycle_days_week_id_day_order", "week_id", "day_order"),
+        # The current workout is the first day of the week that is still open
+        Index("ix_mesocycle_days_open", "week_id", "day_order",
+              postgresql_where=text("is_completed = false")),
+        Index("ix_mesocycle_days_plan_day_id", "plan_day_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     week_id = Column(Integer, ForeignKey("mesocycle_weeks.id"), nullable=False)
@@ -131,14 +159,23 @@ class MesocycleDay(Base):
     plan_day = relationship("PlanDay")
     exercises = relationship("MesocycleDayExercise", back_populates="meso_day",
                              cascade="all, delete-orphan", order_by="MesocycleDayExercise.exercise_order")
-    feedbacks = relationship("Feedback", back_populates="meso_day", cascade="all, delete-orphan")
+    feedbacks = relationship("Feedback", back_populates="meso_day", cascade="all, delete-orphan",
+                             order_by="Feedback.id")
 
 class MesocycleDayExercise(Base):
     __tablename__ = "mesocycle_day_exercises"
+    __table_args__ = (
+        Index("ix_mesocycle_day_exercises_meso_day_id_order", "meso_day_id", "exercise_order"),
+        Index("ix_mesocycle_day_exercises_exercise_id", "exercise_id"),
+        # Per-user history and previous-session lookups, newest occurrence first
+        Index("ix_mesocycle_day_exercises_user_exercise", "user_id", "exercise_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     meso_day_id = Column(Integer, ForeignKey("mesocycle_days.id"), nullable=False)
     exercise_id = Column(Integer, ForeignKey("exercises.id"), nullable=False)
+    # Owner of the mesocycle, copied down so history needn't join up to it
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     exercise_order = Column(Integer, nullable=False)
     prescribed_sets = Column(Integer, nullable=False, default=2)
     prescribed_reps = Column(Integer, nullable=True)
@@ -154,9 +191,18 @@ class MesocycleDayExercise(Base):
 # ═══════════════════════════════════════════════════════
 class SetLog(Base):
     __tablename__ = "set_logs"
+    __table_args__ = (
+        # One row per set; bulk logging upserts against this
+        UniqueConstraint("meso_day_exercise_id", "set_number", name="uq_set_logs_mde_set"),
+        # Last logged weight per exercise: a backward range scan per (user, exercise)
+        Index("ix_set_logs_user_exercise_logged_at", "user_id", "exercise_id", "logged_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     meso_day_exercise_id = Column(Integer, ForeignKey("mesocycle_day_exercises.id"), nullable=False)
+    # Copied from the MesocycleDayExercise on insert (see crud.upsert_set_logs_stmt)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    exercise_id = Column(Integer, ForeignKey("exercises.id"), nullable=False)
     set_number = Column(Integer, nullable=False)
     weight = Column(Float, nullable=False)
     reps = Column(Integer, nullable=False)
@@ -164,8 +210,33 @@ class SetLog(Base):
 
     meso_day_exercise = relationship("MesocycleDayExercise", back_populates="set_logs")
 
+class ExercisePerformance(Base):
+    """
+    Latest and best logged performance per user and exercise, kept current
+    by app.crud in the same transaction as the set logs and day completions
+    it summarizes, so autofill and smart targets need no history scan.
+    """
+    __tablename__ = "exercise_performance"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    exercise_id = Column(Integer, ForeignKey("exercises.id"), primary_key=True)
+    # Newest non-zero set by (logged_at, id), the order autofill always used
+    last_weight = Column(Float, nullable=True)
+    last_reps = Column(Integer, nullable=True)
+    last_logged_at = Column(DateTime(timezone=True), nullable=True)
+    last_set_log_id = Column(Integer, nullable=True)
+    best_e1rm = Column(Float, nullable=True)
+    # Newest occurrence of the exercise on a completed day: the previous session
+    last_completed_mde_id = Column(
+        Integer, ForeignKey("mesocycle_day_exercises.id", ondelete="SET NULL"), nullable=True
+    )
+
 class Feedback(Base):
     __tablename__ = "feedbacks"
+    __table_args__ = (
+        # One feedback per muscle group per day; create_feedback() updates it in place
+        UniqueConstraint("meso_day_id", "muscle_group", name="uq_feedbacks_day_muscle_group"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     meso_day_id = Column(Integer, ForeignKey("mesocycle_days.id"), nullable=False)
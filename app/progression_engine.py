@@ -0,0 +1,517 @@
+# app/progression_engine.py
+"""
+Pure, DB-free progression engine.
+
+Columnar implementation of the double-progression rules: every function
+takes NumPy arrays (or anything array-like) and evaluates the whole batch
+in one pass, so targets for a day, a week or a cohort of users cost the
+same number of Python-level operations.
+
+States and actions travel as small integer codes; the human-readable
+reason for a target is only rendered when someone asks for it.
+
+Each batch function has a pure-Python single-row twin (recovery_code,
+stimulus_code, next_weight_step, set_target) for callers that handle one
+set at a time, such as the scalar helpers in app.crud; NumPy's per-call
+overhead would dominate there. Both forms share the thresholds, codes,
+ladders and reason text below, and must agree row for row.
+"""
+import numpy as np
+
+from app.equipment import (
+    DEFAULT_LADDERS,
+    DUMBBELL,
+    OTHER,
+    DUMBBELL_WEIGHTS_KG,
+    MIN_BARBELL_INCREMENT_KG,
+    MIN_DUMBBELL_INCREMENT_KG,
+    round_1,
+)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CONFIGURATION
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Weight progression
+# (equipment increments and the dumbbell rack live in app.equipment)
+WEEKLY_WEIGHT_INCREMENT_PCT = 0.025   # 2.5% target weekly increase
+MAX_JUMP_MULTIPLIER = 2.5             # A jump > 2.5× the target % is too aggressive
+
+# Rep ranges for hypertrophy
+DEFAULT_REP_FLOOR = 8
+DEFAULT_REP_CEILING = 12
+ABSOLUTE_REP_CAP = 20  # Never prescribe more than this
+
+# Volume limits
+MIN_SETS_PER_EXERCISE = 2
+MAX_SETS_PER_EXERCISE = 6
+
+# Feedback thresholds
+SORENESS_OVERTRAINED_THRESHOLD = 2.5
+SORENESS_UNDER_RECOVERED_THRESHOLD = 1.5
+SORENESS_FULLY_RECOVERED_THRESHOLD = 0.5
+
+DELOAD_WEIGHT_REDUCTION = 0.10  # 10% weight reduction on deload
+
+
+# Below this many rows the single-row functions beat the batch path, whose
+# fixed NumPy overhead is several hundred µs (a whole workout day is ~30 sets)
+BATCH_MIN_ROWS = 256
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CODES
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Recovery state
+OVERTRAINED, UNDER_RECOVERED, MOSTLY_RECOVERED, FULLY_RECOVERED = range(4)
+RECOVERY_STATES = ("overtrained", "under_recovered", "mostly_recovered", "fully_recovered")
+RECOVERY_CODES = {name: code for code, name in enumerate(RECOVERY_STATES)}
+
+# Stimulus quality
+INSUFFICIENT, OPTIMAL, EXCESSIVE = range(3)
+STIMULUS_QUALITIES = ("insufficient", "optimal", "excessive")
+STIMULUS_CODES = {name: code for code, name in enumerate(STIMULUS_QUALITIES)}
+
+# Set target action
+INITIALIZE, DELOAD, MAINTAIN, INCREASE_WEIGHT, INCREASE_REPS, FORCE_WEIGHT_INCREASE = range(6)
+ACTIONS = ("initialize", "deload", "maintain", "increase_weight",
+           "increase_reps", "force_weight_increase")
+
+# Outcome of a weight-increase attempt
+STEP_OK, STEP_NO_DATA, STEP_AT_MAX, STEP_TOO_LARGE = range(4)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CLASSIFICATION
+# ═══════════════════════════════════════════════════════════════════════════
+
+def recovery_code(avg_soreness: float) -> int:
+    """Single-row classify_recovery_states()."""
+    if avg_soreness >= SORENESS_OVERTRAINED_THRESHOLD:
+        return OVERTRAINED
+    if avg_soreness >= SORENESS_UNDER_RECOVERED_THRESHOLD:
+        return UNDER_RECOVERED
+    if avg_soreness >= SORENESS_FULLY_RECOVERED_THRESHOLD:
+        return MOSTLY_RECOVERED
+    return FULLY_RECOVERED
+
+
+def _stimulus_score(pump, volume):
+    return pump / 3.0 + ((volume + 1) / 2.0) * 0.5
+
+
+def stimulus_code(avg_pump: float, avg_volume_feeling: float) -> int:
+    """Single-row classify_stimulus_qualities()."""
+    score = _stimulus_score(avg_pump, avg_volume_feeling)
+    if score < 0.5:
+        return INSUFFICIENT
+    return OPTIMAL if score <= 1.0 else EXCESSIVE
+
+
+def classify_recovery_states(avg_soreness) -> np.ndarray:
+    """
+    Recovery state codes from average soreness scores (0-3 scale).
+
+        >= 2.5 → OVERTRAINED, >= 1.5 → UNDER_RECOVERED,
+        >= 0.5 → MOSTLY_RECOVERED, else FULLY_RECOVERED
+    """
+    s = np.asarray(avg_soreness, dtype=np.float64)
+    return np.select(
+        [s >= SORENESS_OVERTRAINED_THRESHOLD,
+         s >= SORENESS_UNDER_RECOVERED_THRESHOLD,
+         s >= SORENESS_FULLY_RECOVERED_THRESHOLD],
+        [OVERTRAINED, UNDER_RECOVERED, MOSTLY_RECOVERED],
+        default=FULLY_RECOVERED,
+    ).astype(np.int8)
+
+
+def classify_stimulus_qualities(avg_pump, avg_volume_feeling) -> np.ndarray:
+    """
+    Stimulus quality codes from pump (0-3) and volume feeling (-1..+1).
+
+    Pump dominates, volume feeling modulates:
+        score = pump/3 + 0.5 × (volume+1)/2   → 0 (nothing) … ~1.5 (maximum)
+        < 0.5 → INSUFFICIENT, <= 1.0 → OPTIMAL, else EXCESSIVE
+    """
+    pump = np.asarray(avg_pump, dtype=np.float64)
+    volume = np.asarray(avg_volume_feeling, dtype=np.float64)
+    score = _stimulus_score(pump, volume)
+    return np.select(
+        [score < 0.5, score <= 1.0],
+        [INSUFFICIENT, OPTIMAL],
+        default=EXCESSIVE,
+    ).astype(np.int8)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# WEIGHT STEPS
+# ═══════════════════════════════════════════════════════════════════════════
+
+class WeightSteps:
+    """
+    Result of next_available_weights().
+
+    Columns:
+        next_weight  — weight to prescribe (current weight if not achievable)
+        can_achieve  — True where the increase is reasonable
+        status       — STEP_* code explaining the outcome
+        candidate    — the equipment weight that was considered
+        increment_pct — candidate jump as a fraction of the current weight
+        equipment    — equipment class code (app.equipment)
+    """
+
+    __slots__ = ("next_weight", "can_achieve", "status", "candidate",
+                 "increment_pct", "equipment", "max_pct", "ladders")
+
+    def __init__(self, next_weight, can_achieve, status, candidate,
+                 increment_pct, equipment, max_pct, ladders):
+        self.next_weight = next_weight
+        self.can_achieve = can_achieve
+        self.status = status
+        self.candidate = candidate
+        self.increment_pct = increment_pct
+        self.equipment = equipment
+        self.max_pct = max_pct
+        self.ladders = ladders
+
+    def __len__(self):
+        return len(self.next_weight)
+
+    def reason(self, i: int) -> str:
+        return _step_reason(int(self.status[i]), int(self.equipment[i]),
+                            float(self.candidate[i]), float(self.increment_pct[i]),
+                            self.max_pct, self.ladders)
+
+
+def _step_reason(status, equipment, candidate, pct, max_pct, ladders) -> str:
+    if status == STEP_NO_DATA:
+        return "No prior weight data"
+    if status == STEP_AT_MAX:
+        return f"At maximum {ladders[equipment].label} weight"
+
+    if equipment == DUMBBELL:
+        if status == STEP_TOO_LARGE:
+            return (
+                f"Next dumbbell ({candidate}kg) requires {pct:.1%} "
+                f"increase, exceeds safe threshold of {max_pct:.1%}"
+            )
+        return f"Progressing to {candidate}kg dumbbell ({pct:.1%} increase)"
+
+    if status == STEP_TOO_LARGE:
+        return (
+            f"Weight jump of {pct:.1%} exceeds "
+            f"safe threshold of {max_pct:.1%}"
+        )
+    return f"Progressing to {candidate}kg ({pct:.1%} increase)"
+
+
+def _by_equipment(equipment, columns, fn, out_dtypes):
+    """
+    Apply fn(code, *column_slices) to the rows of each equipment class and
+    scatter the returned columns back into full-length arrays.
+    """
+    outs = [np.empty(equipment.shape, dtype=dt) for dt in out_dtypes]
+    for code in np.unique(equipment):
+        rows = equipment == code
+        results = fn(int(code), *(c[rows] for c in columns))
+        for out, res in zip(outs, results):
+            out[rows] = res
+    return outs
+
+
+def next_available_weights(
+    current_weight,
+    equipment,
+    target_increment_pct: float = WEEKLY_WEIGHT_INCREMENT_PCT,
+    ladders=DEFAULT_LADDERS,
+) -> WeightSteps:
+    """
+    Next available weight for each row, respecting equipment constraints.
+
+    Each row is snapped onto its equipment's weight ladder (binary search,
+    one pass per equipment class present): dumbbells to the next rack
+    weight at or above the target, barbells / machines / cables to the
+    nearest achievable load, always strictly above the current weight.
+    Equipment without a ladder (OTHER) moves in whole 2.5 kg plate
+    increments, at least one. A jump larger than MAX_JUMP_MULTIPLIER × the
+    target percentage is reported as not achievable and the current
+    weight is kept.
+
+    Args:
+        current_weight: Current working weight per row
+        equipment: Equipment class code per row (broadcasts); booleans are
+                   accepted as the legacy is_dumbbell flag
+        target_increment_pct: Target weekly weight increase
+        ladders: EquipmentLadders to snap onto (defaults to the configured gym)
+    """
+    current = np.atleast_1d(np.asarray(current_weight, dtype=np.float64))
+    equip = np.broadcast_to(np.asarray(equipment, dtype=np.int8), current.shape)
+    max_pct = target_increment_pct * MAX_JUMP_MULTIPLIER
+
+    target_weight = current + current * target_increment_pct
+    candidate, ladder_at_max = _by_equipment(
+        equip, (current, target_weight),
+        lambda code, cur, tgt: ladders[code].progress(cur, tgt),
+        (np.float64, bool),
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        increment_pct = np.where(current > 0, (candidate - current) / current, 0.0)
+
+    no_data = current <= 0
+    at_max = ladder_at_max & ~no_data
+    too_large = ~no_data & ~at_max & (increment_pct > max_pct)
+    can_achieve = ~(no_data | at_max | too_large)
+
+    status = np.select(
+        [no_data, at_max, too_large],
+        [STEP_NO_DATA, STEP_AT_MAX, STEP_TOO_LARGE],
+        default=STEP_OK,
+    ).astype(np.int8)
+    next_weight = np.where(
+        can_achieve,
+        np.where(equip == OTHER, np.round(candidate, 1), candidate),
+        current,
+    )
+    return WeightSteps(next_weight, can_achieve, status, candidate,
+                       increment_pct, equip, max_pct, ladders)
+
+
+def next_weight_step(
+    current_weight: float,
+    equipment: int,
+    target_increment_pct: float = WEEKLY_WEIGHT_INCREMENT_PCT,
+    ladders=DEFAULT_LADDERS,
+) -> tuple:
+    """
+    Single-row next_available_weights().
+
+    Returns (next_weight, can_achieve, reason), the shape of
+    crud.get_next_available_weight().
+    """
+    current = float(current_weight)
+    equipment = int(equipment)
+    max_pct = target_increment_pct * MAX_JUMP_MULTIPLIER
+    if current <= 0:
+        return current, False, _step_reason(STEP_NO_DATA, equipment, 0.0, 0.0, max_pct, ladders)
+
+    candidate, at_max = ladders[equipment].progress(
+        current, current + current * target_increment_pct)
+    increment_pct = (candidate - current) / current
+    if at_max:
+        status = STEP_AT_MAX
+    elif increment_pct > max_pct:
+        status = STEP_TOO_LARGE
+    else:
+        status = STEP_OK
+    reason = _step_reason(status, equipment, candidate, increment_pct, max_pct, ladders)
+    if status != STEP_OK:
+        return current, False, reason
+    return (round_1(candidate) if equipment == OTHER else candidate), True, reason
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SET TARGETS (DOUBLE PROGRESSION)
+# ═══════════════════════════════════════════════════════════════════════════
+
+class SetTargets:
+    """
+    Result of compute_set_targets().
+
+    target_weight / target_reps / action are plain arrays; reasons are
+    rendered per row on demand with reason(i) or reasons().
+    """
+
+    __slots__ = ("target_weight", "target_reps", "action", "last_weight",
+                 "last_reps", "steps", "rep_floor", "rep_ceiling")
+
+    def __init__(self, target_weight, target_reps, action, last_weight,
+                 last_reps, steps, rep_floor, rep_ceiling):
+        self.target_weight = target_weight
+        self.target_reps = target_reps
+        self.action = action
+        self.last_weight = last_weight
+        self.last_reps = last_reps
+        self.steps = steps
+        self.rep_floor = rep_floor
+        self.rep_ceiling = rep_ceiling
+
+    def __len__(self):
+        return len(self.action)
+
+    def action_name(self, i: int) -> str:
+        return ACTIONS[self.action[i]]
+
+    def reason(self, i: int) -> str:
+        action = self.action[i]
+        return _target_reason(
+            action, float(self.last_weight[i]), int(self.last_reps[i]),
+            float(self.target_weight[i]), int(self.target_reps[i]),
+            self.steps.reason(i) if action in (INCREASE_WEIGHT, INCREASE_REPS) else None,
+            self.rep_floor, self.rep_ceiling,
+        )
+
+    def reasons(self) -> list:
+        return [self.reason(i) for i in range(len(self))]
+
+    def record(self, i: int) -> dict:
+        """Row i in the dict shape returned by crud.calculate_set_target()."""
+        return {
+            "target_weight": float(self.target_weight[i]),
+            "target_reps": int(self.target_reps[i]),
+            "action": self.action_name(i),
+            "reason": self.reason(i),
+        }
+
+
+def _target_reason(action, last_weight, last_reps, target_weight, target_reps,
+                   step_reason, rep_floor, rep_ceiling) -> str:
+    if action == INITIALIZE:
+        return "No prior data — using defaults"
+    if action == DELOAD:
+        return (
+            f"Overtrained — deloading weight by {DELOAD_WEIGHT_REDUCTION:.0%} "
+            f"({last_weight}→{target_weight}kg) and resetting reps to {rep_floor}"
+        )
+    if action == MAINTAIN:
+        return (
+            "Under-recovered — maintaining current prescription "
+            f"({last_weight}kg × {last_reps}) to allow adaptation"
+        )
+    if action == INCREASE_WEIGHT:
+        return (
+            f"{step_reason}. "
+            f"Reps adjusted to {target_reps} to accommodate heavier load."
+        )
+    if action == INCREASE_REPS:
+        return (
+            f"Weight increment not achievable ({step_reason}). "
+            f"Adding 1 rep ({last_reps}→{target_reps}) at {last_weight}kg instead."
+        )
+    return (
+        f"Reps hit ceiling ({rep_ceiling}). Forcing weight increase to "
+        f"{target_weight}kg and resetting reps to {rep_floor}. "
+        f"This is the double progression reset point."
+    )
+
+
+def compute_set_targets(
+    last_weight,
+    last_reps,
+    equipment,
+    recovery_state,
+    rep_floor: int = DEFAULT_REP_FLOOR,
+    rep_ceiling: int = DEFAULT_REP_CEILING,
+    target_increment_pct: float = WEEKLY_WEIGHT_INCREMENT_PCT,
+    ladders=DEFAULT_LADDERS,
+) -> SetTargets:
+    """
+    Double-progression targets for a batch of sets.
+
+    Per row, in priority order:
+        1. No usable history            → INITIALIZE at the rep floor
+        2. OVERTRAINED                  → DELOAD by 10%, snapped down to
+                                          valid equipment, reps to floor
+        3. UNDER_RECOVERED              → MAINTAIN last weight × reps
+        4. Weight jump achievable       → INCREASE_WEIGHT, reps may drop 1
+        5. Reps below ceiling           → INCREASE_REPS by 1
+        6. Reps at ceiling              → FORCE_WEIGHT_INCREASE, reps to floor
+
+    Args:
+        last_weight: Weight used last session per set
+        last_reps: Reps completed last session per set
+        equipment: Equipment class code per set (broadcasts); booleans
+                   are accepted as the legacy is_dumbbell flag
+        recovery_state: Recovery code per set (broadcasts)
+        rep_floor / rep_ceiling: Target rep range
+        target_increment_pct: Target weekly weight increase
+        ladders: EquipmentLadders to snap onto (defaults to the configured gym)
+    """
+    lw = np.atleast_1d(np.asarray(last_weight, dtype=np.float64))
+    lr = np.atleast_1d(np.asarray(last_reps, dtype=np.int64))
+    equip = np.broadcast_to(np.asarray(equipment, dtype=np.int8), lw.shape)
+    recovery = np.broadcast_to(np.asarray(recovery_state, dtype=np.int8), lw.shape)
+
+    steps = next_available_weights(lw, equip, target_increment_pct, ladders)
+
+    # ── Deload: 10% off, snapped down to a valid weight;
+    #    Forced jump at the rep ceiling: next load up ──
+    deload, forced = _by_equipment(
+        equip, (np.round(lw * (1 - DELOAD_WEIGHT_REDUCTION), 1), lw),
+        lambda code, reduced, cur: (ladders[code].deload(reduced), ladders[code].force(cur)),
+        (np.float64, np.float64),
+    )
+
+    # When weight goes up, allow reps to drop by 1 to accommodate
+    heavier_reps = np.where(lr > rep_floor + 1, np.maximum(rep_floor, lr - 1), lr)
+
+    no_data = (lw <= 0) | (lr <= 0)
+    conditions = [
+        no_data,
+        recovery == OVERTRAINED,
+        recovery == UNDER_RECOVERED,
+        steps.can_achieve,
+        lr < rep_ceiling,
+    ]
+    action = np.select(
+        conditions,
+        [INITIALIZE, DELOAD, MAINTAIN, INCREASE_WEIGHT, INCREASE_REPS],
+        default=FORCE_WEIGHT_INCREASE,
+    ).astype(np.int8)
+    target_weight = np.select(
+        conditions,
+        [lw, deload, lw, steps.next_weight, lw],
+        default=forced,
+    )
+    target_reps = np.select(
+        conditions,
+        [rep_floor, rep_floor, lr, heavier_reps, lr + 1],
+        default=rep_floor,
+    )
+    return SetTargets(target_weight, target_reps, action, lw, lr, steps,
+                      rep_floor, rep_ceiling)
+
+
+def set_target(
+    last_weight: float,
+    last_reps: int,
+    equipment: int,
+    recovery_state: int,
+    rep_floor: int = DEFAULT_REP_FLOOR,
+    rep_ceiling: int = DEFAULT_REP_CEILING,
+    target_increment_pct: float = WEEKLY_WEIGHT_INCREMENT_PCT,
+    ladders=DEFAULT_LADDERS,
+) -> dict:
+    """Single-row compute_set_targets(), as SetTargets.record()."""
+    lw, lr = float(last_weight), int(last_reps)
+    ladder = ladders[int(equipment)]
+    step_reason = None
+
+    if lw <= 0 or lr <= 0:
+        action, target_weight, target_reps = INITIALIZE, lw, rep_floor
+    elif recovery_state == OVERTRAINED:
+        action, target_reps = DELOAD, rep_floor
+        target_weight = ladder.deload(round_1(lw * (1 - DELOAD_WEIGHT_REDUCTION)))
+    elif recovery_state == UNDER_RECOVERED:
+        action, target_weight, target_reps = MAINTAIN, lw, lr
+    else:
+        next_weight, can_achieve, step_reason = next_weight_step(
+            lw, equipment, target_increment_pct, ladders)
+        if can_achieve:
+            action, target_weight = INCREASE_WEIGHT, next_weight
+            target_reps = max(rep_floor, lr - 1) if lr > rep_floor + 1 else lr
+        elif lr < rep_ceiling:
+            action, target_weight, target_reps = INCREASE_REPS, lw, lr + 1
+        else:
+            action, target_weight, target_reps = FORCE_WEIGHT_INCREASE, ladder.force(lw), rep_floor
+
+    target_weight, target_reps = float(target_weight), int(target_reps)
+    return {
+        "target_weight": target_weight,
+        "target_reps": target_reps,
+        "action": ACTIONS[action],
+        "reason": _target_reason(action, lw, lr, target_weight, target_reps,
+                                 step_reason, rep_floor, rep_ceiling),
+    }
@@ -1,5 +1,5 @@
 # app/schemas.py
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 from datetime import datetime
 from typing import Optional, List
 from enum import Enum
@@ -89,8 +89,13 @@ class MesocycleCreate(BaseModel):
     name: str
 
 # -- SetLog --
+# Every logged or skipped set becomes one upserted row (~4 bind parameters),
+# so set numbers and bulk request sizes are bounded
+MAX_SET_NUMBER = 50
+MAX_SKIP_EXERCISES = 50
+
 class SetLogCreate(BaseModel):
-    set_number: int
+    set_number: int = Field(ge=1, le=MAX_SET_NUMBER)
     weight: float
     reps: int
 
@@ -104,10 +109,35 @@ class SetLogResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class BulkSetLogCreate(BaseModel):
+    sets: List[SetLogCreate] = Field(max_length=MAX_SET_NUMBER)
+
+class ExerciseSetLogs(BaseModel):
+    mde_id: int
+    sets: List[SetLogCreate] = Field(max_length=MAX_SET_NUMBER)
+
+class DaySetLogCreate(BaseModel):
+    exercises: List[ExerciseSetLogs] = Field(max_length=MAX_SKIP_EXERCISES)
+
+class DaySetLogResponse(SetLogResponse):
+    meso_day_exercise_id: int
+
 # -- Skip Sets --
 class SkipSetsRequest(BaseModel):
-    from_set: int
-    to_set: int
+    from_set: int = Field(ge=1, le=MAX_SET_NUMBER)
+    to_set: int = Field(ge=1, le=MAX_SET_NUMBER)
+
+    @model_validator(mode="after")
+    def check_range(self):
+        if self.to_set < self.from_set:
+            raise ValueError("to_set must be >= from_set")
+        return self
+
+class ExerciseSkipSets(SkipSetsRequest):
+    mde_id: int
+
+class DaySkipSetsRequest(BaseModel):
+    exercises: List[ExerciseSkipSets] = Field(max_length=MAX_SKIP_EXERCISES)
 
 # -- Add Note --
 class ExerciseNoteRequest(BaseModel):
@@ -175,6 +205,14 @@ class MesocycleDayResponse(BaseModel):
     class Config:
         from_attributes = True
 
+# -- Workout bundle (current day + smart targets) --
+class WorkoutBundleResponse(BaseModel):
+    mesocycle_id: int
+    week_number: int
+    day_name: Optional[str] = None
+    day: MesocycleDayResponse
+    targets: List[dict] = []
+
 # -- MesocycleWeek --
 class MesocycleWeekResponse(BaseModel):
     id: int
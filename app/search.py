@@ -0,0 +1,191 @@
+# app/search.py
+"""
+In-process exercise search for the ExercisePicker autocomplete.
+
+The catalog is small and read-only after import, so instead of an
+``ILIKE '%term%'`` scan per keystroke, searches run against an index built
+from the whole ``exercises`` table:
+
+    - a prefix trie over name tokens ("ben pre" → "bench press")
+    - trigram fuzzy matching for tokens with no prefix hit ("bech" → "bench")
+    - posting sets per body_part / target / equipment for filtering
+
+Indexes are immutable and belong to a CatalogSnapshot (app/catalog.py),
+which builds one on first search; a catalog change means a new snapshot.
+"""
+import heapq
+import re
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from app.catalog import CatalogExercise
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Relevance weights per query token
+EXACT_WEIGHT = 1.0
+PREFIX_WEIGHT = 0.7            # + up to 0.3 as the prefix covers more of the token
+FUZZY_WEIGHT = 0.6             # × trigram similarity
+FUZZY_MIN_SIMILARITY = 0.45
+FUZZY_MIN_TOKEN_LEN = 3
+PHRASE_PREFIX_BONUS = 0.5      # whole query is a prefix of the name
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def trigrams(token: str) -> Set[str]:
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# ═══════════════════════════════════════════════════════
+# INDEX
+# ═══════════════════════════════════════════════════════
+
+class _TrieNode:
+    __slots__ = ("children", "tokens")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.tokens: List[int] = []        # vocabulary ids of every token below
+
+
+class ExerciseSearchIndex:
+    """Immutable search index over a snapshot of the exercise catalog."""
+
+    def __init__(self, exercises: Iterable["CatalogExercise"]):
+        self.exercises: List["CatalogExercise"] = sorted(exercises, key=lambda e: (e.name.lower(), e.id))
+        self._lower_names = [e.name.lower() for e in self.exercises]
+        self._name_lens = [len(e.name) for e in self.exercises]
+
+        vocab: Dict[str, int] = {}
+        self._token_docs: List[Set[int]] = []
+        for doc, ex in enumerate(self.exercises):
+            for token in tokenize(ex.name):
+                tid = vocab.setdefault(token, len(vocab))
+                if tid == len(self._token_docs):
+                    self._token_docs.append(set())
+                self._token_docs[tid].add(doc)
+        self._vocab = vocab
+        self._tokens = list(vocab)
+
+        self._trie = _TrieNode()
+        for token, tid in vocab.items():
+            node = self._trie
+            for ch in token:
+                node = node.children.setdefault(ch, _TrieNode())
+                node.tokens.append(tid)
+
+        self._trigram_tokens: Dict[str, List[int]] = {}
+        self._token_trigram_counts = []
+        for token, tid in vocab.items():
+            grams = trigrams(token)
+            self._token_trigram_counts.append(len(grams))
+            for gram in grams:
+                self._trigram_tokens.setdefault(gram, []).append(tid)
+
+        self._filters: Dict[str, Dict[str, Set[int]]] = {
+            field: {} for field in ("body_part", "target", "equipment")
+        }
+        for doc, ex in enumerate(self.exercises):
+            for field, values in self._filters.items():
+                value = getattr(ex, field)
+                if value:
+                    values.setdefault(value.lower(), set()).add(doc)
+
+    def __len__(self) -> int:
+        return len(self.exercises)
+
+    # ── Matching ─────────────────────────────────────
+    def _prefix_tokens(self, prefix: str) -> List[int]:
+        node = self._trie
+        for ch in prefix:
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        return node.tokens
+
+    def _fuzzy_tokens(self, token: str) -> List[Tuple[int, float]]:
+        if len(token) < FUZZY_MIN_TOKEN_LEN:
+            return []
+        grams = trigrams(token)
+        shared: Dict[int, int] = {}
+        for gram in grams:
+            for tid in self._trigram_tokens.get(gram, ()):
+                shared[tid] = shared.get(tid, 0) + 1
+        matches = []
+        for tid, n in shared.items():
+            similarity = 2 * n / (len(grams) + self._token_trigram_counts[tid])
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                matches.append((tid, similarity))
+        return matches
+
+    def _token_scores(self, query_token: str) -> Dict[int, float]:
+        """Best score per document for one query token."""
+        candidates: List[Tuple[int, float]] = []
+        for tid in self._prefix_tokens(query_token):
+            token = self._tokens[tid]
+            if token == query_token:
+                candidates.append((tid, EXACT_WEIGHT))
+            else:
+                candidates.append((tid, PREFIX_WEIGHT + 0.3 * len(query_token) / len(token)))
+        if not candidates:
+            candidates = [(tid, FUZZY_WEIGHT * sim) for tid, sim in self._fuzzy_tokens(query_token)]
+
+        scores: Dict[int, float] = {}
+        for tid, score in candidates:
+            for doc in self._token_docs[tid]:
+                if score > scores.get(doc, 0.0):
+                    scores[doc] = score
+        return scores
+
+    def _filtered(self, body_part, target, equipment) -> Optional[Set[int]]:
+        """Documents passing every filter, or None when there are no filters."""
+        allowed: Optional[Set[int]] = None
+        for field, value in (("body_part", body_part), ("target", target),
+                             ("equipment", equipment)):
+            if value:
+                docs = self._filters[field].get(value.lower(), set())
+                allowed = docs if allowed is None else allowed & docs
+        return allowed
+
+    # ── Public API ───────────────────────────────────
+    def search(self, query: Optional[str] = None, body_part: Optional[str] = None,
+               target: Optional[str] = None, equipment: Optional[str] = None,
+               skip: int = 0, limit: int = 50) -> List["CatalogExercise"]:
+        """
+        Exercises matching every query token (prefix, else fuzzy), ranked by
+        relevance; without a query, all exercises passing the filters by name.
+        Filters are case-insensitive exact matches, like the old ILIKE ones.
+        """
+        allowed = self._filtered(body_part, target, equipment)
+        query_tokens = tokenize(query or "")
+
+        if not query_tokens:
+            docs = range(len(self.exercises)) if allowed is None else sorted(allowed)
+            return [self.exercises[d] for d in list(docs)[skip:skip + limit]]
+
+        # Rarest token first keeps the running intersection small
+        per_token = sorted((self._token_scores(t) for t in query_tokens), key=len)
+        scores = dict(per_token[0])
+        if allowed is not None:
+            scores = {d: s for d, s in scores.items() if d in allowed}
+        for token_scores in per_token[1:]:
+            scores = {d: s + token_scores[d] for d, s in scores.items() if d in token_scores}
+            if not scores:
+                return []
+
+        phrase = " ".join(query_tokens)
+        ranked = heapq.nsmallest(
+            skip + limit,
+            scores.items(),
+            key=lambda item: (
+                -(item[1] + (PHRASE_PREFIX_BONUS
+                             if self._lower_names[item[0]].startswith(phrase) else 0.0)),
+                self._name_lens[item[0]],
+                item[0],
+            ),
+        )
+        return [self.exercises[d] for d, _ in ranked[skip:]]
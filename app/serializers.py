@@ -0,0 +1,91 @@
+# app/serializers.py
+"""
+Hand-written response serializers for the large read endpoints.
+
+These build plain dicts straight from loaded ORM objects. Collections are
+expected to arrive already ordered (relationship order_by), so nothing is
+re-sorted here; pair them with loaders that use selectinload. Exercise
+details come from a catalog snapshot (app/catalog.py) covering every
+exercise_id involved, so loaders don't join the exercises table.
+"""
+
+
+def _enum_val(field):
+    return field.value if hasattr(field, 'value') else field
+
+
+def _isoformat(dt):
+    return dt.isoformat() if dt else None
+
+
+def serialize_set_log(sl) -> dict:
+    return {
+        "id": sl.id,
+        "set_number": sl.set_number,
+        "weight": sl.weight,
+        "reps": sl.reps,
+        "logged_at": _isoformat(sl.logged_at),
+    }
+
+
+def serialize_feedback(fb) -> dict:
+    return {
+        "id": fb.id,
+        "muscle_group": fb.muscle_group,
+        "soreness": _enum_val(fb.soreness),
+        "pump": _enum_val(fb.pump),
+        "volume_feeling": _enum_val(fb.volume_feeling),
+        "notes": fb.notes,
+    }
+
+
+def serialize_day_exercise(mde, catalog) -> dict:
+    ex = catalog[mde.exercise_id]
+    return {
+        "id": mde.id,
+        "exercise_id": mde.exercise_id,
+        "exercise_order": mde.exercise_order,
+        "prescribed_sets": mde.prescribed_sets,
+        "prescribed_reps": mde.prescribed_reps,
+        "note": mde.note,
+        "exercise": {
+            "id": ex.id,
+            "name": ex.name,
+            "body_part": ex.body_part,
+            "equipment": ex.equipment,
+            "target": ex.target,
+        },
+        "set_logs": [serialize_set_log(sl) for sl in mde.set_logs],
+    }
+
+
+def serialize_day(day, catalog) -> dict:
+    return {
+        "id": day.id,
+        "plan_day_id": day.plan_day_id,
+        "day_order": day.day_order,
+        "is_completed": day.is_completed,
+        "day_name": day.plan_day.name if day.plan_day else f"Day {day.day_order}",
+        "exercises": [serialize_day_exercise(mde, catalog) for mde in day.exercises],
+        "feedbacks": [serialize_feedback(fb) for fb in day.feedbacks],
+    }
+
+
+def serialize_mesocycle_detail(meso, catalog) -> dict:
+    """GET /mesocycles/{id} payload from crud.get_mesocycle_detail()."""
+    return {
+        "id": meso.id,
+        "plan_id": meso.plan_id,
+        "name": meso.name,
+        "current_week": meso.current_week,
+        "is_active": meso.is_active,
+        "started_at": _isoformat(meso.started_at),
+        "weeks": [
+            {
+                "id": week.id,
+                "week_number": week.week_number,
+                "days": [serialize_day(day, catalog) for day in week.days],
+            }
+            for week in meso.weeks
+        ],
+    }
@@ -1,10 +1,44 @@
 # app/utils.py
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from app.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS
+from passlib.registry import get_crypt_handler
+from app.config import (
+    SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS,
+    PASSWORD_HASH_SCHEME, PASSWORD_HASH_ROUNDS, PASSWORD_HASH_WORKERS,
+)
+
+
+# ═══════════════════════════════════════════════════════
+# PASSWORD HASHING
+# ═══════════════════════════════════════════════════════
+
+# Older schemes we still accept; matching hashes are upgraded on login
+LEGACY_HASH_SCHEMES = ("bcrypt", "pbkdf2_sha256")
+
+
+def build_pwd_context(scheme: str = PASSWORD_HASH_SCHEME,
+                      rounds: Optional[int] = PASSWORD_HASH_ROUNDS) -> CryptContext:
+    """
+    CryptContext hashing with ``scheme`` at ``rounds``. Every other scheme
+    is deprecated, and a hash at a different cost counts as outdated, so
+    verify_and_update() returns a replacement hash for either.
+    """
+    schemes = [scheme] + [s for s in LEGACY_HASH_SCHEMES if s != scheme]
+    # Pin the cost even when unset, or hashes at other costs never count as outdated
+    rounds = rounds or getattr(get_crypt_handler(scheme), "default_rounds", None)
+    settings = {}
+    if rounds:
+        settings = {f"{scheme}__{k}": rounds for k in ("default_rounds", "min_rounds", "max_rounds")}
+    return CryptContext(schemes=schemes, deprecated="auto", **settings)
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+pwd_context = build_pwd_context()
 
 
 def hash_password(password: str) -> str:
@@ -15,6 +49,49 @@ def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
 
+def verify_and_update(plain: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    """(matches, new_hash); new_hash is set when the stored hash is outdated."""
+    return pwd_context.verify_and_update(plain, hashed)
+
+
+# ── Off the event loop ───────────────────────────────
+# Hashing is pure CPU for tens to hundreds of ms. Running it in a small
+# dedicated process pool keeps it off the event loop, the request
+# threadpool and the GIL; the pool size caps how many cores logins can use.
+
+_hash_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_hash_pool() -> Optional[ProcessPoolExecutor]:
+    global _hash_pool
+    if _hash_pool is None and PASSWORD_HASH_WORKERS > 0:
+        # spawn, not fork: the parent has an event loop and pool threads running
+        _hash_pool = ProcessPoolExecutor(max_workers=PASSWORD_HASH_WORKERS,
+                                         mp_context=multiprocessing.get_context("spawn"))
+    return _hash_pool
+
+
+def shutdown_hash_pool() -> None:
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=True, cancel_futures=True)
+        _hash_pool = None
+
+
+async def hash_password_async(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(
+        _get_hash_pool(), hash_password, password)
+
+
+async def verify_and_update_async(plain: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    return await asyncio.get_running_loop().run_in_executor(
+        _get_hash_pool(), verify_and_update, plain, hashed)
+
+
+# ═══════════════════════════════════════════════════════
+# JWT
+# ═══════════════════════════════════════════════════════
+
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     to_encode["type"] = "access"
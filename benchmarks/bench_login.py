@@ -0,0 +1,88 @@
+# benchmarks/bench_login.py
+"""
+Password verification throughput: logins/sec, in total and per core.
+
+Measures the hashing cost of /auth/login two ways:
+    inline  — verify in a loop in this process (one core)
+    pool    — concurrent verifies through the hashing process pool
+
+Run with:
+    python benchmarks/bench_login.py
+    python benchmarks/bench_login.py --scheme bcrypt --rounds 10 --workers 4
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--scheme", help="passlib scheme (default: PASSWORD_HASH_SCHEME)")
+    parser.add_argument("--rounds", type=int, help="cost (default: PASSWORD_HASH_ROUNDS)")
+    parser.add_argument("--workers", type=int, help="hash processes (default: PASSWORD_HASH_WORKERS)")
+    parser.add_argument("--seconds", type=float, default=5.0, help="duration of each run")
+    return parser.parse_args()
+
+
+def bench_inline(utils, hashed: str, seconds: float) -> float:
+    done, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        utils.verify_and_update("correct horse", hashed)
+        done += 1
+    return done / (time.perf_counter() - start)
+
+
+async def bench_pool(utils, hashed: str, seconds: float, concurrency: int) -> float:
+    done = 0
+    deadline = time.perf_counter() + seconds
+
+    async def client():
+        nonlocal done
+        while time.perf_counter() < deadline:
+            await utils.verify_and_update_async("correct horse", hashed)
+            done += 1
+
+    # Warm the pool so process start-up isn't measured
+    await asyncio.gather(*(utils.verify_and_update_async("correct horse", hashed)
+                           for _ in range(concurrency)))
+    start = time.perf_counter()
+    deadline = start + seconds
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return done / (time.perf_counter() - start)
+
+
+def main():
+    args = parse_args()
+    # The pool's worker processes read the same settings from the environment
+    if args.scheme:
+        os.environ["PASSWORD_HASH_SCHEME"] = args.scheme
+    if args.rounds:
+        os.environ["PASSWORD_HASH_ROUNDS"] = str(args.rounds)
+    if args.workers is not None:
+        os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers)
+
+    from app import config, utils
+
+    workers = config.PASSWORD_HASH_WORKERS
+    hashed = utils.hash_password("correct horse")
+    print(f"scheme={config.PASSWORD_HASH_SCHEME} rounds={config.PASSWORD_HASH_ROUNDS or 'default'} "
+          f"workers={workers} cpus={os.cpu_count()}")
+
+    inline = bench_inline(utils, hashed, args.seconds)
+    print(f"inline : {inline:8.1f} logins/s  ({1000 / inline:.1f} ms each, 1 core)")
+
+    if workers > 0:
+        try:
+            pooled = asyncio.run(bench_pool(utils, hashed, args.seconds, concurrency=workers * 2))
+        finally:
+            utils.shutdown_hash_pool()
+        print(f"pool   : {pooled:8.1f} logins/s  ({pooled / workers:.1f} per core, "
+              f"{workers} workers)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+# benchmarks/bench_progression.py
+"""
+Progression engine timings, compared against a stored JSON baseline.
+
+Times the scalar helpers the API calls per set (calculate_set_target,
+get_next_available_weight, classify_*, evaluate_set_performance), their
+batch forms in app.progression_engine, and a full day of smart targets
+(crud.build_smart_progression, the compute half of
+calculate_smart_progression) over synthetic histories of 1 to 10k sets.
+No database is needed.
+
+Each case reports the best of several runs, in seconds per call. A case
+slower than its baseline × --tolerance is a regression and the run exits
+non-zero. Baselines are only comparable on the machine that wrote them;
+re-save after changing hardware or dependencies.
+
+Run with:
+    python benchmarks/bench_progression.py
+    python benchmarks/bench_progression.py --save
+    python benchmarks/bench_progression.py --filter smart --sizes 1000,10000
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+from types import SimpleNamespace as NS
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "progression.json")
+SIZES = (1, 100, 1000, 10_000)
+# Exercises on the synthetic day; the history's sets are spread across them
+DAY_EXERCISES = 8
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=2.0,
+                        help="slowdown factor that counts as a regression")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)),
+                        help="comma-separated history sizes in sets")
+    parser.add_argument("--filter", default="", help="only cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case; the best one counts")
+    return parser.parse_args()
+
+
+# ═══════════════════════════════════════════════════════
+# SYNTHETIC INPUTS
+# ═══════════════════════════════════════════════════════
+
+def synthetic_sets(n: int) -> List[Tuple[float, int, bool, int]]:
+    """(weight, reps, is_dumbbell, equipment_class) for n logged sets, deterministic."""
+    from app.equipment import EQUIPMENT_CLASSES
+    return [
+        (20 + (i * 7) % 120 + (i % 4) * 1.25, 6 + i % 8, i % 3 == 0, i % len(EQUIPMENT_CLASSES))
+        for i in range(n)
+    ]
+
+
+def synthetic_day(n: int):
+    """
+    A workout day whose previous session holds n sets, spread over up to
+    DAY_EXERCISES exercises, with feedback on half the muscle groups.
+    Returns the arguments of crud.build_smart_progression().
+    """
+    from app import models
+    from app.catalog import CatalogExercise, CatalogSnapshot
+
+    exercises = min(n, DAY_EXERCISES)
+    names = [("dumbbell bench press", "dumbbell"), ("barbell squat", "barbell"),
+             ("lever leg extension", "leverage machine"), ("cable row", "cable"),
+             ("push-up", "body weight")]
+    catalog = CatalogSnapshot([
+        CatalogExercise(i + 1, f"{names[i % len(names)][0]} {i}", "chest",
+                        names[i % len(names)][1], f"muscle{i % 4}")
+        for i in range(exercises)
+    ])
+    slots, history = [], {}
+    for i in range(exercises):
+        sets = n // exercises + (1 if i < n % exercises else 0)
+        slots.append(NS(id=100 + i, exercise_id=i + 1, exercise_order=i + 1, prescribed_sets=sets))
+        history[i + 1] = [
+            {"set_number": s, "weight": w, "reps": r}
+            for s, (w, r, _, _) in enumerate(synthetic_sets(sets), start=1)
+        ]
+    feedbacks = [
+        NS(muscle_group=f"muscle{g}", soreness=models.SorenessLevel.light,
+           pump=models.PumpLevel.great, volume_feeling=models.VolumeFeeling.just_right)
+        for g in range(0, 4, 2)
+    ]
+    day = NS(id=1, exercises=slots, feedbacks=feedbacks)
+    return day, catalog, 1, [], history, {}
+
+
+# ═══════════════════════════════════════════════════════
+# CASES
+# ═══════════════════════════════════════════════════════
+
+def cases(sizes) -> Dict[str, Callable[[], object]]:
+    """``name[size]`` → zero-argument callable timed as one call."""
+    import numpy as np
+    from app import crud, progression_engine as engine
+
+    out = {}
+    for n in sizes:
+        sets = synthetic_sets(n)
+        weights = np.array([w for w, _, _, _ in sets])
+        reps = np.array([r for _, r, _, _ in sets])
+        equipment = np.array([e for _, _, _, e in sets])
+        recovery = np.arange(n) % len(engine.RECOVERY_STATES)
+        soreness = (np.arange(n) % 31) / 10
+        pump = (np.arange(n) % 31) / 10
+        volume = (np.arange(n) % 21) / 10 - 1
+        states = [engine.RECOVERY_STATES[c] for c in recovery]
+
+        # Scalar helpers, called once per set as the API does
+        out[f"calculate_set_target[{n}]"] = lambda sets=sets, states=states: [
+            crud.calculate_set_target(w, r, db, state, "optimal", equipment_class=e)
+            for (w, r, db, e), state in zip(sets, states)
+        ]
+        out[f"get_next_available_weight[{n}]"] = lambda sets=sets: [
+            crud.get_next_available_weight(w, db, equipment_class=e) for w, _, db, e in sets
+        ]
+        out[f"classify_recovery_state[{n}]"] = lambda s=soreness.tolist(): [
+            crud.classify_recovery_state(x) for x in s
+        ]
+        out[f"classify_stimulus_quality[{n}]"] = lambda p=pump.tolist(), v=volume.tolist(): [
+            crud.classify_stimulus_quality(a, b) for a, b in zip(p, v)
+        ]
+        out[f"evaluate_set_performance[{n}]"] = lambda sets=sets: [
+            crud.evaluate_set_performance(w, r, w + (i % 3 - 1) * 2.5, r + i % 3 - 1)
+            for i, (w, r, _, _) in enumerate(sets)
+        ]
+
+        # Batch forms in the engine, one call per n sets
+        out[f"engine.compute_set_targets[{n}]"] = (
+            lambda w=weights, r=reps, e=equipment, c=recovery: engine.compute_set_targets(w, r, e, c)
+        )
+        out[f"engine.next_available_weights[{n}]"] = (
+            lambda w=weights, e=equipment: engine.next_available_weights(w, e)
+        )
+        out[f"engine.classify_recovery_states[{n}]"] = (
+            lambda s=soreness: engine.classify_recovery_states(s)
+        )
+        out[f"engine.classify_stimulus_qualities[{n}]"] = (
+            lambda p=pump, v=volume: engine.classify_stimulus_qualities(p, v)
+        )
+
+        # A whole day of smart targets from already-loaded inputs
+        day_args = synthetic_day(n)
+        out[f"build_smart_progression[{n}]"] = lambda a=day_args: crud.build_smart_progression(*a)
+    return out
+
+
+def measure(fn: Callable[[], object], repeat: int) -> float:
+    """Best seconds per call, each run long enough (~0.2s) to time reliably."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+# ═══════════════════════════════════════════════════════
+# BASELINE
+# ═══════════════════════════════════════════════════════
+
+def environment() -> dict:
+    import numpy as np
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def load_baseline(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, results: Dict[str, float], previous: dict) -> None:
+    # Cases not run this time keep their previous numbers
+    merged = {**previous.get("results", {}), **results}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "environment": environment(),
+            "saved_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "results": dict(sorted(merged.items())),
+        }, f, indent=2)
+        f.write("\n")
+
+
+def fmt(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:7.2f} {unit}"
+    return f"{seconds / 1e-9:7.0f} ns"
+
+
+def main():
+    args = parse_args()
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    baseline = load_baseline(args.baseline)
+    known = baseline.get("results", {})
+    if baseline and baseline.get("environment") != environment():
+        print(f"note: baseline was saved on {baseline.get('environment')}; "
+              f"this is {environment()}")
+
+    results, regressions = {}, []
+    for name, fn in cases(sizes).items():
+        if args.filter not in name:
+            continue
+        seconds = results[name] = measure(fn, args.repeat)
+        line = f"{name:<45} {fmt(seconds)}"
+        if name in known:
+            ratio = seconds / known[name]
+            line += f"   {ratio:5.2f}× baseline"
+            if ratio > args.tolerance:
+                line += "   REGRESSION"
+                regressions.append(name)
+        print(line)
+
+    if args.save:
+        save_baseline(args.baseline, results, baseline)
+        print(f"saved {len(results)} results to {os.path.relpath(args.baseline)}")
+    elif regressions:
+        print(f"\n{len(regressions)} case(s) slower than {args.tolerance}× baseline")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+# benchmarks/explain_hot_queries.py
+"""
+Index check: EXPLAIN every query the hot crud paths issue and fail if any
+of them has to sequentially scan a table that should be reached by index.
+
+Inside a single transaction that is rolled back at the end, it:
+    1. seeds a few hundred users, each with a multi-week mesocycle, set
+       logs and feedback, then runs ANALYZE
+    2. runs the read paths (and the feedback upsert) through app.crud,
+       capturing the SQL they emit
+    3. EXPLAINs each captured statement with its real parameters; a
+       sequential scan fails the check only if it survives re-planning with
+       enable_seqscan off, i.e. there is no index to use instead
+
+The exercises table is exempt: the catalog snapshot reads it whole on
+purpose (see app/catalog.py). Needs a database at `alembic upgrade head`;
+nothing is left behind.
+
+Run with:
+    python benchmarks/explain_hot_queries.py
+    python benchmarks/explain_hot_queries.py --users 1000 --weeks 8 -v
+"""
+import argparse
+import os
+import sys
+from typing import Dict, Iterator, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+MARK = "explain-hot-queries"
+CHECKED_TABLES = {
+    "users", "plans", "plan_days", "plan_day_exercises", "mesocycles", "mesocycle_weeks",
+    "mesocycle_days", "mesocycle_day_exercises", "set_logs", "feedbacks",
+    "exercise_performance",
+}
+MUSCLE_GROUPS = ("pectorals", "lats", "quads", "delts")
+
+SEED_SQL = [
+    # Enough exercises for every plan slot, when the catalog hasn't been imported
+    """
+    INSERT INTO exercises (name, body_part, equipment, target)
+    SELECT 'explain exercise ' || g, 'chest', 'barbell', (:groups)[1 + g % 4]
+    FROM generate_series(1, GREATEST(0, :slots - (SELECT count(*) FROM exercises))) g
+    """,
+    """
+    INSERT INTO users (name, email, hashed_password, is_active)
+    SELECT :mark, :mark || '-' || g || '@example.invalid', 'x', true
+    FROM generate_series(1, :users) g
+    """,
+    """
+    INSERT INTO plans (user_id, name)
+    SELECT id, :mark FROM users WHERE name = :mark
+    """,
+    """
+    INSERT INTO plan_days (plan_id, name, "order")
+    SELECT p.id, 'Day ' || d, d
+    FROM plans p CROSS JOIN generate_series(1, :days) d
+    WHERE p.name = :mark
+    """,
+    """
+    INSERT INTO plan_day_exercises (plan_day_id, exercise_id, "order")
+    SELECT pd.id, x.ids[1 + ((pd."order" - 1) * :per_day + e - 1) % cardinality(x.ids)], e
+    FROM plan_days pd
+    JOIN plans p ON p.id = pd.plan_id AND p.name = :mark
+    CROSS JOIN generate_series(1, :per_day) e
+    CROSS JOIN (SELECT array_agg(id ORDER BY id) AS ids FROM exercises) x
+    """,
+    # Every mesocycle is in its last week, with all earlier weeks completed
+    """
+    INSERT INTO mesocycles (user_id, plan_id, name, current_week, is_active)
+    SELECT user_id, id, :mark, :weeks, true FROM plans WHERE name = :mark
+    """,
+    """
+    INSERT INTO mesocycle_weeks (mesocycle_id, week_number)
+    SELECT m.id, w FROM mesocycles m CROSS JOIN generate_series(1, :weeks) w
+    WHERE m.name = :mark
+    """,
+    """
+    INSERT INTO mesocycle_days (week_id, plan_day_id, day_order, is_completed)
+    SELECT mw.id, pd.id, pd."order", mw.week_number < m.current_week
+    FROM mesocycle_weeks mw
+    JOIN mesocycles m ON m.id = mw.mesocycle_id AND m.name = :mark
+    JOIN plan_days pd ON pd.plan_id = m.plan_id
+    """,
+    """
+    INSERT INTO mesocycle_day_exercises (meso_day_id, exercise_id, user_id, exercise_order,
+                                         prescribed_sets)
+    SELECT md.id, pde.exercise_id, m.user_id, pde."order", :sets
+    FROM mesocycle_days md
+    JOIN mesocycle_weeks mw ON mw.id = md.week_id
+    JOIN mesocycles m ON m.id = mw.mesocycle_id AND m.name = :mark
+    JOIN plan_day_exercises pde ON pde.plan_day_id = md.plan_day_id
+    """,
+    """
+    INSERT INTO set_logs (meso_day_exercise_id, user_id, exercise_id, set_number, weight, reps)
+    SELECT mde.id, mde.user_id, mde.exercise_id, s, 20 + (mde.id % 40) * 2.5, 8 + s % 4
+    FROM mesocycle_day_exercises mde
+    JOIN mesocycle_days md ON md.id = mde.meso_day_id AND md.is_completed
+    JOIN mesocycle_weeks mw ON mw.id = md.week_id
+    JOIN mesocycles m ON m.id = mw.mesocycle_id AND m.name = :mark
+    CROSS JOIN generate_series(1, :sets) s
+    """,
+    """
+    INSERT INTO feedbacks (meso_day_id, muscle_group, soreness, pump, volume_feeling)
+    SELECT md.id, g, 'moderate'::sorenesslevel, 'great'::pumplevel, 'just_right'::volumefeeling
+    FROM mesocycle_days md
+    JOIN mesocycle_weeks mw ON mw.id = md.week_id AND md.is_completed
+    JOIN mesocycles m ON m.id = mw.mesocycle_id AND m.name = :mark
+    CROSS JOIN unnest(CAST(:groups AS text[])) g
+    """,
+    """
+    INSERT INTO exercise_performance (user_id, exercise_id, last_weight, last_reps,
+                                      best_e1rm, last_completed_mde_id)
+    SELECT mde.user_id, mde.exercise_id, max(sl.weight), max(sl.reps),
+           max(sl.weight * (1 + sl.reps::float8 / 30)), max(mde.id)
+    FROM mesocycle_day_exercises mde
+    JOIN mesocycle_days md ON md.id = mde.meso_day_id AND md.is_completed
+    JOIN set_logs sl ON sl.meso_day_exercise_id = mde.id
+    JOIN users u ON u.id = mde.user_id AND u.name = :mark
+    GROUP BY mde.user_id, mde.exercise_id
+    """,
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--users", type=int, default=300, help="seeded users (one mesocycle each)")
+    parser.add_argument("--weeks", type=int, default=8, help="weeks per mesocycle")
+    parser.add_argument("--days", type=int, default=4, help="training days per week")
+    parser.add_argument("--per-day", type=int, default=8, help="exercises per day")
+    parser.add_argument("--sets", type=int, default=4, help="logged sets per exercise")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print every scan")
+    return parser.parse_args()
+
+
+def seed(conn, args) -> dict:
+    params = {"mark": MARK, "users": args.users, "weeks": args.weeks, "days": args.days,
+              "per_day": args.per_day, "sets": args.sets, "slots": args.days * args.per_day,
+              "groups": list(MUSCLE_GROUPS)}
+    for sql in SEED_SQL:
+        conn.execute(text(sql), params)
+        # Fresh statistics, or the next step's joins are planned for empty tables
+        conn.execute(text("ANALYZE"))
+
+    # A user from the middle of the seeded range, and their days
+    meso_id, user_id = conn.execute(text(
+        "SELECT id, user_id FROM mesocycles WHERE name = :mark ORDER BY id OFFSET :n LIMIT 1"
+    ), {"mark": MARK, "n": args.users // 2}).one()
+    open_day, done_day = (conn.execute(text("""
+        SELECT md.id FROM mesocycle_days md JOIN mesocycle_weeks mw ON mw.id = md.week_id
+        WHERE mw.mesocycle_id = :meso AND md.is_completed = :done
+        ORDER BY mw.week_number DESC, md.day_order LIMIT 1
+    """), {"meso": meso_id, "done": done}).scalar_one() for done in (False, True))
+    exercise_id = conn.execute(text(
+        "SELECT exercise_id FROM mesocycle_day_exercises WHERE meso_day_id = :day LIMIT 1"
+    ), {"day": done_day}).scalar_one()
+    email = conn.execute(text("SELECT email FROM users WHERE id = :id"), {"id": user_id}).scalar_one()
+    return {"meso_id": meso_id, "user_id": user_id, "open_day": open_day,
+            "done_day": done_day, "exercise_id": exercise_id, "email": email}
+
+
+def hot_paths(crud, ids: dict) -> List[Tuple[str, callable]]:
+    user, meso = ids["user_id"], ids["meso_id"]
+    return [
+        ("get_user_by_email", lambda db: crud.get_user_by_email(db, ids["email"])),
+        ("get_plans", lambda db: crud.get_plans(db, user)),
+        ("get_mesocycles", lambda db: crud.get_mesocycles(db, user)),
+        ("get_mesocycle_detail", lambda db: crud.get_mesocycle_detail(db, meso, user)),
+        ("get_current_workout", lambda db: crud.get_current_workout(db, meso, user)),
+        ("get_day_exercise_ids", lambda db: crud.get_day_exercise_ids(db, ids["open_day"], user)),
+        ("calculate_smart_progression",
+         lambda db: crud.calculate_smart_progression(db, ids["open_day"], user_id=user)),
+        ("get_exercise_history", lambda db: crud.get_exercise_history(db, ids["exercise_id"], user)),
+        ("get_last_weights_for_exercises",
+         lambda db: crud.get_last_weights_for_exercises(db, [ids["exercise_id"]], user)),
+        ("calculate_progression", lambda db: crud.calculate_progression(db, ids["done_day"], user)),
+        ("calculate_feedback_driven_progression",
+         lambda db: crud.calculate_feedback_driven_progression(db, meso, user)),
+        ("create_feedback", lambda db: crud.create_feedback(
+            db, ids["done_day"], user, MUSCLE_GROUPS[0], "light", "great", "just_right")),
+    ]
+
+
+def capture(conn, db: Session, paths) -> List[Tuple[str, str, object]]:
+    """
+    (path label, SQL, parameters) for every statement the paths emit that
+    can look rows up; plain EXPLAIN doesn't execute the writes among them.
+    """
+    captured, label = [], [None]
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH", "INSERT", "UPDATE")):
+            captured.append((label[0], statement, parameters))
+
+    event.listen(conn, "before_cursor_execute", record)
+    try:
+        for name, run in paths:
+            label[0] = name
+            run(db)
+    finally:
+        event.remove(conn, "before_cursor_execute", record)
+    return captured
+
+
+def scans(plan: dict) -> Iterator[Tuple[str, str, str]]:
+    """(node type, relation, index) for every scan node in an EXPLAIN plan."""
+    if "Relation Name" in plan:
+        yield plan["Node Type"], plan["Relation Name"], plan.get("Index Name", "")
+    for child in plan.get("Plans", ()):
+        yield from scans(child)
+
+
+def explain(conn, statement: str, parameters) -> dict:
+    return conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar_one()[0]["Plan"]
+
+
+def main():
+    args = parse_args()
+    from app import crud
+    from app.database import get_engine
+
+    failures = 0
+    with get_engine().connect() as conn:
+        trans = conn.begin()
+        try:
+            conn.execute(text("SET LOCAL statement_timeout = 0"))      # seeding is bulk work
+            ids = seed(conn, args)
+            # Commits inside crud release a savepoint; the outer rollback undoes everything
+            db = Session(bind=conn, join_transaction_mode="create_savepoint")
+            captured = capture(conn, db, hot_paths(crud, ids))
+            db.close()
+
+            per_path: Dict[str, List[str]] = {}
+            for label, statement, parameters in captured:
+                lines = per_path.setdefault(label, [])
+                plan = explain(conn, statement, parameters)
+                seq = [r for n, r, _ in scans(plan) if n == "Seq Scan" and r in CHECKED_TABLES]
+                # A seq scan the planner keeps even when told to avoid them has no index
+                # to fall back on; otherwise it was only the cheaper choice at this size
+                missing = set()
+                if seq:
+                    conn.execute(text("SET LOCAL enable_seqscan = off"))
+                    missing = {r for n, r, _ in scans(explain(conn, statement, parameters))
+                               if n == "Seq Scan" and r in CHECKED_TABLES}
+                    conn.execute(text("SET LOCAL enable_seqscan = on"))
+                failures += len(missing)
+                for node, relation, index in scans(plan):
+                    if node == "Seq Scan" and relation in missing:
+                        lines.append(f"SEQ {node} on {relation}: no usable index")
+                    elif args.verbose:
+                        note = (" (cheaper than its index at this size)"
+                                if node == "Seq Scan" and relation in seq else "")
+                        lines.append(f"{node} on {relation}" + (f" using {index}" if index else "") + note)
+        finally:
+            trans.rollback()
+
+    print(f"seeded {args.users} users × {args.weeks} weeks × {args.days} days × "
+          f"{args.per_day} exercises × {args.sets} sets (rolled back)")
+    for label, lines in per_path.items():
+        status = "FAIL" if any(line.startswith("SEQ") for line in lines) else "ok"
+        print(f"{status:4}  {label}")
+        for line in lines:
+            print(f"        {line}")
+    if failures:
+        print(f"{failures} sequential scan(s) with no usable index")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
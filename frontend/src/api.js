@@ -77,3 +77,15 @@ export const evaluateSet = (setLogId) =>
 // Get exercise progression history
 export const getExerciseHistory = (exerciseId, limit = 10) =>
   API.get(`/exercises/${exerciseId}/progression-history?limit=${limit}`);
+
+// Log all sets of one exercise in one request (upsert)
+export const logSets = (mdeId, sets) =>
+  API.post(`/mesocycle-day-exercises/${mdeId}/log-sets`, { sets });
+
+// Log every set of a day in one request: [{ mde_id, sets: [...] }, ...]
+export const logDaySets = (dayId, exercises) =>
+  API.post(`/mesocycle-days/${dayId}/log-sets`, { exercises });
+
+// Skip set ranges on several exercises: [{ mde_id, from_set, to_set }, ...]
+export const skipDaySets = (dayId, exercises) =>
+  API.post(`/mesocycle-days/${dayId}/skip-sets`, { exercises });
@@ -112,27 +112,33 @@ export default function Workout() {
     }
   }, [mesocycleId]);
 
+  // Index smart targets by mde_id → set_number
+  const buildTargetsMap = (targets) => {
+    const targetsMap = {};
+    (targets || []).forEach((t) => {
+      const setsMap = {};
+      (t.set_targets || []).forEach((st) => {
+        setsMap[st.set_number] = {
+          weight: st.target_weight,
+          reps: st.target_reps,
+          is_new: st.is_new_set,
+        };
+      });
+      targetsMap[t.mde_id] = {
+        type: t.progression_type,
+        reason: t.reason,
+        prescribed_sets: t.prescribed_sets,
+        sets: setsMap,
+      };
+    });
+    return targetsMap;
+  };
+
   // Fetch smart targets for the current day
   const fetchTargets = useCallback(async (dayId) => {
     try {
       const res = await API.get(`/mesocycle-days/${dayId}/smart-targets`);
-      const targetsMap = {};
-      (res.data.targets || []).forEach((t) => {
-        const setsMap = {};
-        (t.set_targets || []).forEach((st) => {
-          setsMap[st.set_number] = {
-            weight: st.target_weight,
-            reps: st.target_reps,
-            is_new: st.is_new_set,
-          };
-        });
-        targetsMap[t.mde_id] = {
-          type: t.progression_type,
-          reason: t.reason,
-          prescribed_sets: t.prescribed_sets,
-          sets: setsMap,
-        };
-      });
+      const targetsMap = buildTargetsMap(res.data.targets);
       setTargets(targetsMap);
       return targetsMap;
     } catch (e) {
@@ -150,12 +156,13 @@ export default function Workout() {
     setLoading(true);
     setError('');
     try {
-      const res = await API.get(`/mesocycles/${activeMesoId}/current-workout`);
-      const dayData = res.data;
+      // Day, logs, feedback and smart targets in one round-trip
+      const res = await API.get(`/mesocycles/${activeMesoId}/workout-bundle`);
+      const dayData = res.data.day;
       setDay(dayData);
 
-      // Fetch smart targets
-      const targetsMap = await fetchTargets(dayData.id);
+      const targetsMap = buildTargetsMap(res.data.targets);
+      setTargets(targetsMap);
 
       // Initialize inputs from existing logs + smart targets
       const inputs = {};
@@ -213,7 +220,7 @@ export default function Workout() {
     } finally {
       setLoading(false);
     }
-  }, [activeMesoId, fetchTargets]);
+  }, [activeMesoId]);
 
   useEffect(() => {
     fetchWorkout();
@@ -1,46 +1,144 @@
 # import_exercises.py
-# Run once: python import_exercises.py
+# Sync the exercise catalog with app/exercises.csv. Safe to re-run at any time,
+# including against a live database:
+#     python import_exercises.py [--csv PATH] [--dry-run]
+# Run `alembic upgrade head` first; the schema is managed by migrations.
+import argparse
 import csv
 import os
 import sys
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List
 
 # Add project root to path so we can import app modules
 sys.path.insert(0, os.path.dirname(__file__))
 
-from app.database import SessionLocal, engine
-from app.models import Base, Exercise
+from sqlalchemy import literal_column, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
-# Ensure tables exist
-Base.metadata.create_all(bind=engine)
+from app.models import Exercise
 
-CSV_PATH = os.path.join("app", "exercises.csv")
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app", "exercises.csv")
+BATCH_SIZE = 1000
+CATALOG_FIELDS = ("name", "body_part", "equipment", "target")
 
-def import_exercises():
-    db = SessionLocal()
+
+def read_catalog(path: str) -> Iterator[dict]:
+    """Stream normalized catalog rows from the CSV, keyed by its stable ``id``."""
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield {
+                "source_id": row["id"].strip(),
+                "name": row["name"].strip(),
+                "body_part": row["bodyPart"].strip(),
+                "equipment": row["equipment"].strip() if row.get("equipment") else None,
+                "target": row["target"].strip(),
+            }
+
+
+def batched(rows: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    it = iter(rows)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def match_legacy_rows(legacy: Iterable[tuple], rows: Iterable[dict]) -> List[dict]:
+    """
+    Pair rows imported before source_id existing, ``(id, name)``, with CSV
+    rows by name, so they are adopted instead of duplicated. Repeated names
+    pair up in id / file order. Returns ``[{"id", "source_id"}]``.
+    """
+    by_name: Dict[str, List[int]] = {}
+    for exercise_id, name in sorted(legacy):
+        by_name.setdefault(name, []).append(exercise_id)
+    matches = []
+    for row in rows:
+        ids = by_name.get(row["name"])
+        if ids:
+            matches.append({"id": ids.pop(0), "source_id": row["source_id"]})
+    return matches
+
+
+def upsert_catalog_stmt(rows: List[dict]):
+    """
+    One INSERT … ON CONFLICT (source_id) for a batch. Rows that didn't
+    change are left alone, so only inserted and updated rows come back;
+    ``inserted`` tells them apart (xmax = 0 only on a fresh insert).
+    """
+    stmt = pg_insert(Exercise).values(rows)
+    changed = tuple_(*(getattr(Exercise, f) for f in CATALOG_FIELDS)).is_distinct_from(
+        tuple_(*(stmt.excluded[f] for f in CATALOG_FIELDS))
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[Exercise.source_id],
+        set_={f: stmt.excluded[f] for f in CATALOG_FIELDS},
+        where=changed,
+    ).returning(Exercise.id, (literal_column("xmax") == 0).label("inserted"))
+
+
+def open_session():
+    """A sync session; nothing builds the engine at import, so build it here."""
+    from app.database import SessionLocal, get_engine      # keeps the helpers importable without the engine stack
+
+    get_engine()
+    return SessionLocal()
+
+
+def sync_exercises(path: str = CSV_PATH, dry_run: bool = False) -> dict:
+    """Bring the exercises table in line with the CSV in one transaction."""
+    stats = {"read": 0, "inserted": 0, "updated": 0, "unchanged": 0, "adopted": 0, "retired": 0}
+    db = open_session()
     try:
-        existing = db.query(Exercise).count()
-        if existing > 0:
-            print(f"[SKIP] Exercise table already has {existing} rows. Delete them first to re-import.")
-            return
-
-        with open(CSV_PATH, newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            count = 0
-            for row in reader:
-                ex = Exercise(
-                    name=row["name"].strip(),
-                    body_part=row["bodyPart"].strip(),
-                    equipment=row["equipment"].strip() if row.get("equipment") else None,
-                    target=row["target"].strip(),
-                )
-                db.add(ex)
-                count += 1
+        # Rows from the old one-shot import have no source_id yet
+        legacy = db.execute(
+            select(Exercise.id, Exercise.name).where(Exercise.source_id.is_(None))
+        ).all()
+        if legacy:
+            claimed = set(db.scalars(select(Exercise.source_id).where(Exercise.source_id.isnot(None))))
+            unclaimed = (row for row in read_catalog(path) if row["source_id"] not in claimed)
+            adopted = match_legacy_rows(legacy, unclaimed)
+            if adopted:
+                db.execute(update(Exercise), adopted)
+            stats["adopted"] = len(adopted)
+
+        seen = set()
+        for batch in batched(read_catalog(path), BATCH_SIZE):
+            # A source_id repeated within one statement can't be upserted twice
+            batch = list({row["source_id"]: row for row in batch}.values())
+            seen.update(row["source_id"] for row in batch)
+            stats["read"] += len(batch)
+            for row in db.execute(upsert_catalog_stmt(batch)):
+                stats["inserted" if row.inserted else "updated"] += 1
+        stats["unchanged"] = stats["read"] - stats["inserted"] - stats["updated"]
 
+        # Exercises gone from the CSV stay: plans and mesocycles reference them
+        existing = db.scalars(select(Exercise.source_id)).all()
+        stats["retired"] = sum(1 for sid in existing if sid is None or sid not in seen)
+
+        if dry_run:
+            db.rollback()
+        else:
             db.commit()
-            print(f"[OK] Imported {count} exercises.")
+        return stats
     finally:
         db.close()
 
 
+def main():
+    parser = argparse.ArgumentParser(description="Sync the exercise catalog with a CSV.")
+    parser.add_argument("--csv", default=CSV_PATH, help="catalog CSV (default: app/exercises.csv)")
+    parser.add_argument("--dry-run", action="store_true", help="report changes without saving")
+    args = parser.parse_args()
+
+    stats = sync_exercises(args.csv, dry_run=args.dry_run)
+    prefix = "[DRY RUN]" if args.dry_run else "[OK]"
+    print(f"{prefix} {stats['read']} catalog rows: {stats['inserted']} inserted, "
+          f"{stats['updated']} updated, {stats['unchanged']} unchanged")
+    if stats["adopted"]:
+        print(f"     {stats['adopted']} existing rows matched by name and given a source id")
+    if stats["retired"]:
+        print(f"     {stats['retired']} rows not in the CSV were kept (still referenced by id)")
+
+
 if __name__ == "__main__":
-    import_exercises()
+    main()
@@ -1,7 +1,7 @@
 from sqlalchemy import text
-from app.database import engine
+from app.database import get_engine
 
-with engine.connect() as conn:
+with get_engine().connect() as conn:
     conn.execute(text("DROP SCHEMA public CASCADE"))
     conn.execute(text("CREATE SCHEMA public"))
     conn.execute(text("GRANT ALL ON SCHEMA public TO postgres"))
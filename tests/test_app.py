@@ -0,0 +1,32 @@
+# tests/test_app.py
+"""
+Unit tests for the create_app() factory: building the app needs no database.
+Run with: pytest tests/test_app.py -v
+"""
+
+from fastapi.testclient import TestClient
+
+from app import database
+from app.main import create_app
+
+
+class TestCreateApp:
+    def test_builds_without_touching_the_database(self):
+        app = create_app()
+        assert app.title == "Iron Protocol API"
+        assert database.engine is None
+        assert database.async_engine is None
+
+    def test_routes_registered(self):
+        paths = set(create_app().openapi()["paths"])
+        assert {"/auth/login", "/exercises/", "/mesocycles/{mesocycle_id}/workout-bundle",
+                "/health/db-pool"} <= paths
+
+    def test_independent_instances(self):
+        first, second = create_app(), create_app()
+        assert first is not second
+        assert first.router is not second.router
+
+    def test_pool_health_requires_auth(self):
+        # No lifespan (no `with`): the token check rejects before any database use
+        assert TestClient(create_app()).get("/health/db-pool").status_code == 401
@@ -0,0 +1,144 @@
+# tests/test_cache.py
+"""
+Unit tests for the in-process caches.
+Run with: pytest tests/test_cache.py -v
+"""
+
+import time
+
+import pytest
+
+from app.cache import AuthCache, AuthUser, TTLCache, SmartTargetCache
+
+
+def _targets(mde_id, sets):
+    return {
+        "mde_id": mde_id,
+        "set_targets": [
+            {"set_number": n, "target_weight": w, "target_reps": r}
+            for n, (w, r) in enumerate(sets, start=1)
+        ],
+    }
+
+
+# ═══════════════════════════════════════════════════════
+# TTL / LRU
+# ═══════════════════════════════════════════════════════
+
+class TestTTLCache:
+    def test_get_and_set(self):
+        c = TTLCache(maxsize=2, ttl=60)
+        c.set("a", 1)
+        assert c.get("a") == 1
+        assert c.get("missing") is None
+
+    def test_lru_eviction(self):
+        c = TTLCache(maxsize=2, ttl=60)
+        c.set("a", 1)
+        c.set("b", 2)
+        c.get("a")          # "b" becomes least recently used
+        c.set("c", 3)
+        assert "b" not in c
+        assert c.get("a") == 1 and c.get("c") == 3
+
+    def test_entry_expiry(self):
+        c = TTLCache(maxsize=2, ttl=60)
+        c.set("a", 1, expires_at=time.monotonic() - 1)
+        assert c.get("a") is None
+        assert len(c) == 0
+
+    def test_on_evict_called(self):
+        evicted = []
+        c = TTLCache(maxsize=1, ttl=60, on_evict=lambda k, v: evicted.append(k))
+        c.set("a", 1)
+        c.set("b", 2)
+        c.pop("b")
+        assert evicted == ["a", "b"]
+
+
+# ═══════════════════════════════════════════════════════
+# SMART TARGETS
+# ═══════════════════════════════════════════════════════
+
+class TestSmartTargetCache:
+    def test_set_lookup(self):
+        c = SmartTargetCache(maxsize=10, ttl=60)
+        c.put(1, user_id=7, week_number=1, targets=[_targets(10, [(100.0, 8), (100.0, 7)])])
+        assert c.get_set_target(10, 2) == (100.0, 7)
+
+    def test_set_beyond_prescription_is_zero(self):
+        c = SmartTargetCache(maxsize=10, ttl=60)
+        c.put(1, user_id=7, week_number=1, targets=[_targets(10, [(100.0, 8)])])
+        assert c.get_set_target(10, 5) == (0, 0)
+
+    def test_day_hits_only_for_its_owner(self):
+        c = SmartTargetCache(maxsize=10, ttl=60)
+        targets = [_targets(10, [(100.0, 8)])]
+        c.put(1, user_id=7, week_number=3, targets=targets)
+        assert c.get_day(1, 7) == (3, targets)
+        assert c.get_day(1, 8) is None
+
+    def test_miss_for_unknown_exercise(self):
+        c = SmartTargetCache(maxsize=10, ttl=60)
+        assert c.get_set_target(10, 1) is None
+
+    def test_set_log_keeps_its_own_day(self):
+        c = SmartTargetCache(maxsize=10, ttl=60)
+        c.put(1, user_id=7, week_number=1, targets=[_targets(10, [(100.0, 8)])])
+        c.put(2, user_id=7, week_number=1, targets=[_targets(20, [(50.0, 10)])])
+        c.invalidate_user(7, keep_mde_id=10)
+        assert c.get_day(1, 7) is not None
+        assert c.get_day(2, 7) is None
+        assert c.get_set_target(20, 1) is None
+
+    def test_invalidate_user_leaves_other_users(self):
+        c = SmartTargetCache(maxsize=10, ttl=60)
+        c.put(1, user_id=7, week_number=1, targets=[_targets(10, [(100.0, 8)])])
+        c.put(2, user_id=8, week_number=1, targets=[_targets(20, [(50.0, 10)])])
+        c.invalidate_user(7)
+        assert c.get_day(1, 7) is None
+        assert c.get_day(2, 8) is not None
+
+    def test_invalidate_day(self):
+        c = SmartTargetCache(maxsize=10, ttl=60)
+        c.put(1, user_id=7, week_number=1, targets=[_targets(10, [(100.0, 8)])])
+        c.invalidate_day(1)
+        assert c.get_set_target(10, 1) is None
+
+
+# ═══════════════════════════════════════════════════════
+# AUTHENTICATED USER
+# ═══════════════════════════════════════════════════════
+
+class TestAuthCache:
+    def test_token_expires_with_the_token(self):
+        c = AuthCache()
+        c.put_token("tok", 7, exp=time.time() + 0.05)
+        assert c.get_token_user_id("tok") == 7
+        time.sleep(0.06)
+        assert c.get_token_user_id("tok") is None
+
+    def test_expired_token_not_cached(self):
+        c = AuthCache()
+        c.put_token("tok", 7, exp=time.time() - 1)
+        assert c.get_token_user_id("tok") is None
+
+    def test_only_active_users_cached(self):
+        c = AuthCache()
+        c.put_user(AuthUser(1, "A", "a@x.io", True))
+        c.put_user(AuthUser(2, "B", "b@x.io", False))
+        assert c.get_user(1).email == "a@x.io"
+        assert c.get_user(2) is None
+
+    def test_invalidate_user(self):
+        c = AuthCache()
+        c.put_user(AuthUser(1, "A", "a@x.io", True))
+        c.put_token("tok", 1, exp=time.time() + 60)
+        c.invalidate_user(1)
+        assert c.get_user(1) is None
+        assert c.get_token_user_id("tok") == 1    # the token still names the user
+
+    def test_auth_user_is_immutable(self):
+        u = AuthUser(1, "A", "a@x.io", True)
+        with pytest.raises(AttributeError):
+            u.is_active = False
@@ -0,0 +1,100 @@
+# tests/test_catalog.py
+"""
+Unit tests for the in-process exercise catalog snapshot.
+Run with: pytest tests/test_catalog.py -v
+"""
+
+import pytest
+
+from app.catalog import CatalogExercise, CatalogSnapshot, ExerciseCatalog
+from app.equipment import BARBELL, DUMBBELL, OTHER
+
+
+class TestCatalogExercise:
+    def test_derived_fields(self):
+        ex = CatalogExercise(1, "dumbbell fly", "chest", "dumbbell", "Pectorals")
+        assert ex.equipment_class == DUMBBELL
+        assert ex.is_dumbbell is True
+        assert ex.muscle_group == "pectorals"
+
+    def test_muscle_group_falls_back_to_body_part(self):
+        ex = CatalogExercise(2, "push-up", "Chest", "body weight", "")
+        assert ex.muscle_group == "chest"
+        assert ex.equipment_class == OTHER
+
+    def test_immutable(self):
+        ex = CatalogExercise(3, "barbell curl", "upper arms", "barbell", "biceps")
+        with pytest.raises(AttributeError):
+            ex.name = "changed"
+        with pytest.raises(AttributeError):
+            ex.extra = 1            # __slots__: no per-instance dict
+
+
+class TestCatalogSnapshot:
+    snapshot = CatalogSnapshot([
+        CatalogExercise(1, "barbell bench press", "chest", "barbell", "pectorals"),
+        CatalogExercise(2, "dumbbell curl", "upper arms", "dumbbell", "biceps"),
+    ])
+
+    def test_mapping_by_id(self):
+        assert len(self.snapshot) == 2
+        assert self.snapshot[1].equipment_class == BARBELL
+        assert self.snapshot.get(99) is None
+        assert 2 in self.snapshot and 99 not in self.snapshot
+
+    def test_search_index_is_built_once(self):
+        index = self.snapshot.search_index
+        assert index is self.snapshot.search_index
+        assert [e.id for e in index.search("curl")] == [2]
+
+
+class _StubSession:
+    """Answers the fingerprint and row queries from a list of catalog rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    def execute(self, stmt):
+        self.queries += 1
+        rows = self.rows
+        fingerprint = (len(rows), str(rows))
+
+        class Result:
+            def one(self):
+                return fingerprint
+
+            def all(self):
+                return rows
+        return Result()
+
+
+class TestExerciseCatalogResolve:
+    rows = [(1, "barbell bench press", "chest", "barbell", "pectorals")]
+    new_row = (2, "dumbbell curl", "upper arms", "dumbbell", "biceps")
+
+    def test_unknown_lookups_check_the_fingerprint_once_per_interval(self):
+        catalog, db = ExerciseCatalog(check_interval=60), _StubSession(self.rows)
+        snapshot = catalog.current(db)
+        index = snapshot.search_index
+        assert db.queries == 2
+        for _ in range(5):
+            assert catalog.lookup(db, 99) is None
+        # One fingerprint comparison, no reload: the snapshot and index survive
+        assert db.queries == 3
+        assert catalog.current(db) is snapshot
+        assert snapshot.search_index is index
+
+    def test_unknown_id_reloads_when_the_catalog_changed(self):
+        catalog, db = ExerciseCatalog(check_interval=60), _StubSession(self.rows)
+        catalog.current(db)
+        db.rows = self.rows + [self.new_row]
+        assert catalog.lookup(db, 2).name == "dumbbell curl"
+
+    def test_referenced_ids_resolve_after_a_bogus_lookup(self):
+        catalog, db = ExerciseCatalog(check_interval=60), _StubSession(self.rows)
+        catalog.current(db)
+        assert catalog.lookup(db, 99999) is None
+        # Added elsewhere right after; a day referencing it must still resolve
+        db.rows = self.rows + [self.new_row]
+        assert catalog.resolve(db, [1, 2])[2].name == "dumbbell curl"
@@ -0,0 +1,142 @@
+# tests/test_equipment.py
+"""
+Unit tests for equipment classification and weight ladders.
+Run with: pytest tests/test_equipment.py -v
+"""
+
+import numpy as np
+import pytest
+
+from app import progression_engine as engine
+from app.equipment import (
+    BARBELL, CABLE, DUMBBELL, MACHINE, OTHER,
+    DEFAULT_LADDERS,
+    WeightLadder,
+    barbell_loads,
+    build_ladders,
+    classify_equipment,
+    stack_loads,
+)
+
+
+# ═══════════════════════════════════════════════════════
+# CLASSIFICATION
+# ═══════════════════════════════════════════════════════
+
+class TestClassifyEquipment:
+    def test_equipment_field_wins(self):
+        assert classify_equipment("Bench Press", "dumbbell") == DUMBBELL
+        assert classify_equipment("Bench Press", "barbell") == BARBELL
+        assert classify_equipment("Chest Press", "leverage machine") == MACHINE
+        assert classify_equipment("Crossover", "cable") == CABLE
+        assert classify_equipment("Squat", "smith machine") == BARBELL
+        assert classify_equipment("Push-up", "body weight") == OTHER
+
+    def test_name_fallback(self):
+        assert classify_equipment("Incline Fly") == DUMBBELL
+        assert classify_equipment("Cable Row") == CABLE
+        assert classify_equipment("Barbell Curl") == BARBELL
+        assert classify_equipment("Lever Leg Extension") == MACHINE
+        assert classify_equipment("Pull-up") == OTHER
+
+    def test_unknown_equipment_falls_back_to_name(self):
+        assert classify_equipment("Dumbbell Row", "kettlebell") == DUMBBELL
+
+
+# ═══════════════════════════════════════════════════════
+# LADDERS
+# ═══════════════════════════════════════════════════════
+
+class TestWeightLadder:
+    ladder = WeightLadder("test", [10, 20, 5, 20, 15])
+
+    def test_sorted_and_deduplicated(self):
+        assert self.ladder.weights.tolist() == [5, 10, 15, 20]
+
+    def test_scalar_snaps(self):
+        assert self.ladder.snap_up(11) == 15
+        assert self.ladder.snap_up(15) == 15
+        assert self.ladder.snap_down(14) == 10
+        assert self.ladder.next_above(15) == 20
+        assert self.ladder.snap_nearest(12.5) == 10   # tie goes down
+        assert self.ladder.snap_nearest(13) == 15
+
+    def test_scalar_out_of_range(self):
+        assert self.ladder.snap_up(21) is None
+        assert self.ladder.snap_down(4) is None
+        assert self.ladder.next_above(20) is None
+
+    def test_array_snaps_match_scalar(self):
+        ws = np.array([0, 4.9, 5, 7.5, 12.5, 19.9, 20, 25])
+        for method in ("snap_up", "snap_down", "next_above", "snap_nearest"):
+            vec = getattr(self.ladder, method)(ws)
+            for w, v in zip(ws, vec):
+                s = getattr(self.ladder, method)(float(w))
+                assert (np.isnan(v) and s is None) or v == s, (method, w)
+
+    def test_empty_ladder_rejected(self):
+        with pytest.raises(ValueError):
+            WeightLadder("empty", [])
+
+
+class TestLoadBuilders:
+    def test_barbell_loads_use_plate_pairs(self):
+        loads = barbell_loads(20, [20, 10, 5, 2.5, 1.25], 40)
+        assert loads == [20 + 2.5 * i for i in range(9)]
+
+    def test_barbell_loads_respect_missing_small_plates(self):
+        loads = barbell_loads(20, [20, 10, 5], 60)
+        assert loads == [20, 30, 40, 50, 60]
+
+    def test_stack_loads(self):
+        assert stack_loads(5, 20) == [5, 10, 15, 20]
+
+
+# ═══════════════════════════════════════════════════════
+# ENGINE ON LADDERS
+# ═══════════════════════════════════════════════════════
+
+class TestEngineLadders:
+    def test_machine_moves_in_stack_steps(self):
+        steps = engine.next_available_weights([50.0], [MACHINE], 0.025)
+        # 51.25 rounds to the nearest pin (50), which isn't heavier → next pin
+        assert steps.candidate[0] == 55
+        assert not steps.can_achieve[0]     # 10% jump exceeds 6.25%
+
+    def test_barbell_snaps_to_nearest_load(self):
+        steps = engine.next_available_weights([100.0], [BARBELL], 0.025)
+        assert steps.next_weight[0] == 102.5
+
+    def test_at_max_uses_ladder_label(self):
+        steps = engine.next_available_weights([200.0], [MACHINE], 0.025)
+        assert steps.reason(0) == "At maximum machine stack weight"
+
+    def test_mixed_equipment_batch(self):
+        batch = engine.compute_set_targets(
+            [100.0, 20.0, 50.0, 30.0],
+            [12, 12, 12, 12],
+            [BARBELL, DUMBBELL, MACHINE, CABLE],
+            engine.MOSTLY_RECOVERED,
+        )
+        assert batch.target_weight.tolist() == [102.5, 22.5, 55.0, 32.5]
+        assert batch.action_name(2) == "force_weight_increase"
+
+    def test_deload_snaps_down_onto_ladder(self):
+        batch = engine.compute_set_targets([52.5], [10], [CABLE], engine.OVERTRAINED)
+        assert batch.target_weight[0] == 45.0     # 47.25 → next pin down
+
+    def test_custom_gym(self):
+        ladders = build_ladders(dumbbells_kg=[10, 12, 14], machine_step_kg=7)
+        steps = engine.next_available_weights([14.0, 70.0], [DUMBBELL, MACHINE],
+                                              0.025, ladders=ladders)
+        assert steps.reason(0) == "At maximum dumbbell weight"
+        assert steps.candidate[1] == 77
+
+    def test_boolean_flags_still_accepted(self):
+        a = engine.compute_set_targets([40.0, 100.0], [12, 10], [True, False], 2)
+        b = engine.compute_set_targets([40.0, 100.0], [12, 10], [DUMBBELL, OTHER], 2)
+        assert a.reasons() == b.reasons()
+
+    def test_default_ladders_cover_every_class(self):
+        for code in (OTHER, DUMBBELL, BARBELL, MACHINE, CABLE):
+            assert DEFAULT_LADDERS[code].label
@@ -0,0 +1,61 @@
+# tests/test_exercise_performance.py
+"""
+Unit tests for folding logged sets into exercise_performance.
+Run with: pytest tests/test_exercise_performance.py -v
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.dialects import postgresql
+
+from app.crud import estimated_1rm, set_log_performance_stmts
+
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _row(id, weight, reps, exercise_id=7, inserted=True, seconds=0):
+    return {"id": id, "meso_day_exercise_id": 5, "set_number": id, "weight": weight,
+            "reps": reps, "logged_at": T0 + timedelta(seconds=seconds), "user_id": 1,
+            "exercise_id": exercise_id, "inserted": inserted}
+
+
+def _params(stmt) -> dict:
+    return stmt.compile(dialect=postgresql.dialect()).params
+
+
+class TestEstimated1RM:
+    def test_epley(self):
+        assert estimated_1rm(100, 0) == 100
+        assert estimated_1rm(100, 30) == 200
+        assert round(estimated_1rm(60, 10), 6) == 80
+
+
+class TestSetLogPerformanceStmts:
+    def test_nothing_written(self):
+        assert set_log_performance_stmts([]) == []
+
+    def test_new_sets_merge_into_latest_and_best(self):
+        stmts = set_log_performance_stmts([
+            _row(2, 80, 3, seconds=1),
+            _row(1, 100, 5, seconds=0),
+        ])
+        assert len(stmts) == 1
+        params = _params(stmts[0])
+        # Latest by logged_at, best over both sets
+        assert params["last_weight_m0"] == 80
+        assert params["last_set_log_id_m0"] == 2
+        assert params["best_e1rm_m0"] == estimated_1rm(100, 5)
+
+    def test_skipped_sets_are_not_performance(self):
+        assert set_log_performance_stmts([_row(1, 0, 0)]) == []
+
+    def test_overwritten_pairs_are_recomputed(self):
+        stmts = set_log_performance_stmts([
+            _row(1, 100, 5, inserted=False),
+            _row(2, 50, 5, exercise_id=8),
+        ])
+        assert len(stmts) == 2
+        sql = str(stmts[1].compile(dialect=postgresql.dialect()))
+        assert "LATERAL" in sql
+        # The overwritten pair isn't also merged incrementally
+        assert [v for k, v in _params(stmts[0]).items() if k.startswith("exercise_id")] == [8]
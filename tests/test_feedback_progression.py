@@ -0,0 +1,159 @@
+# tests/test_feedback_progression.py
+"""
+Unit tests for week-level feedback progression: the decision matrix and
+the SQL that summarizes feedback and applies set deltas.
+Run with: pytest tests/test_feedback_progression.py -v
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app import models
+from app.crud import (
+    MAX_SETS_PER_EXERCISE,
+    MIN_SETS_PER_EXERCISE,
+    apply_feedback_progression,
+    feedback_decisions,
+    feedback_summary_stmt,
+    next_week_stmt,
+    set_delta_update_stmt,
+    set_deltas,
+)
+
+
+def _row(group="chest", soreness=1.0, pump=1.5, volume=0.0, current_sets=6, exercise_count=2):
+    return SimpleNamespace(muscle_group=group, avg_soreness=soreness, avg_pump=pump,
+                           avg_volume=volume, current_sets=current_sets,
+                           exercise_count=exercise_count)
+
+
+def _compiled(stmt):
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    return str(compiled), compiled.params
+
+
+class TestFeedbackDecisions:
+    @pytest.mark.parametrize("row, delta, confidence", [
+        (_row(soreness=2.5, volume=-1.0), -2, "high"),        # severe soreness wins
+        (_row(soreness=1.0, volume=-0.5), 1, "high"),         # too little, recovered
+        (_row(soreness=1.5, volume=-1.0), 0, "medium"),       # too little, still sore
+        (_row(soreness=1.5, volume=0.5), -2, "high"),         # too much and sore
+        (_row(soreness=1.0, volume=1.0), -1, "high"),         # too much
+        (_row(soreness=2.0, volume=0.0), -1, "medium"),       # recovery lagging
+        (_row(soreness=1.0, pump=2.0), 1, "high"),            # optimal signals
+        (_row(soreness=0.5, pump=0.5), 0, "low"),             # weak pump
+        (_row(soreness=1.2, pump=1.5), 0, "medium"),          # nominal
+    ])
+    def test_matrix(self, row, delta, confidence):
+        [decision] = feedback_decisions([row])
+        assert decision["delta"] == delta
+        assert decision["recommended_sets"] == row.current_sets + delta
+        assert decision["confidence"] == confidence
+
+    def test_never_below_one_set_per_exercise(self):
+        [decision] = feedback_decisions([_row(soreness=3.0, current_sets=3, exercise_count=2)])
+        assert decision["recommended_sets"] == 2
+        assert decision["delta"] == -1
+
+    def test_row_order_is_kept(self):
+        rows = [_row("back"), _row("chest"), _row("quads")]
+        assert [d["muscle_group"] for d in feedback_decisions(rows)] == ["back", "chest", "quads"]
+
+
+class TestSetDeltas:
+    def test_later_decisions_win_and_zeros_are_dropped(self):
+        decisions = [{"muscle_group": "chest", "delta": 1},
+                     {"muscle_group": "back", "delta": 0},
+                     {"muscle_group": "chest", "delta": -2}]
+        assert set_deltas(5, decisions) == [(5, "chest", -2)]
+
+
+class TestFeedbackSummaryStatement:
+    def test_scores_default_and_order(self):
+        sql, params = _compiled(feedback_summary_stmt(5, 7))
+        # Every enum member is scored; anything else counts as 0
+        assert params["param_1"] is models.SorenessLevel.none
+        assert sum(isinstance(v, models.SorenessLevel) for v in params.values()) == 4
+        assert sum(isinstance(v, models.PumpLevel) for v in params.values()) == 4
+        assert sum(isinstance(v, models.VolumeFeeling) for v in params.values()) == 3
+        assert sql.count("ELSE") == 3 and params["param_9"] == 0
+        # Groups without exercises next week: 0 sets, at least one exercise
+        assert (params["coalesce_1"], params["coalesce_2"]) == (0, 1)
+        assert "ORDER BY feedback.first_seen" in sql
+        assert "min(ARRAY[mesocycle_days.day_order, mesocycle_days.id, feedbacks.id])" in sql
+
+    def test_scoped_to_the_users_current_week(self):
+        sql, params = _compiled(feedback_summary_stmt(5, 7))
+        assert (params["id_1"], params["user_id_1"]) == (5, 7)
+        assert "mesocycle_weeks.week_number = mesocycles.current_week)" in sql
+
+
+class TestSetDeltaUpdateStatement:
+    def test_clamped_to_set_limits(self):
+        sql, params = _compiled(set_delta_update_stmt([(5, "chest", 1)], 7))
+        assert "greatest(%(greatest_1)s::INTEGER, least(%(least_1)s::INTEGER, " \
+               "mesocycle_day_exercises.prescribed_sets + deltas.delta))" in sql
+        assert (params["greatest_1"], params["least_1"]) == (MIN_SETS_PER_EXERCISE,
+                                                             MAX_SETS_PER_EXERCISE)
+
+    def test_only_changed_rows_come_back(self):
+        sql, _ = _compiled(set_delta_update_stmt([(5, "chest", 1)], 7))
+        assert ")) != mesocycle_day_exercises.prescribed_sets" in sql
+        assert sql.endswith("RETURNING mesocycles.id AS mesocycle_id, mesocycle_day_exercises.id")
+
+    def test_next_week_of_the_users_mesocycles(self):
+        sql, params = _compiled(set_delta_update_stmt([(5, "chest", 1), (6, "back", -2)], 7))
+        assert [params[f"param_{i}"] for i in range(1, 7)] == [5, "chest", 1, 6, "back", -2]
+        assert params["user_id_1"] == 7 and params["current_week_1"] == 1
+        assert "mesocycle_weeks.week_number = mesocycles.current_week + " in sql
+        assert "exercises.body_part = deltas.muscle_group" in sql
+
+
+class TestNextWeekStatement:
+    def test_scoped_to_the_week_after_current(self):
+        sql, params = _compiled(next_week_stmt(5, 7))
+        assert params == {"id_1": 5, "user_id_1": 7, "current_week_1": 1}
+        assert "mesocycle_weeks.week_number = mesocycles.current_week + " in sql
+
+
+class _StubSession:
+    """Returns ``updated`` rows from the UPDATE and ``next_week`` from the check."""
+
+    def __init__(self, updated, next_week):
+        self.updated, self.next_week = updated, next_week
+        self.calls = []
+
+    def execute(self, stmt):
+        self.calls.append("update")
+        return SimpleNamespace(all=lambda: self.updated)
+
+    def scalar(self, stmt):
+        self.calls.append("next_week")
+        return self.next_week
+
+    def commit(self):
+        self.calls.append("commit")
+
+    def rollback(self):
+        self.calls.append("rollback")
+
+
+class TestApplyFeedbackProgression:
+    decisions = [{"muscle_group": "chest", "delta": 1}]
+
+    def test_counts_updated_rows_without_checking_the_week(self):
+        db = _StubSession(updated=[(5, 10), (5, 11)], next_week=None)
+        assert apply_feedback_progression(db, 5, 7, self.decisions) == 2
+        assert db.calls == ["update", "commit"]
+
+    def test_none_when_no_next_week(self):
+        db = _StubSession(updated=[], next_week=None)
+        assert apply_feedback_progression(db, 5, 7, self.decisions) is None
+        assert db.calls == ["update", "next_week", "rollback"]
+
+    def test_zero_when_nothing_changes(self):
+        db = _StubSession(updated=[], next_week=42)
+        assert apply_feedback_progression(db, 5, 7, [{"muscle_group": "chest", "delta": 0}]) == 0
+        assert db.calls == ["next_week", "commit"]
@@ -0,0 +1,77 @@
+# tests/test_import_exercises.py
+"""
+Unit tests for the catalog sync helpers in import_exercises.py.
+Run with: pytest tests/test_import_exercises.py -v
+"""
+
+from sqlalchemy.dialects import postgresql
+
+import import_exercises as sync
+
+
+def _row(source_id, name):
+    return {"source_id": source_id, "name": name, "body_part": "back",
+            "equipment": None, "target": "lats"}
+
+
+class TestReadCatalog:
+    def test_rows_are_normalized(self, tmp_path):
+        path = tmp_path / "ex.csv"
+        path.write_text("bodyPart,equipment,id,name,target\n"
+                        " back ,,0007, alternate lateral pulldown ,lats\n")
+        assert list(sync.read_catalog(str(path))) == [{
+            "source_id": "0007", "name": "alternate lateral pulldown",
+            "body_part": "back", "equipment": None, "target": "lats",
+        }]
+
+    def test_bundled_catalog_has_unique_ids(self):
+        ids = [row["source_id"] for row in sync.read_catalog(sync.CSV_PATH)]
+        assert len(ids) == len(set(ids))
+
+
+class TestBatched:
+    def test_splits_and_keeps_remainder(self):
+        assert [len(b) for b in sync.batched(range(5), 2)] == [2, 2, 1]
+
+
+class TestMatchLegacyRows:
+    def test_pairs_by_name(self):
+        legacy = [(10, "row"), (11, "curl")]
+        rows = [_row("a", "curl"), _row("b", "row"), _row("c", "squat")]
+        assert sync.match_legacy_rows(legacy, rows) == [
+            {"id": 11, "source_id": "a"}, {"id": 10, "source_id": "b"},
+        ]
+
+    def test_repeated_names_pair_in_order(self):
+        legacy = [(21, "calf raise"), (20, "calf raise")]
+        rows = [_row("x", "calf raise"), _row("y", "calf raise"), _row("z", "calf raise")]
+        assert sync.match_legacy_rows(legacy, rows) == [
+            {"id": 20, "source_id": "x"}, {"id": 21, "source_id": "y"},
+        ]
+
+
+class TestUpsertStatement:
+    def test_only_changed_rows_are_updated(self):
+        sql = str(sync.upsert_catalog_stmt([_row("a", "row")]).compile(
+            dialect=postgresql.dialect()))
+        assert "ON CONFLICT (source_id) DO UPDATE" in sql
+        assert "IS DISTINCT FROM" in sql
+        assert "RETURNING exercises.id, xmax = " in sql
+
+
+class TestOpenSession:
+    def test_session_is_bound_without_the_app(self, monkeypatch):
+        from sqlalchemy.orm import sessionmaker
+
+        from app import database
+        # Fresh, unbound state as in a plain `python import_exercises.py`
+        monkeypatch.setattr(database, "engine", None)
+        monkeypatch.setattr(database, "async_engine", None)
+        monkeypatch.setattr(database, "SessionLocal", sessionmaker(autocommit=False, autoflush=False))
+
+        db = sync.open_session()
+        try:
+            assert db.get_bind() is database.engine
+        finally:
+            db.close()
+            database.engine.dispose()
@@ -0,0 +1,55 @@
+# tests/test_passwords.py
+"""
+Unit tests for configurable password hashing and rehash-on-login.
+Run with: pytest tests/test_passwords.py -v
+"""
+
+import asyncio
+
+from app import utils
+from app.utils import build_pwd_context
+
+
+class TestRehashOnLogin:
+    def test_current_hash_needs_no_update(self):
+        ctx = build_pwd_context("bcrypt", 4)
+        ok, new_hash = ctx.verify_and_update("secret", ctx.hash("secret"))
+        assert ok and new_hash is None
+
+    def test_cost_change_triggers_rehash(self):
+        old = build_pwd_context("bcrypt", 4).hash("secret")
+        ok, new_hash = build_pwd_context("bcrypt", 5).verify_and_update("secret", old)
+        assert ok
+        assert new_hash.startswith("$2b$05$")
+
+    def test_cost_decrease_also_rehashes(self):
+        old = build_pwd_context("bcrypt", 5).hash("secret")
+        _, new_hash = build_pwd_context("bcrypt", 4).verify_and_update("secret", old)
+        assert new_hash.startswith("$2b$04$")
+
+    def test_scheme_change_triggers_rehash(self):
+        old = build_pwd_context("bcrypt", 4).hash("secret")
+        ok, new_hash = build_pwd_context("pbkdf2_sha256", 1000).verify_and_update("secret", old)
+        assert ok
+        assert new_hash.startswith("$pbkdf2-sha256$1000$")
+
+    def test_unset_rounds_pin_the_scheme_default(self):
+        old = build_pwd_context("bcrypt", 4).hash("secret")
+        _, new_hash = build_pwd_context("bcrypt", None).verify_and_update("secret", old)
+        assert new_hash.startswith("$2b$12$")
+
+    def test_wrong_password_never_rehashes(self):
+        old = build_pwd_context("bcrypt", 4).hash("secret")
+        assert build_pwd_context("bcrypt", 5).verify_and_update("nope", old) == (False, None)
+
+
+class TestHashPool:
+    def test_async_round_trip(self):
+        async def run():
+            hashed = await utils.hash_password_async("secret")
+            return await utils.verify_and_update_async("secret", hashed)
+
+        try:
+            assert asyncio.run(run()) == (True, None)
+        finally:
+            utils.shutdown_hash_pool()
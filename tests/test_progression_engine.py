@@ -4,7 +4,10 @@ Unit tests for the Progression Engine.
 Run with: pytest tests/test_progression_engine.py -v
 """
 
+import numpy as np
 import pytest
+from app import progression_engine as engine
+from app.equipment import EQUIPMENT_CLASSES
 from app.crud import (
     classify_recovery_state,
     classify_stimulus_quality,
@@ -385,3 +388,75 @@ class TestProgressionScenarios:
         r4 = calculate_set_target(r3["target_weight"], r3["target_reps"],
                                   False, "mostly_recovered", "optimal")
         assert r4["action"] in ("increase_weight", "increase_reps")
+
+
+# ═══════════════════════════════════════════════════════
+# VECTORIZED ENGINE
+# ═══════════════════════════════════════════════════════
+
+class TestVectorizedEngine:
+    """The columnar engine must agree row-for-row with the scalar API."""
+
+    CASES = [
+        (100.0, 10, False, "mostly_recovered"),
+        (20.0, 10, True, "mostly_recovered"),
+        (20.0, 12, True, "fully_recovered"),
+        (42.5, 10, True, "overtrained"),
+        (100.0, 10, False, "under_recovered"),
+        (0.0, 0, False, "fully_recovered"),
+        (60.0, 12, True, "mostly_recovered"),
+    ]
+
+    def test_batch_matches_scalar(self):
+        weights, reps, is_db, states = zip(*self.CASES)
+        codes = [engine.RECOVERY_CODES[s] for s in states]
+        batch = engine.compute_set_targets(weights, reps, is_db, codes)
+
+        for i, case in enumerate(self.CASES):
+            expected = calculate_set_target(*case, stimulus_quality="optimal")
+            assert batch.record(i) == expected
+
+    def test_action_codes(self):
+        batch = engine.compute_set_targets([100.0, 100.0], [10, 10], False,
+                                           [engine.OVERTRAINED, engine.UNDER_RECOVERED])
+        assert list(batch.action) == [engine.DELOAD, engine.MAINTAIN]
+
+    def test_scalar_inputs_broadcast(self):
+        batch = engine.compute_set_targets([100.0, 60.0, 40.0], [10, 10, 10],
+                                           False, engine.MOSTLY_RECOVERED)
+        assert batch.target_weight.tolist() == [102.5, 62.5, 42.5]
+
+    def test_reasons_render_on_demand(self):
+        batch = engine.compute_set_targets([100.0], [10], False, engine.MOSTLY_RECOVERED)
+        assert batch.reasons() == [calculate_set_target(100.0, 10, False, "mostly_recovered",
+                                                        "optimal")["reason"]]
+
+    def test_classification_arrays(self):
+        soreness = np.array([3.0, 2.0, 1.0, 0.0])
+        assert engine.classify_recovery_states(soreness).tolist() == [
+            engine.OVERTRAINED, engine.UNDER_RECOVERED,
+            engine.MOSTLY_RECOVERED, engine.FULLY_RECOVERED,
+        ]
+        assert engine.classify_stimulus_qualities([0.0, 1.5, 3.0], [-1.0, 0.0, 1.0]).tolist() == [
+            engine.INSUFFICIENT, engine.OPTIMAL, engine.EXCESSIVE,
+        ]
+
+    def test_single_row_forms_match_batch(self):
+        weights = [0.0, 8.0, 20.0, 42.5, 61.0, 100.0, 118.0, 197.5, 400.0]
+        rows = [(w, r, e, c) for w in weights for r in (0, 9, 12)
+                for e in range(len(EQUIPMENT_CLASSES)) for c in range(4)]
+        w, r, e, c = map(list, zip(*rows))
+        batch = engine.compute_set_targets(w, r, e, c)
+        steps = engine.next_available_weights(w, e)
+        for i, row in enumerate(rows):
+            assert engine.set_target(*row) == batch.record(i)
+            assert engine.next_weight_step(row[0], row[2]) == (
+                float(steps.next_weight[i]), bool(steps.can_achieve[i]), steps.reason(i))
+
+        soreness = [0.0, 0.5, 1.49, 1.5, 2.5, 3.0]
+        assert [engine.recovery_code(x) for x in soreness] == \
+            engine.classify_recovery_states(soreness).tolist()
+        pump, volume = [0.0, 1.0, 1.5, 2.0, 3.0], [-1.0, -0.5, 0.0, 0.5, 1.0]
+        assert [engine.stimulus_code(p, v) for p, v in zip(pump, volume)] == \
+            engine.classify_stimulus_qualities(pump, volume).tolist()
+
@@ -0,0 +1,68 @@
+# tests/test_schemas.py
+"""
+Unit tests for request validation in app/schemas.py.
+Run with: pytest tests/test_schemas.py -v
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas import (
+    MAX_SET_NUMBER,
+    MAX_SKIP_EXERCISES,
+    BulkSetLogCreate,
+    DaySetLogCreate,
+    DaySkipSetsRequest,
+    SetLogCreate,
+    SkipSetsRequest,
+)
+
+
+def _set(n):
+    return {"set_number": n, "weight": 60.0, "reps": 8}
+
+
+class TestSetLogCreate:
+    def test_valid(self):
+        assert SetLogCreate(**_set(MAX_SET_NUMBER)).set_number == MAX_SET_NUMBER
+
+    @pytest.mark.parametrize("set_number", [0, -1, MAX_SET_NUMBER + 1, 10**9])
+    def test_set_number_out_of_range(self, set_number):
+        with pytest.raises(ValidationError):
+            SetLogCreate(**_set(set_number))
+
+    def test_bulk_size_is_bounded(self):
+        sets = [_set(1 + i % MAX_SET_NUMBER) for i in range(MAX_SET_NUMBER)]
+        assert len(BulkSetLogCreate(sets=sets).sets) == MAX_SET_NUMBER
+        with pytest.raises(ValidationError):
+            BulkSetLogCreate(sets=sets + [_set(1)])
+
+    def test_day_request_is_bounded(self):
+        exercise = {"mde_id": 1, "sets": [_set(1)]}
+        assert len(DaySetLogCreate(exercises=[exercise] * MAX_SKIP_EXERCISES).exercises) \
+            == MAX_SKIP_EXERCISES
+        with pytest.raises(ValidationError):
+            DaySetLogCreate(exercises=[exercise] * (MAX_SKIP_EXERCISES + 1))
+        with pytest.raises(ValidationError):
+            DaySetLogCreate(exercises=[{"mde_id": 1, "sets": [_set(1)] * (MAX_SET_NUMBER + 1)}])
+
+
+class TestSkipSetsRequest:
+    def test_valid_range(self):
+        body = SkipSetsRequest(from_set=2, to_set=4)
+        assert (body.from_set, body.to_set) == (2, 4)
+        assert SkipSetsRequest(from_set=3, to_set=3).to_set == 3
+
+    @pytest.mark.parametrize("from_set, to_set", [
+        (0, 3),                         # set numbers start at 1
+        (1, MAX_SET_NUMBER + 1),        # would expand into a huge upsert
+        (1, 100_000_000),
+        (4, 2),                         # reversed
+    ])
+    def test_rejected(self, from_set, to_set):
+        with pytest.raises(ValidationError):
+            SkipSetsRequest(from_set=from_set, to_set=to_set)
+
+    def test_day_request_validates_each_exercise(self):
+        with pytest.raises(ValidationError):
+            DaySkipSetsRequest(exercises=[{"mde_id": 1, "from_set": 1, "to_set": 100_000_000}])
@@ -0,0 +1,81 @@
+# tests/test_search.py
+"""
+Unit tests for the in-process exercise search index.
+Run with: pytest tests/test_search.py -v
+"""
+
+from app.catalog import CatalogExercise
+from app.search import ExerciseSearchIndex, tokenize, trigrams
+
+CATALOG = [
+    (1, "barbell bench press", "chest", "barbell", "pectorals"),
+    (2, "dumbbell bench press", "chest", "dumbbell", "pectorals"),
+    (3, "dumbbell incline bench press", "chest", "dumbbell", "pectorals"),
+    (4, "barbell curl", "upper arms", "barbell", "biceps"),
+    (5, "dumbbell hammer curl", "upper arms", "dumbbell", "biceps"),
+    (6, "cable triceps pushdown (v-bar)", "upper arms", "cable", "triceps"),
+    (7, "barbell full squat", "upper legs", "barbell", "glutes"),
+    (8, "bench dip", "upper arms", "body weight", "triceps"),
+]
+
+
+def _index():
+    return ExerciseSearchIndex(CatalogExercise(*row) for row in CATALOG)
+
+
+def _ids(results):
+    return [e.id for e in results]
+
+
+# ═══════════════════════════════════════════════════════
+# TOKENS
+# ═══════════════════════════════════════════════════════
+
+class TestTokens:
+    def test_tokenize_drops_punctuation(self):
+        assert tokenize("Cable Triceps Pushdown (V-bar)") == ["cable", "triceps", "pushdown", "v", "bar"]
+
+    def test_trigrams_are_padded(self):
+        assert trigrams("ab") == {"  a", " ab", "ab "}
+
+
+# ═══════════════════════════════════════════════════════
+# SEARCH
+# ═══════════════════════════════════════════════════════
+
+class TestSearch:
+    def test_every_token_must_match(self):
+        assert set(_ids(_index().search("bench press"))) == {1, 2, 3}
+
+    def test_prefixes_match(self):
+        assert set(_ids(_index().search("dumb ben"))) == {2, 3}
+        assert _ids(_index().search("push")) == [6]
+
+    def test_typos_fall_back_to_fuzzy(self):
+        assert set(_ids(_index().search("bech pres"))) == {1, 2, 3}
+        assert _ids(_index().search("hamer curl")) == [5]
+
+    def test_phrase_prefix_ranks_first(self):
+        assert _ids(_index().search("bench"))[0] == 8
+
+    def test_exact_token_beats_prefix(self):
+        index = ExerciseSearchIndex([CatalogExercise(1, "machine rowing", "back", "leverage machine", "lats"),
+                                     CatalogExercise(2, "cable row", "back", "cable", "lats")])
+        assert _ids(index.search("row")) == [2, 1]
+
+    def test_no_match(self):
+        assert _index().search("zzzz") == []
+
+    def test_filters_are_case_insensitive(self):
+        assert _ids(_index().search("press", equipment="DUMBBELL")) == [2, 3]
+        assert _ids(_index().search(target="Biceps")) == [4, 5]
+        assert _index().search("curl", body_part="chest") == []
+
+    def test_without_query_orders_by_name(self):
+        names = [e.name for e in _index().search()]
+        assert names == sorted(names)
+
+    def test_skip_and_limit(self):
+        everything = _ids(_index().search("bench"))
+        assert _ids(_index().search("bench", skip=1, limit=2)) == everything[1:3]
+        assert len(_index().search(limit=3)) == 3
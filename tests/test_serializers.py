@@ -0,0 +1,58 @@
+# tests/test_serializers.py
+"""
+Unit tests for the hand-written response serializers.
+Run with: pytest tests/test_serializers.py -v
+"""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace as NS
+
+from app.catalog import CatalogExercise, CatalogSnapshot
+from app.models import PumpLevel, SorenessLevel, VolumeFeeling
+from app.serializers import serialize_day, serialize_mesocycle_detail
+
+CATALOG = CatalogSnapshot([CatalogExercise(7, "Bench Press", "chest", "barbell", "pectorals")])
+
+
+def _day(day_order=1, plan_day=None, exercises=(), feedbacks=()):
+    return NS(id=10 + day_order, plan_day_id=3, day_order=day_order, is_completed=False,
+              plan_day=plan_day, exercises=list(exercises), feedbacks=list(feedbacks))
+
+
+def _mde(set_logs=()):
+    return NS(id=5, exercise_id=7, exercise_order=1, prescribed_sets=3, prescribed_reps=None,
+              note=None, set_logs=list(set_logs))
+
+
+class TestSerializeDay:
+    def test_day_name_falls_back_to_order(self):
+        assert serialize_day(_day(2), CATALOG)["day_name"] == "Day 2"
+        assert serialize_day(_day(2, plan_day=NS(name="Push")), CATALOG)["day_name"] == "Push"
+
+    def test_enums_and_timestamps_are_plain_values(self):
+        logged = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        fb = NS(id=1, muscle_group="chest", soreness=SorenessLevel.light,
+                pump=PumpLevel.great, volume_feeling=VolumeFeeling.just_right, notes=None)
+        sl = NS(id=9, set_number=1, weight=100.0, reps=8, logged_at=logged)
+        out = serialize_day(_day(exercises=[_mde([sl])], feedbacks=[fb]), CATALOG)
+
+        assert out["feedbacks"][0]["soreness"] == "light"
+        assert out["feedbacks"][0]["pump"] == "great"
+        assert out["exercises"][0]["set_logs"][0]["logged_at"] == logged.isoformat()
+        assert out["exercises"][0]["exercise"] == {
+            "id": 7, "name": "Bench Press", "body_part": "chest",
+            "equipment": "barbell", "target": "pectorals",
+        }
+
+
+class TestSerializeMesocycleDetail:
+    def test_keeps_loader_order(self):
+        weeks = [NS(id=2, week_number=2, days=[_day(2), _day(1)]),
+                 NS(id=1, week_number=1, days=[])]
+        meso = NS(id=1, plan_id=1, name="Block", current_week=1, is_active=True,
+                  started_at=None, weeks=weeks)
+        out = serialize_mesocycle_detail(meso, CATALOG)
+
+        assert [w["week_number"] for w in out["weeks"]] == [2, 1]
+        assert [d["day_order"] for d in out["weeks"][0]["days"]] == [2, 1]
+        assert out["started_at"] is None
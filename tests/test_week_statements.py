@@ -0,0 +1,85 @@
+# tests/test_week_statements.py
+"""
+Unit tests for the single-statement writes behind mesocycle creation,
+week cloning and set logging.
+Run with: pytest tests/test_week_statements.py -v
+"""
+
+from sqlalchemy.dialects import postgresql
+
+from app.crud import clone_week_stmt, instantiate_plan_week_stmt, upsert_set_logs_stmt
+
+
+def _compiled(stmt):
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    return str(compiled), compiled.params
+
+
+def _set(mde_id, set_number, weight=50.0, reps=8):
+    return {"meso_day_exercise_id": mde_id, "set_number": set_number,
+            "weight": weight, "reps": reps}
+
+
+class TestInstantiatePlanWeekStatement:
+    def test_days_come_from_the_plan(self):
+        sql, params = _compiled(instantiate_plan_week_stmt(8, 4, 7))
+        assert sql.startswith("WITH new_days AS \n(INSERT INTO mesocycle_days")
+        assert "WHERE plan_days.plan_id = %(plan_id_1)s::INTEGER" in sql
+        assert "RETURNING mesocycle_days.id, mesocycle_days.plan_day_id)" in sql
+        assert (params["plan_id_1"], params["param_1"]) == (8, 4)
+
+    def test_exercises_join_back_to_their_plan_day(self):
+        sql, params = _compiled(instantiate_plan_week_stmt(8, 4, 7, prescribed_sets=3))
+        assert "JOIN plan_day_exercises ON plan_day_exercises.plan_day_id = new_days.plan_day_id" in sql
+        # The owner and the starting set count are bound for every row
+        assert (params["param_2"], params["param_3"]) == (7, 3)
+        assert sql.endswith('ORDER BY plan_days."order", plan_day_exercises."order", '
+                            "plan_day_exercises.id")
+
+
+class TestCloneWeekStatement:
+    def test_days_are_matched_by_plan_day_and_order(self):
+        sql, params = _compiled(clone_week_stmt(3, 4, {10: 2}))
+        assert "WHERE mesocycle_days.week_id = %(week_id_1)s::INTEGER" in sql
+        assert "RETURNING mesocycle_days.id, mesocycle_days.plan_day_id, mesocycle_days.day_order)" in sql
+        assert ("JOIN new_days ON new_days.plan_day_id = mesocycle_days.plan_day_id "
+                "AND new_days.day_order = mesocycle_days.day_order") in sql
+        assert (params["week_id_1"], params["param_1"]) == (3, 4)
+
+    def test_sets_are_joined_per_exercise(self):
+        sql, params = _compiled(clone_week_stmt(3, 4, {11: 3, 10: 2}))
+        assert "AS sets (mde_id, sets) JOIN mesocycle_day_exercises " \
+               "ON mesocycle_day_exercises.id = sets.mde_id" in sql
+        # VALUES rows are sorted by exercise id
+        assert [params[f"param_{i}"] for i in range(2, 6)] == [10, 2, 11, 3]
+
+    def test_owner_is_copied_from_the_old_exercise(self):
+        sql, _ = _compiled(clone_week_stmt(3, 4, {10: 2}))
+        assert "SELECT new_days.id, mesocycle_day_exercises.exercise_id, " \
+               "mesocycle_day_exercises.user_id, " in sql
+
+
+class TestUpsertSetLogsStatement:
+    def test_none_without_sets(self):
+        assert upsert_set_logs_stmt([], 7) is None
+
+    def test_last_write_wins_in_key_order(self):
+        sets = [_set(11, 2, 50.0, 8), _set(10, 1, 40.0, 10), _set(11, 2, 55.0, 6)]
+        _, params = _compiled(upsert_set_logs_stmt(sets, 7))
+        assert [params[f"param_{i}"] for i in range(1, 9)] == [10, 1, 40.0, 10, 11, 2, 55.0, 6]
+
+    def test_only_the_users_exercises_are_written(self):
+        sql, params = _compiled(upsert_set_logs_stmt([_set(10, 1)], 7))
+        assert "JOIN mesocycle_day_exercises ON mesocycle_day_exercises.id = " \
+               "v.meso_day_exercise_id" in sql
+        assert "WHERE mesocycle_day_exercises.user_id = %(user_id_1)s::INTEGER" in sql
+        assert params["user_id_1"] == 7
+        # user_id and exercise_id are denormalized from the joined row
+        assert "mesocycle_day_exercises.user_id, mesocycle_day_exercises.exercise_id \nFROM" in sql
+
+    def test_conflicts_overwrite_weight_and_reps(self):
+        sql, params = _compiled(upsert_set_logs_stmt([_set(10, 1)], 7))
+        assert "ON CONFLICT ON CONSTRAINT uq_set_logs_mde_set DO UPDATE " \
+               "SET weight = excluded.weight, reps = excluded.reps" in sql
+        assert sql.endswith("xmax = %(xmax_1)s::INTEGER AS inserted")
+        assert params["xmax_1"] == 0